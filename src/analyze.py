@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tabulate scale analysis for any set of scale shapes, streamed in chunks.
+
+    python analyze.py --shapes all --out scales.csv
+    python analyze.py --shapes catalog --roots 0,7 --format jsonl
+    python analyze.py --shapes all --cardinality 7 --necklaces --out heptatonic.npz
+
+Each row describes one shape: its catalog name and category, cardinality,
+necklace class (smallest mode), interval vector, period (smallest transposition
+mapping it onto itself), number of inversion axes (0 for chiral scales) and,
+for every requested root, the preferred spelling of its notes from the root up
+(empty when no one-note-per-letter spelling exists).
+
+CSV and JSONL rows are written as each chunk is finished. NPZ columns are
+filled through memory-mapped temporary files and zipped at the end, so memory
+use does not grow with the number of shapes either way.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import numpy as np
+
+from models.catalog import ScaleCatalog, parse_int_set
+from modules.math import pitch_set
+from modules.spelling import spell_scale
+from modules import tables
+
+FORMATS = ("csv", "jsonl", "npz")
+IVEC_DIGITS = "0123456789abc"
+# Widest spelling: 12 two-character names plus separators
+SPELLING_WIDTH = 12 * 3
+
+def spelled_notes(shape, root):
+    """The scale's notes from the root up in its preferred spelling, or '' if it has none."""
+    # Call the solver directly: a full table would otherwise fill the GUI's cache
+    sharp, flat, mode = spell_scale.__wrapped__(shape, root)
+    if mode is None:
+        return ""
+    names = sharp if mode == "sharp" else flat
+    return " ".join(names[(root + k) % 12] for k in pitch_set(shape))
+
+def filter_shapes(shapes, cardinality=None, necklaces=False, named=False, catalog=None):
+    shapes = np.asarray(shapes, dtype=np.int64)
+    keep = np.ones(len(shapes), dtype=bool)
+    if cardinality is not None:
+        keep &= np.isin(tables.cardinalities(shapes), cardinality)
+    if necklaces:
+        keep &= tables.necklaces(shapes) == shapes
+    if named:
+        keep &= np.array([catalog.lookup(int(s)) is not None for s in shapes], dtype=bool)
+    return shapes[keep]
+
+def analyze_chunks(shapes, roots, catalog, chunk_size=512):
+    """Yield dicts of column arrays, chunk_size rows at a time."""
+    name_width = max([len(name) for _, name, _ in catalog] + [1])
+    category_width = max([len(c or "") for c, _ in catalog.categories] + [1])
+
+    for start in range(0, len(shapes), chunk_size):
+        chunk = np.asarray(shapes[start:start + chunk_size], dtype=np.int64)
+        entries = [catalog.lookup(int(s)) or ("", "") for s in chunk]
+        yield {
+            "shape": chunk.astype(np.int16),
+            "name": np.array([name for _, name in entries], dtype=f"<U{name_width}"),
+            "category": np.array([category or "" for category, _ in entries], dtype=f"<U{category_width}"),
+            "cardinality": tables.cardinalities(chunk),
+            "necklace": tables.necklaces(chunk).astype(np.int16),
+            "interval_vector": tables.interval_counts(chunk),
+            "period": tables.periods(chunk),
+            "inversion_axes": tables.inversion_axes(chunk),
+            "spelling": np.array([[spelled_notes(int(s), r) for r in roots] for s in chunk],
+                                 dtype=f"<U{SPELLING_WIDTH}").reshape(len(chunk), len(roots)),
+        }
+
+class CsvWriter:
+    def __init__(self, stream, roots):
+        self._writer = csv.writer(stream)
+        self.roots = roots
+        self._header = False
+
+    def write(self, columns):
+        if not self._header:
+            names = [k for k in columns if k != "spelling"]
+            self._writer.writerow(names + [f"spelling_r{r}" for r in self.roots])
+            self._header = True
+
+        ivec = ["".join(IVEC_DIGITS[c] for c in row) for row in columns["interval_vector"]]
+        for i in range(len(columns["shape"])):
+            row = []
+            for key, values in columns.items():
+                if key == "interval_vector":
+                    row.append(ivec[i])
+                elif key != "spelling":
+                    row.append(values[i].item())
+            row.extend(columns["spelling"][i].tolist())
+            self._writer.writerow(row)
+
+    def close(self):
+        pass
+
+class JsonlWriter:
+    def __init__(self, stream, roots):
+        self._stream = stream
+        self.roots = roots
+
+    def write(self, columns):
+        for i in range(len(columns["shape"])):
+            row = {key: values[i].tolist() for key, values in columns.items() if key != "spelling"}
+            row["spelling"] = {str(r): (notes or None) for r, notes in zip(self.roots, columns["spelling"][i].tolist())}
+            self._stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        pass
+
+class NpzWriter:
+    """
+    Columns go to memory-mapped .npy files in a scratch directory as chunks
+    arrive, and are zipped into the .npz (readable with np.load) on close.
+    """
+
+    def __init__(self, path, roots, num_rows):
+        self.path = path
+        self.roots = roots
+        self.num_rows = num_rows
+        self._dir = tempfile.mkdtemp(prefix=".analyze-", dir=os.path.dirname(os.path.abspath(path)))
+        self._columns = {}
+        self._row = 0
+
+    def write(self, columns):
+        count = len(columns["shape"])
+        for key, values in columns.items():
+            if key not in self._columns:
+                self._columns[key] = np.lib.format.open_memmap(
+                    os.path.join(self._dir, f"{key}.npy"), mode="w+",
+                    dtype=values.dtype, shape=(self.num_rows,) + values.shape[1:])
+            self._columns[key][self._row:self._row + count] = values
+        self._row += count
+
+    def close(self):
+        np.save(os.path.join(self._dir, "roots.npy"), np.array(self.roots, dtype=np.int8))
+        for column in self._columns.values():
+            column.flush()
+        self._columns.clear()
+
+        # Written under a temporary name, so a partial .npz is never left behind
+        part = self.path + ".part"
+        with zipfile.ZipFile(part, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for filename in sorted(os.listdir(self._dir)):
+                zf.write(os.path.join(self._dir, filename), filename)
+        os.replace(part, self.path)
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Tabulate SIREN scale analysis to CSV, JSONL or NPZ.")
+    parser.add_argument("--shapes", default="all", help="Shapes: 'all', ranges '0-99', lists, 'catalog' or 'category:<name>'")
+    parser.add_argument("--roots", default="all", help="Roots to spell: 'all', ranges or lists (default: all)")
+    parser.add_argument("--cardinality", help="Only shapes with these note counts, e.g. '7' or '5-7'")
+    parser.add_argument("--necklaces", action="store_true", help="Only the smallest mode of each necklace class")
+    parser.add_argument("--named", action="store_true", help="Only shapes with a catalog name")
+    parser.add_argument("--out", default="-", help="Output file, or '-' for stdout (default: -)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from --out extension, else csv)")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Rows computed per chunk (default: 512)")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args(sys.argv[1:])
+
+    fmt = args.format
+    if fmt is None:
+        ext = os.path.splitext(args.out)[1].lstrip(".").lower()
+        fmt = ext if ext in FORMATS else "csv"
+    if fmt == "npz" and args.out == "-":
+        sys.exit("--format npz needs an output file (--out)")
+
+    catalog = ScaleCatalog.load()
+    try:
+        shapes = parse_int_set(args.shapes, tables.NUM_SCALES, catalog)
+        roots = parse_int_set(args.roots, 12)
+        cardinality = parse_int_set(args.cardinality, 13) if args.cardinality else None
+    except ValueError as e:
+        sys.exit(str(e))
+    shapes = filter_shapes(shapes, cardinality, args.necklaces, args.named, catalog)
+
+    start = time.perf_counter()
+    stream = None
+    if fmt == "npz":
+        writer = NpzWriter(args.out, roots, len(shapes))
+    else:
+        stream = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+        writer = (CsvWriter if fmt == "csv" else JsonlWriter)(stream, roots)
+
+    try:
+        for columns in analyze_chunks(shapes, roots, catalog, max(1, args.chunk_size)):
+            writer.write(columns)
+        writer.close()
+    except BrokenPipeError:
+        # Output piped into e.g. head; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {len(shapes)} shapes x {len(roots)} roots in {elapsed:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
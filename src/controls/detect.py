@@ -0,0 +1,65 @@
+import threading
+from PySide6.QtWidgets import QPushButton, QFileDialog
+from PySide6.QtCore import Signal
+from modules.detect import detect_file
+from modules.spelling import note_names
+
+class DetectButton(QPushButton):
+    """
+    Asks for a WAV recording, detects its scale in a background thread and
+    emits detected(shape, root) for the best named scale. The other candidates
+    are listed in the tooltip.
+    """
+    detected = Signal(int, int)
+    # Carries the worker thread's result back to the GUI thread
+    _finished = Signal(object)
+
+    TOP = 5
+
+    def __init__(self, catalog, parent=None):
+        super().__init__("Detect", parent)
+        self.catalog = catalog
+        self.setToolTip("Detect the scale of a WAV recording")
+        self._thread = None
+        self.clicked.connect(self.choose_file)
+        self._finished.connect(self._on_finished)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Detect Scale", "", "WAV audio (*.wav *.wave)")
+        if path:
+            self.detect(path)
+
+    def detect(self, path):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.setEnabled(False)
+        self.setText("Detecting…")
+        shapes = [shape for _, _, shape in self.catalog]
+        self._thread = threading.Thread(target=self._run, args=(path, shapes), daemon=True)
+        self._thread.start()
+
+    def _run(self, path, shapes):
+        try:
+            result = detect_file(path, self.TOP, shapes)
+        except Exception as e:
+            result = e
+        self._finished.emit(result)
+
+    def _on_finished(self, result):
+        self.setEnabled(True)
+        self.setText("Detect")
+        if isinstance(result, Exception):
+            self.setToolTip(f"Detection failed: {result}")
+            print(f"Error detecting scale: {result}")
+            return
+        if not result.matches:
+            self.setToolTip("No pitched notes found")
+            return
+
+        lines = []
+        for m in result.matches:
+            root_name = note_names(m.shape, m.root)[m.root]
+            lines.append(f"{m.score:.2f}  {root_name} {self.catalog.name_for(m.shape) or m.shape}")
+        self.setToolTip("\n".join(lines))
+        best = result.matches[0]
+        self.detected.emit(best.shape, best.root)
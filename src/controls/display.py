@@ -1,26 +1,46 @@
 from PySide6.QtWidgets import QComboBox
 from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, QTimer
 from views.common import CYCLIC_MAPS, get_cmap
 
 class ColormapDropdown(QComboBox):
     def __init__(self):
         super().__init__()
         self.setIconSize(QSize(100, 20))
+        # Items start as plain names; icons are rendered after the window is up
         for name in CYCLIC_MAPS:
-            self.addItem(self._create_icon(name), "", name)
+            self.addItem(name, name)
+        self._pending_icons = list(range(self.count()))
+
+    def load_icons_deferred(self):
+        """Render one icon per event-loop pass so startup never blocks on them."""
+        if self._pending_icons:
+            self._load_icon(self._pending_icons.pop(0))
+            QTimer.singleShot(0, self.load_icons_deferred)
+
+    def ensure_icons(self):
+        while self._pending_icons:
+            self._load_icon(self._pending_icons.pop(0))
+
+    def showPopup(self):
+        self.ensure_icons()
+        super().showPopup()
+
+    def _load_icon(self, index):
+        self.setItemIcon(index, self._create_icon(self.itemData(index)))
+        self.setItemText(index, "")
 
     def _create_icon(self, name):
         cmap = get_cmap(name)
         w, h = 100, 20
         pixmap = QPixmap(w, h)
         painter = QPainter(pixmap)
-        
+
         for x in range(w):
             rgba = cmap(x / (w - 1))
             c = QColor.fromRgbF(rgba[0], rgba[1], rgba[2], rgba[3] if len(rgba) > 3 else 1.0)
             painter.setPen(c)
             painter.drawLine(x, 0, x, h)
-            
+
         painter.end()
-        return QIcon(pixmap)
\ No newline at end of file
+        return QIcon(pixmap)
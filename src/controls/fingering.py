@@ -0,0 +1,124 @@
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QPushButton, QLabel
+from PySide6.QtCore import Signal, Qt
+from modules.fingering import SCALE_PATTERNS, scale_fingerings, chord_voicings
+from modules.math import rotate
+
+class FingeringControl(QWidget):
+    """
+    Picks a fingering pattern for the current scale (or the last chord chosen
+    in the Chords panel) and steps through its positions along the neck.
+    Emits 'changed' with the (string, fret) positions to mark, or () for none.
+    """
+    changed = Signal(object)
+
+    CHORD = "chord"
+
+    def __init__(self, instrument_model, scale_model):
+        super().__init__()
+        self.instrument_model = instrument_model
+        self.scale_model = scale_model
+        self._chord = None
+        self._patterns = ()
+        self._index = 0
+
+        self.cmb_kind = QComboBox()
+        self.cmb_kind.addItem("No pattern", None)
+        for kind, label in SCALE_PATTERNS.items():
+            self.cmb_kind.addItem(label, kind)
+
+        self.btn_prev = QPushButton("<")
+        self.btn_next = QPushButton(">")
+        for btn in [self.btn_prev, self.btn_next]:
+            btn.setFixedWidth(30)
+        self.lbl_position = QLabel("")
+        self.lbl_position.setAlignment(Qt.AlignCenter)
+        self.lbl_position.setFixedWidth(40)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.cmb_kind)
+        layout.addWidget(self.btn_prev)
+        layout.addWidget(self.lbl_position)
+        layout.addWidget(self.btn_next)
+
+        self.cmb_kind.currentIndexChanged.connect(lambda: self._recompute(reset=True))
+        self.btn_prev.clicked.connect(lambda: self.step(-1))
+        self.btn_next.clicked.connect(lambda: self.step(1))
+        self.scale_model.updated.connect(self._recompute)
+        self.instrument_model.updated.connect(self._recompute)
+        self._recompute(reset=True)
+
+    @property
+    def kind(self):
+        return self.cmb_kind.currentData()
+
+    @property
+    def positions(self):
+        if not self._patterns:
+            return ()
+        return self._patterns[self._index].positions
+
+    def show_chord(self, root, mask):
+        """Show voicings of a chord (root pitch class, absolute mask) until another pattern is picked."""
+        self._chord = (root, mask)
+        index = self.cmb_kind.findData(self.CHORD)
+        if index < 0:
+            self.cmb_kind.addItem("Chord voicings", self.CHORD)
+            index = self.cmb_kind.count() - 1
+        if index == self.cmb_kind.currentIndex():
+            self._recompute(reset=True)
+        else:
+            self.cmb_kind.setCurrentIndex(index)
+
+    def prefetch(self, shape, root_note):
+        """Solve the current kind of scale pattern for another scale ahead of time."""
+        kind = self.kind
+        if kind is None or kind == self.CHORD:
+            return False
+        scale_fingerings(tuple(self.instrument_model.tuning), rotate(shape, -root_note),
+                         self.instrument_model.num_frets, kind)
+        return True
+
+    def prefetch_key(self, shape, root_note):
+        return (tuple(self.instrument_model.tuning), self.instrument_model.num_frets, self.kind,
+                rotate(shape, -root_note))
+
+    def step(self, direction):
+        if self._patterns:
+            self._index = (self._index + direction) % len(self._patterns)
+            self._emit()
+
+    def _recompute(self, reset=False):
+        kind = self.kind
+        previous = None if reset or not self._patterns else self._patterns[self._index].low_fret
+        tuning = tuple(self.instrument_model.tuning)
+        num_frets = self.instrument_model.num_frets
+
+        if kind is None:
+            self._patterns = ()
+        elif kind == self.CHORD:
+            self._patterns = chord_voicings(tuning, *self._chord, num_frets) if self._chord else ()
+        else:
+            self._patterns = scale_fingerings(tuning, self.scale_model.number, num_frets, kind)
+
+        # Skip positions behind the capo or past the end of a short string
+        grid = self.instrument_model.get_note_grid()
+        if (grid < 0).any():
+            self._patterns = tuple(p for p in self._patterns if all(grid[s, f] >= 0 for s, f in p.positions))
+
+        # Stay in the same area of the neck when the scale or tuning changes
+        self._index = 0
+        if previous is not None and self._patterns:
+            self._index = min(range(len(self._patterns)),
+                              key=lambda i: abs(self._patterns[i].low_fret - previous))
+        self._emit()
+
+    def _emit(self):
+        enabled = len(self._patterns) > 1
+        self.btn_prev.setEnabled(enabled)
+        self.btn_next.setEnabled(enabled)
+        if self._patterns:
+            self.lbl_position.setText(f"{self._index + 1}/{len(self._patterns)}")
+        else:
+            self.lbl_position.setText("–" if self.kind else "")
+        self.changed.emit(self.positions)
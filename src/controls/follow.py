@@ -0,0 +1,49 @@
+from PySide6.QtWidgets import QPushButton, QFileDialog
+from modules.follower import ScaleFollower, SoundDeviceInput, WavFileInput
+
+class FollowButton(QPushButton):
+    """
+    Toggles live scale following. Listens to the default input device, or,
+    without one, loops a chosen WAV file as if it were live input. The
+    tooltip shows the measured input-to-model latency and DSP load.
+    """
+
+    def __init__(self, scale_model, catalog, parent=None):
+        super().__init__("Follow", parent)
+        self.setCheckable(True)
+        self.setToolTip("Follow the scale of live audio input")
+        self.follower = ScaleFollower(scale_model, [shape for _, _, shape in catalog], self)
+        self.follower.latency_measured.connect(self._show_stats)
+        self.toggled.connect(self._on_toggled)
+
+    def _open_source(self):
+        if SoundDeviceInput.available():
+            return SoundDeviceInput()
+        path, _ = QFileDialog.getOpenFileName(self, "No audio input: follow a recording instead", "",
+                                              "WAV audio (*.wav *.wave)")
+        return WavFileInput(path, loop=True) if path else None
+
+    def _on_toggled(self, checked):
+        if not checked:
+            self.follower.stop()
+            return
+        try:
+            source = self._open_source()
+            if source is not None:
+                self.follower.start(source)
+                return
+        except Exception as e:
+            self.follower.stop()
+            self.setToolTip(f"Could not start following: {e}")
+            print(f"Error starting scale follower: {e}")
+        # Nothing to follow: pop back out without re-entering this slot
+        self.blockSignals(True)
+        self.setChecked(False)
+        self.blockSignals(False)
+
+    def _show_stats(self, latency):
+        self.setToolTip(f"Latency {latency * 1000:.0f} ms, DSP load {self.follower.dsp_load:.0%}, "
+                        f"hop {self.follower.hop}")
+
+    def stop(self):
+        self.setChecked(False)
@@ -0,0 +1,154 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Signal
+from modules.math import cardinality, rotate
+from modules.spelling import note_names
+from modules.chords import FAMILIES, diatonic_chords
+
+class RelatedScalesPanel(QWidget):
+    """
+    Base for lists of scales derived from the current one. Results are only
+    recomputed while the panel is visible; a hidden panel refreshes when shown.
+    Activating a row moves the model to that scale and root.
+    """
+
+    def __init__(self, scale_model, catalog, parent=None):
+        super().__init__(parent)
+        self.scale_model = scale_model
+        self.catalog = catalog
+        self._scheduler = None
+        self._stale = True
+
+        self.list_widget = QListWidget()
+        self.list_widget.setUniformItemSizes(True)
+        self.options_layout = QHBoxLayout()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.addLayout(self.options_layout)
+        layout.addWidget(self.list_widget)
+
+        self.scale_model.updated.connect(self.invalidate)
+        self.list_widget.itemActivated.connect(self._select)
+        self.list_widget.itemClicked.connect(self._select)
+
+    def add_option(self, items):
+        combo = QComboBox()
+        for label, value in items:
+            combo.addItem(label, value)
+        combo.currentIndexChanged.connect(self.invalidate)
+        self.options_layout.addWidget(combo)
+        return combo
+
+    def set_scheduler(self, scheduler):
+        self._scheduler = scheduler
+
+    def invalidate(self):
+        self._stale = True
+        if not self.isVisible():
+            return
+        if self._scheduler:
+            self._scheduler.call_later(self.refresh)
+        else:
+            self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+
+    def refresh(self):
+        if not self._stale:
+            return
+        self._stale = False
+        self.list_widget.clear()
+        for row in self.results():
+            self.list_widget.addItem(self._make_item(*row))
+
+    def results(self):
+        """Yield rows for the current scale, by default (shape, root, detail text) tuples."""
+        raise NotImplementedError
+
+    def _make_item(self, shape, root, detail):
+        root_name = note_names(shape, root)[root]
+        name = self.catalog.name_for(shape) or f"Scale {shape}"
+        item = QListWidgetItem(f"{root_name} {name}  {detail}")
+        item.setData(Qt.UserRole, (shape, root))
+        return item
+
+    def _select(self, item):
+        shape, root = item.data(Qt.UserRole)
+        self.scale_model.set_state(shape, root)
+
+class SimilarScalesPanel(RelatedScalesPanel):
+    """Nearest scales by shared notes or interval content, from a SimilarityIndex."""
+    MAX_RESULTS = 25
+
+    def __init__(self, scale_model, catalog, index, parent=None):
+        super().__init__(scale_model, catalog, parent)
+        self.index = index
+        self.cmb_metric = self.add_option([("Shared notes", "hamming"), ("Interval vector", "interval")])
+        self.cmb_scope = self.add_option([("Named scales", "catalog"), ("All scales", "all")])
+
+    def results(self):
+        matches = self.index.nearest(self.scale_model.number, self.MAX_RESULTS,
+                                     metric=self.cmb_metric.currentData(),
+                                     scope=self.cmb_scope.currentData(),
+                                     root=self.scale_model.root_note)
+        for m in matches:
+            yield m.shape, m.root, f"(±{m.hamming} notes, iv Δ{m.interval_distance})"
+
+class ContainingScalesPanel(RelatedScalesPanel):
+    """Scales containing the current notes, or contained in them, at any root, from a SubsetIndex."""
+    MAX_RESULTS = 200
+
+    def __init__(self, scale_model, catalog, index, parent=None):
+        super().__init__(scale_model, catalog, parent)
+        self.index = index
+        self.cmb_direction = self.add_option([("Containing notes", "supersets"), ("Within notes", "subsets")])
+        self.cmb_scope = self.add_option([("Named scales", "catalog"), ("All scales", "all")])
+
+    def results(self):
+        query = getattr(self.index, self.cmb_direction.currentData())
+        for shape, root in query(self.scale_model.number, self.cmb_scope.currentData(), self.MAX_RESULTS):
+            count = cardinality(shape)
+            yield shape, root, f"({count} note{'' if count == 1 else 's'})"
+
+class ChordsPanel(RelatedScalesPanel):
+    """
+    Diatonic chords on each degree of the current scale. Clicking one plays it
+    and emits chord_selected(root pitch class, absolute pitch-class mask).
+    """
+    chord_selected = Signal(int, int)
+
+    NUMERALS = ("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII")
+
+    def __init__(self, scale_model, spelling, catalog, sound_engine, parent=None):
+        super().__init__(scale_model, catalog, parent)
+        self.spelling = spelling
+        self.sound_engine = sound_engine
+        self.cmb_family = self.add_option([("All chords", None)] + [(f.capitalize(), f) for f in FAMILIES])
+        self.spelling.updated.connect(self.invalidate)
+
+    def results(self):
+        family = self.cmb_family.currentData()
+        for chord in diatonic_chords(self.scale_model.shape):
+            if family is None or chord.template.family == family:
+                yield (chord,)
+
+    def _make_item(self, chord):
+        names = self.spelling.note_names
+        root = (self.scale_model.root_note + chord.root) % 12
+        numeral = self.NUMERALS[chord.degree - 1]
+        # Lower case for chords built on a minor third
+        if chord.template.mask & (1 << 3):
+            numeral = numeral.lower()
+        tones = " ".join(names[(root + i) % 12] for i in chord.template.intervals)
+        item = QListWidgetItem(f"{numeral}  {names[root]}{chord.template.suffix}  ({tones})")
+        mask = rotate(chord.mask, -self.scale_model.root_note)
+        item.setData(Qt.UserRole, (root, chord.template.intervals, mask))
+        return item
+
+    def _select(self, item):
+        root, intervals, mask = item.data(Qt.UserRole)
+        self.sound_engine.play_chord(root, intervals)
+        self.chord_selected.emit(root, mask)
@@ -1,36 +1,23 @@
-import os
-import yaml
 from PySide6.QtWidgets import QComboBox
+from models.catalog import ScaleCatalog
 
 class ScaleSelectDropdown(QComboBox):
-    def __init__(self, scale_model):
+    def __init__(self, scale_model, catalog=None):
         super().__init__()
         self.scale_model = scale_model
+        self.catalog = catalog if catalog is not None else ScaleCatalog.load()
         self.addItem("Select scale")
 
-        # Load scales
-        config_path = os.path.join(os.path.dirname(__file__), "../config/scales.yaml")
-        try:
-            with open(config_path, 'r') as f:
-                data = yaml.safe_load(f)
-        except FileNotFoundError:
-            data = {}
+        for category, entries in self.catalog.categories:
+            indent = ""
+            if category is not None:
+                self.addItem(category)
+                # Disable category header
+                self.model().item(self.count() - 1).setEnabled(False)
+                indent = "  "
 
-        if data:
-            # Check if it's the new categorized format (values are lists)
-            if isinstance(next(iter(data.values())), list):
-                for category, scales in data.items():
-                    self.addItem(category)
-                    # Disable category header
-                    self.model().item(self.count() - 1).setEnabled(False)
-
-                    for scale_entry in scales:
-                        for name, value in scale_entry.items():
-                            self.addItem(f"  {name}", value)
-            else:
-                # Legacy flat format
-                for name, value in data.items():
-                    self.addItem(name, value)
+            for name, shape in entries:
+                self.addItem(f"{indent}{name}", shape)
 
         self.currentIndexChanged.connect(self.on_selection)
 
@@ -39,8 +26,8 @@ class ScaleSelectDropdown(QComboBox):
 
         val = self.itemData(index)
         if val is not None:
-            self.scale_model.set_value(int(val))
+            self.scale_model.set_shape(int(val))
 
         self.blockSignals(True)
         self.setCurrentIndex(0)
-        self.blockSignals(False)
\ No newline at end of file
+        self.blockSignals(False)
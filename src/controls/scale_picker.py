@@ -0,0 +1,197 @@
+import re
+import numpy as np
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QListView, QCheckBox
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+from modules.math import num2str
+from modules import tables
+
+class ScaleListModel(QAbstractListModel):
+    """
+    List model over catalog arrays, for catalogs too large for a QComboBox.
+    Rows are handed to the view in batches (canFetchMore/fetchMore) and their
+    text is only built when the view asks for it.
+    Search text supports 'n:7' (cardinality) and 'iv:254362' (interval vector)
+    tokens; anything else is matched fuzzily against names and scale numbers.
+    """
+    BATCH_SIZE = 256
+
+    def __init__(self, catalog, include_all=False, parent=None):
+        super().__init__(parent)
+        self._catalog = catalog
+        self._query = None
+        self._build(include_all)
+
+    def _build(self, include_all):
+        shapes = []
+        names = []
+        for category, name, shape in self._catalog:
+            shapes.append(shape)
+            names.append(name)
+
+        if include_all:
+            # Every scale number, named ones keep their catalog name
+            for shape in range(4096):
+                shapes.append(shape)
+                names.append(self._catalog.name_for(shape))
+
+        self._shapes = np.array(shapes, dtype=np.int32)
+        self._names = names
+        self._haystack = [f"{name or ''} {shape}".lower() for name, shape in zip(names, shapes)]
+
+        # Per-shape columns, gathered into per-row indexes
+        shape_ivecs = tables.interval_codes(tables.interval_counts())
+        shape_cards = tables.cardinalities()
+        self._ivecs = shape_ivecs[self._shapes]
+        self._cards = shape_cards[self._shapes]
+        self._card_index = {c: np.flatnonzero(self._cards == c) for c in range(13)}
+        self._ivec_index = {}
+        for row, ivec in enumerate(self._ivecs):
+            self._ivec_index.setdefault(int(ivec), []).append(row)
+
+        self.beginResetModel()
+        self._rows = np.arange(len(shapes))
+        self._loaded = min(self.BATCH_SIZE, len(self._rows))
+        self._query = None
+        self.endResetModel()
+
+    def set_include_all(self, include_all):
+        query = self._query
+        self._build(include_all)
+        if query:
+            self.set_filter(query[0])
+
+    # --- Lazy materialization ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid(): return
+        count = min(self.BATCH_SIZE, len(self._rows) - self._loaded)
+        if count <= 0: return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        row = int(self._rows[index.row()])
+
+        if role == Qt.DisplayRole:
+            shape = int(self._shapes[row])
+            vec_str = num2str(int(self._ivecs[row]), 12).zfill(6)
+            name = self._names[row] or "—"
+            return f"{name}  ({shape}, {vec_str})"
+        elif role == Qt.UserRole:
+            return int(self._shapes[row])
+        return None
+
+    def shape_at(self, index):
+        return self.data(index, Qt.UserRole)
+
+    # --- Filtering ---
+
+    def _parse_query(self, text):
+        card = None
+        ivec = None
+        words = []
+        for token in text.lower().split():
+            if token.startswith("n:") and token[2:].isdigit():
+                card = int(token[2:])
+            elif token.startswith("iv:") and token[3:]:
+                try:
+                    ivec = int(token[3:], 12)
+                except ValueError:
+                    words.append(token)
+            else:
+                words.append(token)
+        return card, ivec, " ".join(words)
+
+    def set_filter(self, text):
+        card, ivec, words = self._parse_query(text)
+        previous = self._query
+
+        # Typing more characters can only narrow the result, so search within it
+        if previous and previous[1:3] == (card, ivec) and words.startswith(previous[3]):
+            candidates = self._rows
+        else:
+            candidates = np.arange(len(self._shapes))
+            if card is not None:
+                candidates = self._card_index.get(card, np.empty(0, dtype=np.int64))
+            if ivec is not None:
+                ivec_rows = np.array(self._ivec_index.get(ivec, []), dtype=np.int64)
+                candidates = np.intersect1d(candidates, ivec_rows, assume_unique=True)
+
+        if words:
+            pattern = re.compile(".*?".join(re.escape(c) for c in words))
+            scored = []
+            for row in candidates:
+                hay = self._haystack[row]
+                m = pattern.search(hay)
+                if m:
+                    # Prefer contiguous matches, then tight fuzzy spans, then catalog order
+                    exact = words in hay
+                    scored.append((0 if exact else 1, m.end() - m.start(), m.start(), int(row)))
+            scored.sort()
+            rows = np.array([s[3] for s in scored], dtype=np.int64)
+        else:
+            rows = np.sort(np.asarray(candidates, dtype=np.int64))
+
+        self.beginResetModel()
+        self._rows = rows
+        self._loaded = min(self.BATCH_SIZE, len(rows))
+        self._query = (text, card, ivec, words)
+        self.endResetModel()
+
+class ScalePicker(QFrame):
+    """Searchable popup list of scales; picking one sets the model's shape."""
+
+    def __init__(self, scale_model, catalog, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.scale_model = scale_model
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setStyleSheet("background-color: #1e1e1e; color: #CCCCCC;")
+        self.resize(320, 400)
+
+        self.txt_search = QLineEdit()
+        self.txt_search.setPlaceholderText("Search (n:7, iv:254362)")
+        self.txt_search.setClearButtonEnabled(True)
+
+        self.chk_all = QCheckBox("All 4096 scale numbers")
+
+        self.list_model = ScaleListModel(catalog, parent=self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.list_model)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.addWidget(self.txt_search)
+        layout.addWidget(self.chk_all)
+        layout.addWidget(self.list_view)
+
+        self.txt_search.textChanged.connect(self.list_model.set_filter)
+        self.txt_search.returnPressed.connect(self._select_first)
+        self.chk_all.toggled.connect(self.list_model.set_include_all)
+        self.list_view.activated.connect(self._select)
+        self.list_view.clicked.connect(self._select)
+
+    def popup(self, global_pos):
+        self.move(global_pos)
+        self.show()
+        self.txt_search.setFocus()
+        self.txt_search.selectAll()
+
+    def _select_first(self):
+        if self.list_model.rowCount() > 0:
+            self._select(self.list_model.index(0))
+
+    def _select(self, index):
+        shape = self.list_model.shape_at(index)
+        if shape is not None:
+            self.scale_model.set_shape(shape)
+            self.hide()
@@ -1,12 +1,12 @@
 import os
-import yaml
 from PySide6.QtWidgets import QComboBox, QWidget, QHBoxLayout, QPushButton
+from modules.config import config_path, load_config
 
 class PresetSelector(QComboBox):
-    def __init__(self, config_file="config/tunings.yaml"):
+    def __init__(self, config_file=None):
         super().__init__()
         self.tunings = {}
-        self._load_tunings(config_file)
+        self._load_tunings(config_file or config_path("tunings.yaml"))
         self.addItems(list(self.tunings.keys()))
 
     def _load_tunings(self, config_file):
@@ -14,10 +14,9 @@ class PresetSelector(QComboBox):
             return
         
         try:
-            with open(config_file, 'r') as f:
-                data = yaml.safe_load(f)
-                if isinstance(data, dict):
-                    self.tunings = data
+            data = load_config(config_file)
+            if isinstance(data, dict):
+                self.tunings = data
         except Exception as e:
             print(f"Error loading tunings: {e}")
 
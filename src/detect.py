@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Suggest the scale and root of WAV recordings from their pitch-class content.
+
+    python detect.py song.wav
+    python detect.py recordings/ --workers 8 --format jsonl > scales.jsonl
+    python detect.py take1.wav take2.wav --scope catalog --top 3
+
+Directories are searched recursively for .wav files. Each file is streamed
+through a chunked STFT (memory use does not grow with its length) and its
+pitch-class profile is matched against every scale shape at every root, or
+only the named scales with --scope catalog. With --workers N files are
+analyzed in N processes; results are printed in input order as they finish.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from models.catalog import ScaleCatalog
+from modules.detect import detect_files, find_wav_files
+from modules.spelling import note_names
+
+SCOPES = ("all", "catalog")
+
+def describe(match, catalog):
+    root_name = note_names(match.shape, match.root)[match.root]
+    return root_name, catalog.name_for(match.shape) or ""
+
+def write_text(result, catalog, stream):
+    stream.write(f"{result.path} ({result.duration:.1f}s)\n")
+    if not result.matches:
+        stream.write("    no pitched content\n")
+    for m in result.matches:
+        root_name, name = describe(m, catalog)
+        stream.write(f"    {m.score:6.3f}  {root_name:<2} {m.shape:4d}  {name}\n")
+
+def write_jsonl(result, catalog, stream):
+    matches = []
+    for m in result.matches:
+        root_name, name = describe(m, catalog)
+        matches.append({"shape": m.shape, "root": m.root, "root_name": root_name,
+                        "name": name or None, "score": round(m.score, 4)})
+    row = {"path": result.path, "duration": round(result.duration, 3),
+           "chroma": [round(c, 4) for c in result.chroma], "matches": matches}
+    stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Detect the scale and root of WAV recordings.")
+    parser.add_argument("paths", nargs="+", help="WAV files or directories to search")
+    parser.add_argument("--scope", choices=SCOPES, default="all", help="Match all shapes or only named scales (default: all)")
+    parser.add_argument("--top", type=int, default=5, help="Matches listed per file (default: 5)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of analysis processes (default: 1)")
+    parser.add_argument("--format", choices=("text", "jsonl"), default="text", help="Output format (default: text)")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args(sys.argv[1:])
+    catalog = ScaleCatalog.load()
+    shapes = [shape for _, _, shape in catalog] if args.scope == "catalog" else None
+    paths = find_wav_files(args.paths)
+    if not paths:
+        sys.exit("No WAV files found")
+
+    write = write_text if args.format == "text" else write_jsonl
+    start = time.perf_counter()
+    failed = 0
+    try:
+        for result in detect_files(paths, max(1, args.top), shapes, max(1, args.workers)):
+            if isinstance(result[1], Exception):
+                path, error = result
+                print(f"{path}: {error}", file=sys.stderr)
+                failed += 1
+                continue
+            write(result, catalog, sys.stdout)
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # Output piped into e.g. head; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {len(paths) - failed} of {len(paths)} files in {elapsed:.2f}s", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .instrument import InstrumentModel
-from .scale import ScaleModel
\ No newline at end of file
+from .scale import ScaleModel
+from .catalog import ScaleCatalog
@@ -0,0 +1,103 @@
+from modules.math import necklace
+from modules.config import config_path, load_config
+
+DEFAULT_SCALES_PATH = config_path("scales.yaml")
+
+class ScaleCatalog:
+    """
+    Named scales loaded from scales.yaml, indexed for O(1) lookups by
+    shape, by name (exact, else case-insensitive) and by necklace class
+    (all modes of a scale).
+    """
+
+    def __init__(self, data=None):
+        # Ordered [(category, [(name, shape), ...]), ...]; category is None for the flat format
+        self.categories = []
+        self._by_shape = {}
+        self._by_name = {}
+        self._by_folded_name = {}
+        self._by_necklace = {}
+
+        if data:
+            self._index(data)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SCALES_PATH):
+        try:
+            data = load_config(path)
+        except FileNotFoundError:
+            data = {}
+        return cls(data)
+
+    def _index(self, data):
+        # Check if it's the categorized format (values are lists)
+        if isinstance(next(iter(data.values())), list):
+            for category, scales in data.items():
+                entries = []
+                for scale_entry in scales:
+                    for name, value in scale_entry.items():
+                        entries.append((name, int(value)))
+                self.categories.append((category, entries))
+        else:
+            # Legacy flat format
+            self.categories.append((None, [(name, int(value)) for name, value in data.items()]))
+
+        for category, entries in self.categories:
+            for name, shape in entries:
+                # First entry wins when a shape or name appears twice
+                self._by_shape.setdefault(shape, (category, name))
+                self._by_name.setdefault(name, shape)
+                self._by_folded_name.setdefault(name.casefold(), shape)
+                self._by_necklace.setdefault(necklace(shape), []).append((category, name, shape))
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        """Yield (category, name, shape) in catalog order."""
+        for category, entries in self.categories:
+            for name, shape in entries:
+                yield category, name, shape
+
+    def lookup(self, shape):
+        """Return (category, name) for a shape, or None."""
+        return self._by_shape.get(shape)
+
+    def name_for(self, shape):
+        entry = self._by_shape.get(shape)
+        return entry[1] if entry else None
+
+    def shape_for(self, name):
+        shape = self._by_name.get(name)
+        return shape if shape is not None else self._by_folded_name.get(name.casefold())
+
+    def modes_of(self, shape):
+        """Return every named (category, name, shape) in the same necklace class as shape."""
+        return list(self._by_necklace.get(necklace(shape), []))
+
+def parse_int_set(spec, upper, catalog=None):
+    """
+    Parse 'all', 'a-b', 'a,b,c' (mixed freely) or, with a catalog,
+    'catalog' / 'category:<name>' into an ordered list of unique ints.
+    """
+    values = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if part == "all":
+            values.extend(range(upper))
+        elif catalog is not None and part == "catalog":
+            values.extend(shape for _, _, shape in catalog)
+        elif catalog is not None and part.startswith("category:"):
+            category = part[len("category:"):]
+            matches = [entries for name, entries in catalog.categories if name == category]
+            if not matches:
+                raise ValueError(f"Unknown category: {category}")
+            values.extend(shape for _, shape in matches[0])
+        elif "-" in part:
+            start, end = part.split("-", 1)
+            values.extend(range(int(start), int(end) + 1))
+        else:
+            values.append(int(part))
+    return [v for v in dict.fromkeys(values) if 0 <= v < upper]
@@ -1,13 +1,35 @@
 import numpy as np
 from PySide6.QtCore import QObject, Signal
 
+def note_grid(tuning, num_frets, capo=0, string_frets=None):
+    """
+    Pitch class at each (string, fret), or -1 where the position can't be
+    played: behind the capo, or past the last fret of a shorter string.
+    """
+    grid = (np.array(tuning, dtype=np.int8)[:, np.newaxis] + np.arange(num_frets + 1, dtype=np.int8)) % 12
+    grid[:, :capo] = -1
+    if string_frets is not None:
+        for s, count in enumerate(string_frets):
+            grid[s, count + 1:] = -1
+    return grid
+
 class InstrumentModel(QObject):
+    """
+    Tuning, fret count, capo and per-string fret counts of a fretted
+    instrument. The note grid and the reverse index from pitch class to
+    (string, fret) positions are built once per change and shared by every
+    view, so painting and hit testing never rebuild them.
+    """
     updated = Signal()
 
-    def __init__(self, tuning=None, frets=24):
+    def __init__(self, tuning=None, frets=24, capo=0, string_frets=None):
         super().__init__()
         self._num_frets = frets
         self._tuning = tuning if tuning else [4, 9, 2, 7, 11, 4]
+        self._capo = capo
+        self._string_frets = tuple(string_frets) if string_frets else None
+        self._grid = None
+        self._positions = None
 
     @property
     def num_strings(self): return len(self._tuning)
@@ -15,17 +37,67 @@ class InstrumentModel(QObject):
     def num_frets(self): return self._num_frets
     @property
     def tuning(self): return self._tuning
+    @property
+    def capo(self): return self._capo
+
+    @property
+    def string_frets(self):
+        """Highest playable fret on each string."""
+        return self._string_frets or (self._num_frets,) * len(self._tuning)
 
     def get_note_grid(self):
-        tuning_vec = np.array(self._tuning)[:, np.newaxis]
-        fret_vec = np.arange(self._num_frets + 1)
-        return (tuning_vec + fret_vec) % 12
+        """Cached (strings, frets + 1) int8 array of pitch classes, -1 where unplayable. Read-only."""
+        if self._grid is None:
+            self._grid = note_grid(self._tuning, self._num_frets, self._capo, self._string_frets)
+            self._grid.setflags(write=False)
+        return self._grid
+
+    def note_at(self, string_idx, fret):
+        """Pitch class at (string, fret), or None if it can't be played."""
+        grid = self.get_note_grid()
+        if 0 <= string_idx < grid.shape[0] and 0 <= fret < grid.shape[1] and grid[string_idx, fret] >= 0:
+            return int(grid[string_idx, fret])
+        return None
+
+    def positions(self, pitch_class):
+        """(n, 2) array of the playable (string, fret) positions of a pitch class, by string then fret."""
+        if self._positions is None:
+            grid = self.get_note_grid()
+            self._positions = []
+            for pc in range(12):
+                pos = np.argwhere(grid == pc)
+                pos.setflags(write=False)
+                self._positions.append(pos)
+        return self._positions[pitch_class % 12]
+
+    def _invalidate(self):
+        self._grid = None
+        self._positions = None
+        self.updated.emit()
 
     def set_string_note(self, string_idx, note_val):
         if 0 <= string_idx < len(self._tuning):
             self._tuning[string_idx] = note_val
-            self.updated.emit()
+            self._invalidate()
 
     def set_tuning(self, tuning):
         self._tuning = list(tuning)
-        self.updated.emit()
+        # Per-string fret counts belong to the old strings
+        if self._string_frets and len(self._string_frets) != len(self._tuning):
+            self._string_frets = None
+        self._invalidate()
+
+    def set_capo(self, fret):
+        fret = max(0, min(int(fret), self._num_frets))
+        if fret != self._capo:
+            self._capo = fret
+            self._invalidate()
+
+    def set_string_frets(self, counts):
+        """Highest playable fret per string (e.g. a banjo's short fifth string); None for all frets."""
+        counts = tuple(min(int(c), self._num_frets) for c in counts) if counts else None
+        if counts and len(counts) != len(self._tuning):
+            raise ValueError(f"Expected {len(self._tuning)} fret counts, got {len(counts)}")
+        if counts != self._string_frets:
+            self._string_frets = counts
+            self._invalidate()
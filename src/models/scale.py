@@ -1,7 +1,35 @@
+from contextlib import contextmanager
 from PySide6.QtCore import QObject, Signal
 from modules.math import rotate, intervals
 
+def mode_rotation(shape, root_note, direction):
+    """(shape, root) of the next mode up (direction 1) or down (-1): same notes, next active root."""
+    if shape == 0:
+        return shape, root_note
+    if direction == 1:
+        shift = intervals(shape, 0)
+    else:
+        shift = -intervals(shape, 0, direction='descending')
+    # Rotate shape right by shift to preserve absolute notes
+    return rotate(shape, shift), (root_note + shift) % 12
+
+def neighbor_states(shape, root_note):
+    """
+    (shape, root) pairs one keystroke away (see handle_scale_key_event), most
+    frequent moves first: mode rotation, transposition by ±1 and ±7 semitones,
+    then toggling each note and clearing the scale. The current state and
+    repeats are left out.
+    """
+    states = [mode_rotation(shape, root_note, 1), mode_rotation(shape, root_note, -1)]
+    states += [(shape, (root_note + t) % 12) for t in (1, -1, 7, -7)]
+    states += [(shape ^ (1 << i), root_note) for i in range(12)]
+    states.append((0, root_note))
+    return [s for s in dict.fromkeys(states) if s != (shape, root_note)]
+
 class ScaleModel(QObject):
+    # 'changed' fires first so derived state (e.g. Spelling) is current
+    # by the time views react to 'updated'.
+    changed = Signal()
     updated = Signal()
 
     def __init__(self):
@@ -9,6 +37,30 @@ class ScaleModel(QObject):
         # Ionian: (LSB)101011010101(MSB) = 2741
         self._shape = 2741
         self._root_note = 0
+        self._batch_depth = 0
+        self._batch_dirty = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer notifications until the outermost batch exits.
+        Any number of mutations inside the block produce a single update.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._notify()
+
+    def _notify(self):
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        self.changed.emit()
+        self.updated.emit()
 
     @property
     def number(self):
@@ -34,35 +86,31 @@ class ScaleModel(QObject):
     def toggle_note_active(self, note_val):
         idx = (note_val - self._root_note) % 12
         self._shape ^= (1 << idx)
-        self.updated.emit()
+        self._notify()
+
+    def toggle_notes(self, mask):
+        # Toggle every absolute note in mask with a single update
+        self._shape ^= rotate(mask & 0xFFF, self._root_note)
+        self._notify()
 
     def set_shape(self, shape):
         self._shape = shape & 0xFFF
-        self.updated.emit()
+        self._notify()
+
+    def set_state(self, shape, root_note):
+        with self.batch():
+            self._root_note = root_note % 12
+            self.set_shape(shape)
 
     def rotate_modes(self, direction):
         if self._shape == 0: return
-        
-        # Find next active bit in direction
-        if direction == 1:
-            shift = intervals(self._shape, 0)
-        else:
-            shift = -intervals(self._shape, 0, direction='descending')
-        
-        # Update offset
-        self._root_note = (self._root_note + shift) % 12
-        
-        # Rotate shape right by shift to preserve absolute notes (Mode Change)
-        # Right rotate: (val >> s) | (val << (12-s))
-        s = shift
-        self._shape = rotate(self._shape, s)
-        
-        self.updated.emit()
+        self._shape, self._root_note = mode_rotation(self._shape, self._root_note, direction)
+        self._notify()
 
     def transpose(self, semitones):
         # Rotate offset, keep shape same (Transposition)
         self._root_note = (self._root_note + semitones) % 12
-        self.updated.emit()
+        self._notify()
 
     def transpose_mask(self, semitones):
         mask = self.number
@@ -76,4 +124,4 @@ class ScaleModel(QObject):
         # Rotate shape right by diff to preserve absolute notes
         s = diff
         self._shape = rotate(self._shape, s)
-        self.updated.emit()
\ No newline at end of file
+        self._notify()
\ No newline at end of file
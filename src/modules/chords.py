@@ -0,0 +1,91 @@
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+from .math import rotate, pitch_set
+
+class ChordTemplate(NamedTuple):
+    name: str
+    suffix: str
+    family: str
+    # Semitones above the chord root, as voiced for playback
+    intervals: Tuple[int, ...]
+    # Pitch classes relative to the chord root (bit 0 = root)
+    mask: int
+
+class Chord(NamedTuple):
+    # 1-based scale degree of the chord root
+    degree: int
+    # Chord root in semitones above the scale root
+    root: int
+    template: ChordTemplate
+    # Chord pitch classes relative to the scale root
+    mask: int
+
+def _template(name, suffix, family, *intervals):
+    mask = 0
+    for i in intervals:
+        mask |= 1 << (i % 12)
+    return ChordTemplate(name, suffix, family, intervals, mask)
+
+FAMILIES = ("triad", "sus", "seventh", "sixth", "extended")
+
+TEMPLATES = (
+    _template("major", "", "triad", 0, 4, 7),
+    _template("minor", "m", "triad", 0, 3, 7),
+    _template("diminished", "°", "triad", 0, 3, 6),
+    _template("augmented", "+", "triad", 0, 4, 8),
+    _template("sus2", "sus2", "sus", 0, 2, 7),
+    _template("sus4", "sus4", "sus", 0, 5, 7),
+    _template("7sus4", "7sus4", "sus", 0, 5, 7, 10),
+    _template("major 7th", "maj7", "seventh", 0, 4, 7, 11),
+    _template("dominant 7th", "7", "seventh", 0, 4, 7, 10),
+    _template("minor 7th", "m7", "seventh", 0, 3, 7, 10),
+    _template("minor-major 7th", "m(maj7)", "seventh", 0, 3, 7, 11),
+    _template("half-diminished 7th", "ø7", "seventh", 0, 3, 6, 10),
+    _template("diminished 7th", "°7", "seventh", 0, 3, 6, 9),
+    _template("augmented major 7th", "+maj7", "seventh", 0, 4, 8, 11),
+    _template("augmented 7th", "+7", "seventh", 0, 4, 8, 10),
+    _template("major 6th", "6", "sixth", 0, 4, 7, 9),
+    _template("minor 6th", "m6", "sixth", 0, 3, 7, 9),
+    _template("add9", "add9", "extended", 0, 4, 7, 14),
+    _template("minor add9", "m(add9)", "extended", 0, 3, 7, 14),
+    _template("major 9th", "maj9", "extended", 0, 4, 7, 11, 14),
+    _template("dominant 9th", "9", "extended", 0, 4, 7, 10, 14),
+    _template("minor 9th", "m9", "extended", 0, 3, 7, 10, 14),
+    _template("dominant 11th", "11", "extended", 0, 4, 7, 10, 14, 17),
+    _template("minor 11th", "m11", "extended", 0, 3, 7, 10, 14, 17),
+    _template("major 13th", "maj13", "extended", 0, 4, 7, 11, 14, 21),
+    _template("dominant 13th", "13", "extended", 0, 4, 7, 10, 14, 21),
+    _template("minor 13th", "m13", "extended", 0, 3, 7, 10, 14, 21),
+)
+
+TEMPLATE_INDEX = {t.name: i for i, t in enumerate(TEMPLATES)}
+
+@lru_cache(maxsize=None)
+def root_masks(number):
+    """
+    For each template, the mask of notes in number on which that chord can be
+    built entirely from notes of number: the AND of number rotated down by
+    each chord tone. Works on absolute numbers and on shapes alike.
+    """
+    masks = []
+    for template in TEMPLATES:
+        roots = number
+        for i in pitch_set(template.mask):
+            roots &= rotate(number, i)
+        masks.append(roots)
+    return tuple(masks)
+
+def chord_roots(number, name):
+    """Mask of the notes of number that root a diatonic chord of the named template."""
+    return root_masks(number)[TEMPLATE_INDEX[name]]
+
+@lru_cache(maxsize=None)
+def diatonic_chords(shape):
+    """Every template chord on every degree of shape, in degree then template order."""
+    masks = root_masks(shape)
+    chords = []
+    for degree, interval in enumerate(pitch_set(shape), 1):
+        for template, roots in zip(TEMPLATES, masks):
+            if (roots >> interval) & 1:
+                chords.append(Chord(degree, interval, template, rotate(template.mask, -interval)))
+    return tuple(chords)
@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import pickle
+import hashlib
+
+CONFIG_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../config"))
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "siren")
+CACHE_VERSION = 2
+# A source modified this close to the cache write may have been edited again
+# within the same mtime tick, so its stamp alone is not trusted
+RACY_NS = 2 * 10**9
+
+def config_path(name):
+    """Resolve a file in the repository's config directory, independent of the working directory."""
+    return os.path.join(CONFIG_DIR, name)
+
+def cache_path(path):
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(path)}.{key}.pickle")
+
+def parse_yaml(raw):
+    # PyYAML is only imported on a cache miss
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(raw, Loader=loader)
+
+def _read_cache(cache_file):
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+        return None
+    return cached
+
+def _write_cache(cache_file, cached):
+    # Write to a temporary file first so a concurrent reader never sees a partial cache
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write config cache {cache_file}: {e}")
+
+def load_config(path, use_cache=True):
+    """
+    Load a YAML config file through a compiled pickle cache.
+    The cache is trusted as-is while the source mtime and size are unchanged
+    and the source is older than the cache by RACY_NS; otherwise the source
+    is hashed and only re-parsed if its contents differ.
+    Raises FileNotFoundError if the source does not exist.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache_file = cache_path(path)
+
+    cached = _read_cache(cache_file) if use_cache else None
+    if cached and cached["stamp"] == stamp and stamp[0] < cached["written"] - RACY_NS:
+        return cached["data"]
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if cached and cached["digest"] == digest:
+        data = cached["data"]
+    else:
+        data = parse_yaml(raw)
+
+    if use_cache:
+        _write_cache(cache_file, {"version": CACHE_VERSION, "stamp": stamp, "written": time.time_ns(),
+                                  "digest": digest, "data": data})
+    return data
+
+def benchmark(paths, repeat=20):
+    """Compare startup load time of plain PyYAML parsing against the compiled cache."""
+    import yaml
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            raw = f.read()
+
+        def time_it(fn):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            return (time.perf_counter() - start) / repeat * 1000
+
+        load_config(path)  # Warm the cache
+        timings = [("yaml.safe_load", time_it(lambda: yaml.safe_load(raw)))]
+        if hasattr(yaml, "CSafeLoader"):
+            timings.append(("yaml CSafeLoader", time_it(lambda: yaml.load(raw, Loader=yaml.CSafeLoader))))
+        timings.append(("compiled cache", time_it(lambda: load_config(path))))
+
+        print(f"{path} ({len(raw)} bytes, {repeat} runs)")
+        baseline = timings[0][1]
+        for name, ms in timings:
+            print(f"  {name:<18} {ms:9.3f} ms  ({baseline / ms:6.1f}x)")
+
+if __name__ == "__main__":
+    # Usage: python -m modules.config [config files...]
+    files = sys.argv[1:] or [config_path("scales.yaml"), config_path("tunings.yaml")]
+    benchmark(files)
@@ -0,0 +1,312 @@
+"""
+Scale and root detection from audio via a pitch-class histogram (chromagram).
+
+Audio is read in fixed-size blocks (stdlib wave for PCM, np.memmap for float
+and WAVE_FORMAT_EXTENSIBLE files) and fed through a streaming STFT, so memory
+use does not depend on the length of the recording. Each STFT frame's
+magnitude spectrum is folded onto the 12 pitch classes and the frames are
+summed into one profile. The profile is then correlated against a
+precomputed template for every (shape, root) pair in a single matrix product.
+"""
+import os
+import struct
+import wave
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+import numpy as np
+from . import tables
+
+N_FFT = 8192
+HOP = 2048
+# Pitches folded into the profile: C2 to C7
+FMIN = 65.4
+FMAX = 2093.0
+# Frames quieter than this (RMS of full-scale samples) are skipped as silence
+SILENCE_RMS = 1e-3
+BLOCK_FRAMES = 1 << 16
+
+# Extra template weight on the root and, when present, its fifth: notes of a
+# scale are heard equally often, so the root is told apart by its salience.
+ROOT_WEIGHT = 1.0
+FIFTH_WEIGHT = 0.5
+
+WAV_EXTENSIONS = (".wav", ".wave")
+
+class Detection(NamedTuple):
+    shape: int
+    root: int
+    score: float
+
+class DetectionResult(NamedTuple):
+    path: str
+    duration: float
+    # Normalized pitch-class profile, index 0 = C
+    chroma: Tuple[float, ...]
+    matches: Tuple[Detection, ...]
+
+# --- Reading ---
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def _decode_pcm(raw, width, channels):
+    """Interleaved little-endian PCM bytes -> (frames, channels) float32 in [-1, 1)."""
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        data = ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8).astype(np.float32) / (1 << 23)
+    elif width in (2, 4):
+        dtype = "<i2" if width == 2 else "<i4"
+        data = np.frombuffer(raw, dtype=dtype).astype(np.float32) / (1 << (8 * width - 1))
+    else:
+        raise ValueError(f"Unsupported sample width: {width} bytes")
+    return data.reshape(-1, channels)
+
+def _riff_chunks(path):
+    """fmt fields and (offset, size) of the data chunk of a RIFF/WAVE file."""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise ValueError("not a WAV file")
+        fmt = data = None
+        while fmt is None or data is None:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError("missing fmt or data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                audio_format, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    audio_format = struct.unpack("<H", body[24:26])[0]
+                fmt = (audio_format, channels, rate, block_align, bits)
+                f.seek(size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data = (f.tell(), size)
+                f.seek(size + size % 2, os.SEEK_CUR)
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+    return fmt, data
+
+class WavReader:
+    """
+    Mono float32 blocks from a WAV file. PCM files go through the wave module;
+    float and extensible-format files (which it can't read) are memory-mapped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._wave = None
+        self._data = None
+        try:
+            self._wave = wave.open(path, "rb")
+            self.sample_rate = self._wave.getframerate()
+            self.channels = self._wave.getnchannels()
+            self.num_frames = self._wave.getnframes()
+            self._width = self._wave.getsampwidth()
+        except (wave.Error, EOFError):
+            (audio_format, channels, rate, block_align, bits), (offset, size) = _riff_chunks(path)
+            self.sample_rate, self.channels = rate, channels
+            self.num_frames = size // block_align
+            if audio_format == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+                dtype = "<f4" if bits == 32 else "<f8"
+                self._width = None
+            elif audio_format == _WAVE_FORMAT_PCM and bits in (8, 16, 24, 32):
+                dtype = np.uint8
+                self._width = bits // 8
+            else:
+                raise ValueError(f"unsupported WAV format {audio_format} ({bits} bit)")
+            count = self.num_frames * (channels if self._width is None else block_align)
+            self._data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+    @property
+    def duration(self):
+        return self.num_frames / self.sample_rate if self.sample_rate else 0.0
+
+    def blocks(self, block_frames=BLOCK_FRAMES):
+        """Yield mono float32 arrays of up to block_frames samples."""
+        for start in range(0, self.num_frames, block_frames):
+            count = min(block_frames, self.num_frames - start)
+            if self._wave is not None:
+                frames = _decode_pcm(self._wave.readframes(count), self._width, self.channels)
+            elif self._width is None:
+                frames = np.asarray(self._data[start * self.channels:(start + count) * self.channels],
+                                    dtype=np.float32).reshape(-1, self.channels)
+            else:
+                step = self._width * self.channels
+                frames = _decode_pcm(self._data[start * step:(start + count) * step].tobytes(),
+                                     self._width, self.channels)
+            yield frames.mean(axis=1) if self.channels > 1 else frames[:, 0]
+
+    def close(self):
+        if self._wave is not None:
+            self._wave.close()
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- Chroma ---
+
+@lru_cache(maxsize=16)
+def pitch_class_weights(sample_rate, n_fft=N_FFT, fmin=FMIN, fmax=FMAX):
+    """(n_fft // 2 + 1, 12) matrix folding spectrum bins onto pitch classes; bins outside fmin-fmax get 0."""
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    weights = np.zeros((len(freqs), 12), dtype=np.float32)
+    band = (freqs >= fmin) & (freqs <= fmax)
+    midi = 69 + 12 * np.log2(freqs[band] / 440.0)
+    nearest = np.round(midi)
+    # Bins between two semitones count for less than bins on one
+    weights[np.nonzero(band)[0], nearest.astype(int) % 12] = np.cos(np.pi * (midi - nearest)) ** 2
+    weights.setflags(write=False)
+    return weights
+
+class ChromaStream:
+    """
+    Streaming STFT chromagram. feed() takes blocks of any length and returns
+    one 12-bin chroma row per complete frame, carrying the unfinished tail
+    over to the next block. Silent frames give all-zero rows.
+    """
+
+    def __init__(self, sample_rate, n_fft=N_FFT, hop=HOP, fmin=FMIN, fmax=FMAX):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = hop
+        self.window = np.hanning(n_fft).astype(np.float32)
+        self.weights = pitch_class_weights(sample_rate, n_fft, fmin, fmax)
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def reset(self):
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def feed(self, samples):
+        buf = np.concatenate([self._tail, np.asarray(samples, dtype=np.float32)])
+        if len(buf) < self.n_fft:
+            self._tail = buf
+            return np.zeros((0, 12), dtype=np.float32)
+
+        count = (len(buf) - self.n_fft) // self.hop + 1
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.n_fft)[::self.hop][:count]
+        self._tail = buf[count * self.hop:].copy()
+
+        loud = np.sqrt(np.mean(frames * frames, axis=1)) >= SILENCE_RMS
+        chroma = np.zeros((count, 12), dtype=np.float32)
+        if loud.any():
+            spectrum = np.abs(np.fft.rfft(frames[loud] * self.window, axis=1)).astype(np.float32)
+            # Log compression keeps a few loud partials from swamping the profile
+            rows = np.log1p(100 * spectrum / self.n_fft) @ self.weights
+            peak = rows.max(axis=1, keepdims=True)
+            chroma[loud] = rows / np.where(peak > 0, peak, 1)
+        return chroma
+
+def file_chroma(path, n_fft=N_FFT, hop=HOP, block_frames=BLOCK_FRAMES):
+    """Summed chroma profile of a WAV file, normalized to a maximum of 1, and its duration."""
+    with WavReader(path) as reader:
+        stream = ChromaStream(reader.sample_rate, n_fft, hop)
+        total = np.zeros(12, dtype=np.float64)
+        for block in reader.blocks(block_frames):
+            total += stream.feed(block).sum(axis=0)
+        duration = reader.duration
+    peak = total.max()
+    return (total / peak if peak > 0 else total), duration
+
+# --- Matching ---
+
+@lru_cache(maxsize=1)
+def templates():
+    """
+    (shapes, roots, matrix) for every shape containing its root at every root:
+    matrix rows are the zero-mean, unit-norm templates, in absolute pitch
+    classes, so matrix @ normalized chroma is the Pearson correlation.
+    The empty and chromatic shapes carry no information and are left out.
+    """
+    shapes = np.arange(1, tables.NUM_SCALES - 1, 2)
+    row_shapes = np.repeat(shapes, 12)
+    row_roots = np.tile(np.arange(12), len(shapes))
+
+    bits = ((row_shapes[:, None] >> np.arange(12)) & 1).astype(np.float32)
+    bits[:, 0] += ROOT_WEIGHT
+    bits[:, 7] += FIFTH_WEIGHT * bits[:, 7]
+    # Column k of a shape is root + k in absolute pitch classes
+    cols = (np.arange(12)[None, :] - row_roots[:, None]) % 12
+    matrix = np.take_along_axis(bits, cols, axis=1)
+    matrix -= matrix.mean(axis=1, keepdims=True)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    for a in (row_shapes, row_roots, matrix):
+        a.setflags(write=False)
+    return row_shapes, row_roots, matrix
+
+def template_row(shape, root):
+    """Row of (shape, root) in templates(), or None if the shape lacks its root (or is chromatic)."""
+    shape &= 0xFFF
+    if not shape & 1 or shape == tables.NUM_SCALES - 1:
+        return None
+    return (shape >> 1) * 12 + root % 12
+
+def score_chroma(chroma):
+    """Correlation of a 12-bin profile with every template row, or None for a flat profile."""
+    c = np.asarray(chroma, dtype=np.float32) - np.mean(chroma)
+    norm = np.linalg.norm(c)
+    if norm == 0:
+        return None
+    return templates()[2] @ (c / norm)
+
+def match_chroma(chroma, top=5, shapes=None):
+    """Best (shape, root) matches for a 12-bin profile, optionally only among the given shapes."""
+    row_shapes, row_roots, _ = templates()
+    scores = score_chroma(chroma)
+    if scores is None:
+        return ()
+    if shapes is not None:
+        scores = np.where(np.isin(row_shapes, np.fromiter(shapes, dtype=np.int64)), scores, -np.inf)
+
+    top = min(top, len(scores))
+    best = np.argpartition(-scores, top - 1)[:top]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return tuple(Detection(int(row_shapes[i]), int(row_roots[i]), float(scores[i]))
+                 for i in best if np.isfinite(scores[i]))
+
+def detect_file(path, top=5, shapes=None):
+    chroma, duration = file_chroma(path)
+    return DetectionResult(path, duration, tuple(float(x) for x in chroma), match_chroma(chroma, top, shapes))
+
+def find_wav_files(paths):
+    """WAV files among paths, searching directories recursively, in sorted order."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                found.extend(os.path.join(dirpath, f) for f in filenames
+                             if f.lower().endswith(WAV_EXTENSIONS))
+        else:
+            found.append(path)
+    return sorted(found)
+
+def _detect_or_error(args):
+    path, top, shapes = args
+    try:
+        return detect_file(path, top, shapes)
+    except (OSError, ValueError, EOFError, wave.Error) as e:
+        return path, e
+
+def detect_files(paths, top=5, shapes=None, workers=1):
+    """
+    Yield a DetectionResult, or a (path, exception) pair for unreadable files,
+    for each path in order. With workers > 1 files are analyzed in a process pool.
+    """
+    shapes = tuple(shapes) if shapes is not None else None
+    jobs = [(path, top, shapes) for path in paths]
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(_detect_or_error, jobs)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        yield from pool.map(_detect_or_error, jobs)
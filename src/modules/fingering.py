@@ -0,0 +1,218 @@
+"""
+Playable fingerings on a fretted instrument: scale positions and chord voicings.
+
+Strings are indexed from the lowest, as in InstrumentModel.tuning, and each
+string is assumed to sound less than an octave above the one below it (equal
+pitch classes are taken as unisons). Results are memoized per tuning, scale
+or chord mask and fret count, so stepping through positions or repainting
+never repeats a search.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+from .math import cardinality
+
+class Fingering(NamedTuple):
+    kind: str
+    # (string, fret) pairs in ascending pitch order
+    positions: Tuple[Tuple[int, int], ...]
+    low_fret: int
+    high_fret: int
+
+class Voicing(NamedTuple):
+    # One fret per string, -1 for a muted string
+    frets: Tuple[int, ...]
+    low_fret: int
+    high_fret: int
+
+    @property
+    def positions(self):
+        return tuple((s, f) for s, f in enumerate(self.frets) if f >= 0)
+
+# kind -> label
+SCALE_PATTERNS = {
+    "3nps": "3 notes per string",
+    "box": "Box",
+    "compact": "Compact",
+}
+
+# Widest fret span tolerated within one string, and across a whole position
+# (3-notes-per-string positions shift up the neck as they climb)
+MAX_STRING_STRETCH = 5
+MAX_POSITION_SPAN = {"3nps": 10, "compact": 7}
+BOX_WIDTH = 5
+COMPACT_COUNTS = (2, 3, 4)
+MAX_VOICINGS = 24
+
+def string_offsets(tuning):
+    """Semitones from the lowest open string to each open string."""
+    offsets = [0]
+    for low, high in zip(tuning, tuning[1:]):
+        offsets.append(offsets[-1] + (high - low) % 12)
+    return tuple(offsets)
+
+def _scale_pitches(tuning, number, num_frets):
+    """Every pitch of number on the neck, in semitones above the lowest open string."""
+    top = string_offsets(tuning)[-1] + num_frets
+    return [p for p in range(top + 1) if (number >> ((tuning[0] + p) % 12)) & 1]
+
+def _fingering(kind, strings):
+    positions = tuple((s, f) for s, frets in strings for f in frets)
+    frets = [f for _, f in positions]
+    return Fingering(kind, positions, min(frets), max(frets))
+
+def _search(offsets, scale, start, num_frets, counts, max_span):
+    """
+    Branch and bound over how many consecutive scale notes each string takes,
+    starting at scale[start] on the lowest string. Returns the per-string fret
+    lists with the smallest overall span (then the least stretch within
+    strings), or None. Branches are cut as soon as their span can no longer
+    beat the best complete position found so far.
+    """
+    best = [None, (max_span + 1, 0)]
+    path = []
+
+    def walk(s, k, lo, hi, stretch):
+        if s == len(offsets):
+            cost = (hi - lo, stretch)
+            if cost < best[1]:
+                best[0], best[1] = list(path), cost
+            return
+        for count in counts:
+            if k + count > len(scale):
+                break
+            frets = [scale[k + j] - offsets[s] for j in range(count)]
+            if frets[0] < 0 or frets[-1] > num_frets or frets[-1] - frets[0] > MAX_STRING_STRETCH:
+                continue
+            new_lo, new_hi = min(lo, frets[0]), max(hi, frets[-1])
+            if new_hi - new_lo > best[1][0]:
+                continue
+            path.append((s, frets))
+            walk(s + 1, k + count, new_lo, new_hi, stretch + frets[-1] - frets[0])
+            path.pop()
+
+    walk(0, start, num_frets, 0, 0)
+    return best[0]
+
+def _box(offsets, scale, start, num_frets):
+    """Every scale note in a BOX_WIDTH-fret window, each pitch on the lowest string that has it."""
+    first = scale[start]
+    low = max(0, first - 1)
+    high = low + BOX_WIDTH - 1
+    if high > num_frets:
+        return None
+
+    strings = []
+    k = start
+    for s, offset in enumerate(offsets):
+        frets = []
+        while k < len(scale) and scale[k] - offset <= high:
+            fret = scale[k] - offset
+            if fret < low:
+                # Only reachable on a lower string, which would have taken it
+                return None
+            frets.append(fret)
+            k += 1
+        if not frets:
+            return None
+        strings.append((s, frets))
+    return strings
+
+@lru_cache(maxsize=256)
+def scale_fingerings(tuning, number, num_frets, kind="3nps"):
+    """
+    Every position of the given kind for the absolute mask number, one per
+    scale note on the lowest string, ordered along the neck:
+        3nps     three consecutive scale notes on every string
+        box      all scale notes within a five-fret window
+        compact  2-4 notes per string, minimizing the overall span
+    """
+    tuning = tuple(tuning)
+    if not number or not tuning:
+        return ()
+    offsets = string_offsets(tuning)
+    scale = _scale_pitches(tuning, number, num_frets)
+
+    results = {}
+    for start, pitch in enumerate(scale):
+        if pitch > num_frets:
+            break
+        if kind == "box":
+            strings = _box(offsets, scale, start, num_frets)
+        elif kind == "3nps":
+            counts = (3,) if cardinality(number) >= 3 else (1,)
+            strings = _search(offsets, scale, start, num_frets, counts, MAX_POSITION_SPAN[kind])
+        else:
+            strings = _search(offsets, scale, start, num_frets, COMPACT_COUNTS, MAX_POSITION_SPAN[kind])
+        if strings:
+            fingering = _fingering(kind, strings)
+            results.setdefault(fingering.positions, fingering)
+    return tuple(sorted(results.values(), key=lambda f: (f.low_fret, f.high_fret)))
+
+@lru_cache(maxsize=256)
+def chord_voicings(tuning, root, mask, num_frets, max_span=3):
+    """
+    Voicings of a chord (root pitch class and absolute pitch-class mask) with
+    the root in the bass, on one contiguous run of at least three strings,
+    fretted within max_span frets (open strings are free). Every chord tone
+    is sounded, except that the fifth may be left out of chords with more
+    tones than strings. Fullest, most compact and lowest voicings come first.
+    """
+    tuning = tuple(tuning)
+    n = len(tuning)
+    mask &= 0xFFF
+    fifth = 1 << ((root + 7) % 12)
+    required = mask & ~fifth if cardinality(mask) > n else mask
+    min_strings = min(3, n)
+
+    found = set()
+
+    def walk(s, window, frets, covered, lo, hi, sounding):
+        if s == n or (sounding and frets[-1] < 0):
+            if sounding >= min_strings and covered & required == required:
+                found.add((tuple(frets) + (-1,) * (n - len(frets)), lo, hi))
+            return
+        # Tones still missing must fit on the strings that are left
+        if cardinality(required & ~covered) > n - s:
+            return
+
+        # Open strings only alongside the first frets
+        frets_in_reach = ([0] if window <= 1 else []) + list(range(max(1, window), window + max_span + 1))
+        options = [f for f in frets_in_reach if f <= num_frets and (mask >> ((tuning[s] + f) % 12)) & 1]
+        for fret in options:
+            pc = (tuning[s] + fret) % 12
+            # The first sounding string carries the root
+            if not sounding and pc != root:
+                continue
+            new_lo, new_hi = (min(lo, fret), max(hi, fret)) if fret else (lo, hi)
+            frets.append(fret)
+            walk(s + 1, window, frets, covered | (1 << pc), new_lo, new_hi, sounding + 1)
+            frets.pop()
+
+        # Mute: below the bass, or ending the run of sounding strings
+        frets.append(-1)
+        walk(s + 1, window, frets, covered, lo, hi, sounding)
+        frets.pop()
+
+    for window in range(0, max(1, num_frets - max_span + 1)):
+        walk(0, window, [], 0, num_frets + 1, -1, 0)
+
+    # Drop voicings that are a fuller voicing with strings muted. Sounding
+    # strings form one run, so those are exactly the shorter runs within
+    # each voicing found.
+    partial = set()
+    for frets, _, _ in found:
+        sounding = [s for s, f in enumerate(frets) if f >= 0]
+        first, end = sounding[0], sounding[-1] + 1
+        for a in range(first, end):
+            for b in range(a + min_strings, end + 1):
+                if (a, b) != (first, end):
+                    partial.add((-1,) * a + frets[a:b] + (-1,) * (n - b))
+    voicings = []
+    for frets, lo, hi in found:
+        if frets in partial:
+            continue
+        if hi < 0:
+            lo = hi = 0
+        voicings.append(Voicing(frets, lo, hi))
+    voicings.sort(key=lambda v: (v.low_fret, -len(v.positions), v.high_fret - v.low_fret, v.frets))
+    return tuple(voicings[:MAX_VOICINGS])
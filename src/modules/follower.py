@@ -0,0 +1,294 @@
+"""
+Live scale following: audio input -> decaying chroma -> ScaleModel.
+
+An input source (a sounddevice stream, or a WAV file played back in real
+time as a stand-in) writes mono blocks into a RingBuffer from its own thread.
+A ScaleFollower worker thread drains the buffer through a ChromaStream,
+folds the frames into an exponentially decaying pitch-class profile and, at
+most UPDATE_RATE times a second, matches it against the scale templates of
+modules/detect.py. A new best scale is handed to the GUI thread, which
+updates the model and records the time since the newest sample it was based
+on was captured.
+"""
+import math
+import time
+import threading
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+from .detect import ChromaStream, WavReader, score_chroma, template_row, templates
+from .sound import get_sounddevice
+
+SAMPLE_RATE = 44100
+BLOCK_FRAMES = 1024
+N_FFT = 4096
+# Analysis hop bounds; the hop grows when the DSP overruns its budget
+MIN_HOP = 1024
+MAX_HOP = 4096
+# Fraction of each block's real-time duration the DSP may use
+CPU_BUDGET = 0.25
+# Seconds for the chroma estimate to decay to 1/e
+DECAY_TIME = 4.0
+# Model updates per second, at most
+UPDATE_RATE = 4.0
+# A new scale must beat the current one by this much correlation, in this
+# many consecutive evaluations
+SWITCH_MARGIN = 0.05
+CONFIRM_UPDATES = 3
+# The estimate must at least correlate this well to move the model
+MIN_SCORE = 0.5
+RING_SECONDS = 2.0
+
+class RingBuffer:
+    """
+    Fixed-size sample ring for one writer and one reader thread. The reader
+    gets everything written since its last read; if it fell more than a
+    buffer behind, the oldest samples are dropped and counted.
+    """
+
+    def __init__(self, capacity):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._written = 0
+        self._read = 0
+        self._captured_at = 0.0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.dropped = 0
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def write(self, samples, captured_at):
+        samples = np.asarray(samples, dtype=np.float32)
+        count = len(samples)
+        # Only the newest capacity samples of an oversized block can be kept,
+        # but all of them count as written, so the reader sees them as dropped
+        samples = samples[-self.capacity:]
+        with self._lock:
+            start = (self._written + count - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            self._data[:len(samples) - first] = samples[first:]
+            self._written += count
+            self._captured_at = captured_at
+        self._ready.set()
+
+    def read(self):
+        """(new samples, capture time of the newest one)."""
+        with self._lock:
+            available = self._written - self._read
+            if available > self.capacity:
+                self.dropped += available - self.capacity
+                available = self.capacity
+            start = (self._written - available) % self.capacity
+            idx = (start + np.arange(available)) % self.capacity
+            samples = self._data[idx]
+            self._read = self._written
+            captured_at = self._captured_at
+            self._ready.clear()
+        return samples, captured_at
+
+    def wait(self, timeout):
+        return self._ready.wait(timeout)
+
+class SoundDeviceInput:
+    """Default input device through sounddevice."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_frames=BLOCK_FRAMES, device=None):
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.device = device
+        self._stream = None
+
+    @staticmethod
+    def available():
+        sd = get_sounddevice()
+        if sd is None:
+            return False
+        try:
+            return sd.query_devices(kind="input") is not None
+        except Exception:
+            return False
+
+    def start(self, callback):
+        sd = get_sounddevice()
+
+        def on_block(indata, frames, time_info, status):
+            callback(indata[:, 0], time.perf_counter())
+
+        self._stream = sd.InputStream(samplerate=self.sample_rate, blocksize=self.block_frames,
+                                      channels=1, dtype="float32", device=self.device, callback=on_block)
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+class WavFileInput:
+    """
+    Stand-in for a live input: plays a WAV file's blocks at real-time pace
+    (or as fast as possible with realtime=False), optionally looping.
+    """
+
+    def __init__(self, path, block_frames=BLOCK_FRAMES, realtime=True, loop=False):
+        self.path = path
+        self.block_frames = block_frames
+        self.realtime = realtime
+        self.loop = loop
+        with WavReader(path) as reader:
+            self.sample_rate = reader.sample_rate
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.finished = threading.Event()
+
+    def start(self, callback):
+        self._stop_event.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), daemon=True)
+        self._thread.start()
+
+    def _run(self, callback):
+        next_time = time.perf_counter()
+        while not self._stop_event.is_set():
+            with WavReader(self.path) as reader:
+                for block in reader.blocks(self.block_frames):
+                    if self._stop_event.is_set():
+                        break
+                    if self.realtime:
+                        next_time += len(block) / self.sample_rate
+                        self._stop_event.wait(max(0.0, next_time - time.perf_counter()))
+                    callback(block, time.perf_counter())
+            if not self.loop:
+                break
+        self.finished.set()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+class ScaleFollower(QObject):
+    """
+    Follows the scale of an input source and moves scale_model to it.
+    Pass shapes to only follow those (e.g. the catalog's named scales).
+
+    Statistics, read on the GUI thread:
+        latency   seconds from capture of the newest analyzed sample to the last model update
+        dsp_load  DSP time as a fraction of real time, smoothed
+        hop       current analysis hop in samples
+    """
+    # Worker -> GUI thread: shape, root, capture time
+    _detected = Signal(int, int, float)
+    latency_measured = Signal(float)
+    stopped = Signal()
+
+    def __init__(self, scale_model, shapes=None, parent=None):
+        super().__init__(parent)
+        self.scale_model = scale_model
+        self.latency = None
+        self.dsp_load = 0.0
+        self.hop = MIN_HOP
+        self._source = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._allowed = None
+        if shapes is not None:
+            row_shapes = templates()[0]
+            self._allowed = np.isin(row_shapes, np.fromiter(shapes, dtype=np.int64))
+        self._detected.connect(self._apply)
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, source):
+        self.stop()
+        self._source = source
+        self._ring = RingBuffer(int(source.sample_rate * RING_SECONDS))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(source.sample_rate,), daemon=True)
+        self._thread.start()
+        source.start(self._ring.write)
+
+    def stop(self):
+        if self._source is not None:
+            self._source.stop()
+            self._source = None
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.stopped.emit()
+
+    def _run(self, sample_rate):
+        stream = ChromaStream(sample_rate, N_FFT, MIN_HOP)
+        chroma = np.zeros(12, dtype=np.float64)
+        block_time = BLOCK_FRAMES / sample_rate
+        min_interval = 1.0 / UPDATE_RATE
+        last_update = 0.0
+        current = pending = None
+        confirmations = 0
+
+        while not self._stop_event.is_set():
+            if not self._ring.wait(block_time):
+                continue
+            samples, captured_at = self._ring.read()
+            if not len(samples):
+                continue
+
+            start = time.perf_counter()
+            frames = stream.feed(samples)
+            if len(frames):
+                # Each frame decays the estimate by one hop's worth
+                decay = math.exp(-stream.hop / (sample_rate * DECAY_TIME))
+                weights = decay ** np.arange(len(frames) - 1, -1, -1)
+                chroma = chroma * decay ** len(frames) + weights @ frames
+
+            now = time.perf_counter()
+            if now - last_update >= min_interval:
+                last_update = now
+                best = self._best(chroma, current)
+                if best is None or best == current:
+                    pending, confirmations = None, 0
+                else:
+                    confirmations = confirmations + 1 if best == pending else 1
+                    pending = best
+                    if current is None or confirmations >= CONFIRM_UPDATES:
+                        current, pending = best, None
+                        self._detected.emit(best[0], best[1], captured_at)
+
+            # Keep the DSP within its share of real time: analyze fewer
+            # frames when over budget, more again when well under
+            elapsed = time.perf_counter() - start
+            load = elapsed / (len(samples) / sample_rate)
+            self.dsp_load = 0.9 * self.dsp_load + 0.1 * load
+            if self.dsp_load > CPU_BUDGET and stream.hop < MAX_HOP:
+                stream.hop *= 2
+            elif self.dsp_load < CPU_BUDGET / 4 and stream.hop > MIN_HOP:
+                stream.hop //= 2
+            self.hop = stream.hop
+
+    def _best(self, chroma, current):
+        scores = score_chroma(chroma)
+        if scores is None:
+            return None
+        if self._allowed is not None:
+            scores = np.where(self._allowed, scores, -np.inf)
+        i = int(np.argmax(scores))
+        if scores[i] < MIN_SCORE:
+            return None
+        row_shapes, row_roots, _ = templates()
+        best = (int(row_shapes[i]), int(row_roots[i]))
+        # Hold the current scale unless the new one is clearly better
+        row = template_row(*current) if current else None
+        if row is not None and scores[i] - scores[row] < SWITCH_MARGIN:
+            return current
+        return best
+
+    def _apply(self, shape, root, captured_at):
+        self.scale_model.set_state(shape, root)
+        self.latency = time.perf_counter() - captured_at
+        self.latency_measured.emit(self.latency)
@@ -71,3 +71,10 @@ def num2str(val, base):
         res.append(digits[val % base])
         val //= base
     return "".join(res[::-1])
+
+def necklace(number):
+    """
+    Return the necklace class of a scale number: the smallest of its 12 rotations.
+    All modes of a scale share the same necklace class.
+    """
+    return min(rotate(number, i) for i in range(12))
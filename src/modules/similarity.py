@@ -0,0 +1,80 @@
+from typing import NamedTuple
+import numpy as np
+from modules import tables
+
+class Match(NamedTuple):
+    shape: int
+    root: int
+    # Notes that differ, at the best transposition
+    hamming: int
+    # L1 distance between interval vectors
+    interval_distance: int
+
+class SimilarityIndex:
+    """
+    Nearest scales to a pitch-class set, compared under transposition.
+
+    Both distances only depend on the necklace class of each scale, so they
+    are tabulated once for every pair of the 352 classes: the popcount of the
+    XOR minimized over the 12 transpositions, and the L1 distance between
+    interval vectors. A query is then a single row gather plus a partial sort.
+    """
+    SCOPES = ("catalog", "all")
+    METRICS = ("hamming", "interval")
+
+    def __init__(self, catalog=None):
+        necklaces = tables.necklaces()
+        self.classes, self.class_of = np.unique(necklaces, return_inverse=True)
+        self._popcount = tables.cardinalities()
+
+        rotations = tables.rotations(self.classes)
+        self.hamming = np.empty((len(self.classes), len(self.classes)), dtype=np.int8)
+        for i, c in enumerate(self.classes):
+            self.hamming[i] = self._popcount[rotations ^ c].min(axis=1)
+
+        ivecs = tables.interval_counts(self.classes).astype(np.int16)
+        self.interval = np.abs(ivecs[:, None, :] - ivecs[None, :, :]).sum(axis=2, dtype=np.int16)
+
+        shapes = np.array(list(dict.fromkeys(shape for _, _, shape in (catalog or []))), dtype=np.int64)
+        self._candidates = {
+            "catalog": (shapes, self.class_of[shapes]),
+            # One representative (the smallest mode) per class
+            "all": (self.classes, np.arange(len(self.classes))),
+        }
+
+    def distances(self, number, scope="catalog"):
+        """(shapes, hamming, interval_distance) arrays for every candidate in scope."""
+        shapes, classes = self._candidates[scope]
+        q = self.class_of[number & 0xFFF]
+        return shapes, self.hamming[q, classes], self.interval[q, classes]
+
+    def nearest(self, number, k=10, metric="hamming", scope="catalog", root=0, exclude_same=True):
+        """
+        The k candidates closest to number (an absolute mask), ordered by the
+        chosen metric with the other one breaking ties. Each match carries the
+        root at which its shape best overlaps number, preferring roots nearest
+        to the given one. Scales with the same notes are left out unless
+        exclude_same is False.
+        """
+        shapes, hamming, interval = self.distances(number, scope)
+        primary, secondary = (hamming, interval) if metric == "hamming" else (interval, hamming)
+        key = primary.astype(np.int32) * 1024 + secondary
+        if exclude_same:
+            same = self.class_of[shapes] == self.class_of[number & 0xFFF]
+            key = np.where(same, np.iinfo(np.int32).max, key)
+
+        k = min(k, len(shapes) - (int(same.sum()) if exclude_same else 0))
+        if k <= 0:
+            return []
+        top = np.argpartition(key, k - 1)[:k] if k < len(key) else np.arange(len(key))
+        # Stable on candidate order within equal keys
+        top = top[np.lexsort((top, key[top]))]
+
+        roots = self._best_roots(shapes[top], number & 0xFFF, root)
+        return [Match(int(shapes[i]), int(r), int(hamming[i]), int(interval[i])) for i, r in zip(top, roots)]
+
+    def _best_roots(self, shapes, number, root):
+        # Column i of rotations() is rotate(shape, i), i.e. shape placed at root -i
+        order = (root + np.arange(12)) % 12
+        placed = tables.rotations(shapes)[:, (-order) % 12]
+        return order[self._popcount[placed ^ number].argmin(axis=1)]
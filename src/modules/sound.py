@@ -5,12 +5,23 @@ from PySide6.QtCore import QObject, Signal
 from typing import List, Optional
 from .math import pitch_set
 
-try:
-    import sounddevice as sd
-    HAS_AUDIO = True
-except ImportError:
-    HAS_AUDIO = False
-    print("Warning: sounddevice not found. Audio features disabled.")
+_sounddevice = None
+_audio_checked = False
+
+def get_sounddevice():
+    """
+    Import sounddevice on first use rather than at startup.
+    Returns None (and warns once) if it or the PortAudio library is missing.
+    """
+    global _sounddevice, _audio_checked
+    if not _audio_checked:
+        _audio_checked = True
+        try:
+            import sounddevice
+            _sounddevice = sounddevice
+        except (ImportError, OSError):
+            print("Warning: sounddevice not found. Audio features disabled.")
+    return _sounddevice
 
 class SoundEngine(QObject):
     playback_stopped = Signal()
@@ -62,6 +73,14 @@ class SoundEngine(QObject):
         self._thread = threading.Thread(target=self._run_playback)
         self._thread.start()
 
+    def play_chord(self, root_note: int, intervals):
+        """Strum one chord: intervals are semitones above root_note (0-11) in the playback octave."""
+        self.stop()
+        self._stop_event.clear()
+        notes = [60 + root_note + i for i in intervals]
+        self._thread = threading.Thread(target=self._run_chord, args=(notes,))
+        self._thread.start()
+
     def stop(self):
         self._stop_event.set()
         if self._thread and self._thread.is_alive():
@@ -159,6 +178,7 @@ class SoundEngine(QObject):
         return audio
 
     def _run_playback(self):
+        sd = get_sounddevice()
         while not self._stop_event.is_set():
             # Construct sequence dynamically based on current state
             base_note = 60 + self._root_note
@@ -177,7 +197,7 @@ class SoundEngine(QObject):
                 duration = 60.0 / self._bpm
                 self.note_played.emit(note % 12, duration)
                 
-                if HAS_AUDIO:
+                if sd is not None:
                     try:
                         freq = 440.0 * (2 ** ((note + (self._octave_shift * 12) - 69) / 12.0))
                         audio_data = self._karplus_strong(freq, duration)
@@ -191,4 +211,29 @@ class SoundEngine(QObject):
                 break
         
         if not self._stop_event.is_set():
-            self.playback_stopped.emit()
\ No newline at end of file
+            self.playback_stopped.emit()
+
+    def _run_chord(self, notes):
+        sd = get_sounddevice()
+        # Held for two beats
+        duration = 2 * 60.0 / self._bpm
+        for note in notes:
+            self.note_played.emit(note % 12, duration)
+
+        if sd is not None:
+            try:
+                strum = int(0.03 * self._sample_rate)
+                mix = np.zeros(int(self._sample_rate * duration) + strum * len(notes), dtype=np.float32)
+                for i, note in enumerate(notes):
+                    freq = 440.0 * (2 ** ((note + (self._octave_shift * 12) - 69) / 12.0))
+                    audio = self._karplus_strong(freq, duration)
+                    mix[i * strum:i * strum + len(audio)] += audio
+                mix /= max(1.0, float(np.abs(mix).max()))
+                sd.play(mix, self._sample_rate, blocking=True)
+            except Exception as e:
+                print(f"Playback error: {e}")
+        else:
+            self._stop_event.wait(duration)
+
+        if not self._stop_event.is_set():
+            self.playback_stopped.emit()
@@ -1,26 +1,154 @@
+from functools import lru_cache
 from PySide6.QtCore import QObject, Signal
 from .math import rotate, pitch_set
 
+SHARP_NAMES = ("C", "C♯", "D", "D♯", "E", "F", "F♯", "G", "G♯", "A", "A♯", "B")
+FLAT_NAMES = ("C", "D♭", "D", "E♭", "E", "F", "G♭", "G", "A♭", "A", "B♭", "B")
+
+_NATURALS = [
+    (0, "C"), (2, "D"), (4, "E"), (5, "F"), (7, "G"), (9, "A"), (11, "B")
+]
+_SHARP_ACCIDENTALS = [
+    (1, "C♯"), (3, "D♯"), (5, "E♯"), (6, "F♯"), (8, "G♯"), (10, "A♯"), (0, "B♯")
+]
+_FLAT_ACCIDENTALS = [
+    (11, "C♭"), (1, "D♭"), (3, "E♭"), (4, "F♭"), (6, "G♭"), (8, "A♭"), (10, "B♭")
+]
+
+def _solve_spelling(active_set, use_sharps):
+    naturals = _NATURALS
+    accidentals = _SHARP_ACCIDENTALS if use_sharps else _FLAT_ACCIDENTALS
+
+    def solve(col_idx, notes_to_cover):
+        if col_idx == 7:
+            return [] if not notes_to_cover else None
+
+        col_opts = []
+
+        val_n, name_n = naturals[col_idx]
+        if val_n in notes_to_cover:
+            col_opts.append((val_n, name_n, False))
+
+        val_a, name_a = accidentals[col_idx]
+        if val_a in notes_to_cover:
+            col_opts.append((val_a, name_a, True))
+
+        for val, name, is_acc in col_opts:
+            res = solve(col_idx + 1, notes_to_cover - {val})
+            if res is not None:
+                return [(val, name, is_acc)] + res
+
+        return None
+
+    return solve(0, active_set)
+
+def _harmonic_offset(shape):
+    """Rotation of the harmonic minor mask matching shape, or None."""
+    mask = 2477
+    for i in range(12):
+        if shape == rotate(mask, i):
+            return i
+    return None
+
+def _compute_spelling(shape, root, use_sharps):
+    active_set = set(pitch_set(rotate(shape, -root)))
+
+    offset = _harmonic_offset(shape)
+    if offset is not None:
+        rel_target = (11 - offset) % 12
+        abs_target = (rel_target + root) % 12
+        abs_proxy = (abs_target - 1) % 12
+
+        if abs_target in active_set:
+            proxy_set = active_set.copy()
+            proxy_set.remove(abs_target)
+            proxy_set.add(abs_proxy)
+
+            sol = _solve_spelling(proxy_set, use_sharps)
+            if sol:
+                names = list(SHARP_NAMES if use_sharps else FLAT_NAMES)
+                for val, name, _ in sol:
+                    names[val] = name
+
+                base_name = names[abs_proxy]
+                if base_name.endswith('♭'):
+                    new_name = base_name[:-1] + "♮"
+                elif base_name.endswith('♯'):
+                    new_name = base_name[:-1] + "𝄪"
+                else:
+                    new_name = base_name + "♯"
+                names[abs_target] = new_name
+                return tuple(names)
+
+    sol = _solve_spelling(active_set, use_sharps)
+    if sol:
+        names = list(SHARP_NAMES if use_sharps else FLAT_NAMES)
+        for val, name, _ in sol:
+            names[val] = name
+        return tuple(names)
+
+    return None
+
+def _count_accidentals(names):
+    c = 0
+    for n in names:
+        if '♯' in n: c += 1
+        if '♭' in n: c += 1
+        if '𝄪' in n: c += 2
+    return c
+
+@lru_cache(maxsize=None)
+def spell_scale(shape, root_note):
+    """
+    Solve a scale's spellings without any model attached.
+    Returns (sharp_names, flat_names, mode): a spelling is None when the scale
+    cannot be written with one note per letter, and mode ('sharp', 'flat', or
+    None if neither spelling exists) is the one with fewer accidentals.
+    """
+    shape &= 0xFFF
+    root_note %= 12
+    sharp = _compute_spelling(shape, root_note, True)
+    flat = _compute_spelling(shape, root_note, False)
+
+    if sharp and flat:
+        s_count = _count_accidentals(sharp)
+        f_count = _count_accidentals(flat)
+
+        if f_count < s_count:
+            mode = 'flat'
+        elif s_count < f_count:
+            mode = 'sharp'
+        else:
+            mode = 'flat' if root_note in [1, 3, 5, 8, 10] else 'sharp'
+    elif sharp:
+        mode = 'sharp'
+    elif flat:
+        mode = 'flat'
+    else:
+        mode = None
+
+    return sharp, flat, mode
+
+def note_names(shape, root_note, enharmonic_mode=None):
+    """Names of all 12 pitch classes, in the given mode or else the preferred one."""
+    sharp, flat, mode = spell_scale(shape, root_note)
+    mode = enharmonic_mode or mode or 'sharp'
+    if mode == 'sharp':
+        return list(sharp or SHARP_NAMES)
+    return list(flat or FLAT_NAMES)
+
 class Spelling(QObject):
     updated = Signal()
 
-    SHARP_NAMES = ["C", "C♯", "D", "D♯", "E", "F", "F♯", "G", "G♯", "A", "A♯", "B"]
-    FLAT_NAMES = ["C", "D♭", "D", "E♭", "E", "F", "G♭", "G", "A♭", "A", "B♭", "B"]
-
-    _NATURALS = [
-        (0, "C"), (2, "D"), (4, "E"), (5, "F"), (7, "G"), (9, "A"), (11, "B")
-    ]
-    _SHARP_ACCIDENTALS = [
-        (1, "C♯"), (3, "D♯"), (5, "E♯"), (6, "F♯"), (8, "G♯"), (10, "A♯"), (0, "B♯")
-    ]
-    _FLAT_ACCIDENTALS = [
-        (11, "C♭"), (1, "D♭"), (3, "E♭"), (4, "F♭"), (6, "G♭"), (8, "A♭"), (10, "B♭")
-    ]
+    SHARP_NAMES = list(SHARP_NAMES)
+    FLAT_NAMES = list(FLAT_NAMES)
 
     def __init__(self, scale_model):
         super().__init__()
         self._scale_model = scale_model
-        self._scale_model.updated.connect(self._update_spellings)
+        # Solved on 'changed' without emitting, so one model change yields one
+        # 'updated' from the model rather than a second one from here.
+        self._scale_model.changed.connect(self._update_spellings)
         
         self._enharmonic_mode = 'sharp'
         self._sharp_spelling = None
@@ -62,116 +190,16 @@ class Spelling(QObject):
     def _get_flat_names(self):
         return list(self.FLAT_NAMES)
 
-    def _solve_spelling(self, active_set, use_sharps):
-        naturals = self._NATURALS
-        accidentals = self._SHARP_ACCIDENTALS if use_sharps else self._FLAT_ACCIDENTALS
-            
-        def solve(col_idx, notes_to_cover):
-            if col_idx == 7:
-                return [] if not notes_to_cover else None
-            
-            col_opts = []
-            
-            val_n, name_n = naturals[col_idx]
-            if val_n in notes_to_cover:
-                col_opts.append((val_n, name_n, False))
-                
-            val_a, name_a = accidentals[col_idx]
-            if val_a in notes_to_cover:
-                col_opts.append((val_a, name_a, True))
-                
-            for val, name, is_acc in col_opts:
-                res = solve(col_idx + 1, notes_to_cover - {val})
-                if res is not None:
-                    return [(val, name, is_acc)] + res
-            
-            return None
-
-        return solve(0, active_set)
-
-    def _is_harmonic(self):
-        mask = 2477
-        shape = self._scale_model.shape
-        for i in range(12):
-            rotated = rotate(mask, i)
-            if shape == rotated:
-                return True, i
-        return False, 0
-
-    def _compute_spelling(self, use_sharps):
-        active_set = set(pitch_set(self._scale_model.number))
-        root = self._scale_model.root_note
-
-        is_harm, offset = self._is_harmonic()
-        if is_harm:
-            rel_target = (11 - offset) % 12
-            abs_target = (rel_target + root) % 12
-            abs_proxy = (abs_target - 1) % 12
-            
-            if abs_target in active_set:
-                proxy_set = active_set.copy()
-                proxy_set.remove(abs_target)
-                proxy_set.add(abs_proxy)
-                
-                sol = self._solve_spelling(proxy_set, use_sharps)
-                if sol:
-                    names = self._get_sharp_names() if use_sharps else self._get_flat_names()
-                    for val, name, _ in sol:
-                        names[val] = name
-                    
-                    base_name = names[abs_proxy]
-                    if base_name.endswith('♭'):
-                        new_name = base_name[:-1] + "♮"
-                    elif base_name.endswith('♯'):
-                        new_name = base_name[:-1] + "𝄪"
-                    else:
-                        new_name = base_name + "♯"
-                    names[abs_target] = new_name
-                    return names
-
-        sol = self._solve_spelling(active_set, use_sharps)
-        if sol:
-            names = self._get_sharp_names() if use_sharps else self._get_flat_names()
-            for val, name, _ in sol:
-                names[val] = name
-            return names
-            
-        return None
-
     def _update_spellings(self):
-        self._sharp_spelling = self._compute_spelling(True)
-        self._flat_spelling = self._compute_spelling(False)
-        
-        # Determine mode
-        if self._sharp_spelling and self._flat_spelling:
-            def count_acc(names):
-                c = 0
-                for n in names:
-                    if '♯' in n: c += 1
-                    if '♭' in n: c += 1
-                    if '𝄪' in n: c += 2
-                return c
-
-            s_count = count_acc(self._sharp_spelling)
-            f_count = count_acc(self._flat_spelling)
-            
-            if f_count < s_count:
-                self._enharmonic_mode = 'flat'
-            elif s_count < f_count:
-                self._enharmonic_mode = 'sharp'
-            else:
-                if self._scale_model.root_note in [1, 3, 5, 8, 10]:
-                    self._enharmonic_mode = 'flat'
-                else:
-                    self._enharmonic_mode = 'sharp'
-                    
-        elif self._sharp_spelling:
-            self._enharmonic_mode = 'sharp'
-        elif self._flat_spelling:
-            self._enharmonic_mode = 'flat'
+        sharp, flat, mode = spell_scale(self._scale_model.shape, self._scale_model.root_note)
+        self._sharp_spelling = list(sharp) if sharp else None
+        self._flat_spelling = list(flat) if flat else None
+
+        # With no valid spelling, keep whichever mode was chosen last
+        if mode is not None:
+            self._enharmonic_mode = mode
         
         self._update_final_names()
-        self.updated.emit()
 
     def _update_final_names(self):
         if self._enharmonic_mode == 'sharp':
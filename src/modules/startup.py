@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import subprocess
+
+class StartupTimer:
+    """Records named milestones since process start for the startup report."""
+
+    def __init__(self, start=None):
+        self._start = start if start is not None else time.perf_counter()
+        self._last = self._start
+        self.marks = []
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.marks.append((label, now - self._last, now - self._start))
+        self._last = now
+
+    def report(self):
+        lines = [f"{'phase':<28} {'self [ms]':>10} {'total [ms]':>11}"]
+        for label, delta, total in self.marks:
+            lines.append(f"{label:<28} {delta * 1000:10.1f} {total * 1000:11.1f}")
+        return "\n".join(lines)
+
+def import_time_report(module, limit=15):
+    """
+    Run 'python -X importtime -c "import <module>"' in a fresh interpreter and
+    return the slowest imports by cumulative time, in the same column format.
+    """
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=src_dir, capture_output=True, text=True)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    rows.sort(reverse=True)
+    lines = [f"{'self [us]':>10} | {'cumulative':>10} | imported package"]
+    for cumulative_us, self_us, name in rows[:limit]:
+        lines.append(f"{self_us:10d} | {cumulative_us:10d} | {name}")
+    return "\n".join(lines)
@@ -0,0 +1,77 @@
+from typing import NamedTuple
+import numpy as np
+from modules import tables
+
+class Placement(NamedTuple):
+    shape: int
+    root: int
+
+class SubsetIndex:
+    """
+    Scales containing, or contained in, a set of notes at any root.
+
+    Candidates are the catalog scales and one representative per necklace
+    class. For every 12-bit mask, sum-over-subsets tables hold a packed bitset
+    of the candidates whose shape is a superset (or subset) of it. A scale at
+    root r contains the notes N exactly when its shape contains N rotated by r,
+    so a query is 12 row lookups, one per root.
+    """
+    SCOPES = ("catalog", "all")
+
+    def __init__(self, catalog=None):
+        catalog_shapes = list(dict.fromkeys(shape for _, _, shape in (catalog or [])))
+        # The empty scale would match every query
+        classes = [int(c) for c in np.unique(tables.necklaces()) if c]
+
+        self.shapes = np.array(catalog_shapes + classes, dtype=np.int64)
+        self._scopes = {
+            "catalog": slice(0, len(catalog_shapes)),
+            "all": slice(len(catalog_shapes), len(self.shapes)),
+        }
+        self._cardinality = tables.cardinalities(self.shapes)
+
+        exact = np.zeros((tables.NUM_SCALES, len(self.shapes)), dtype=bool)
+        exact[self.shapes, np.arange(len(self.shapes))] = True
+        exact = np.packbits(exact, axis=1)
+        self._supersets = self._sum_over_subsets(exact.copy(), supersets=True)
+        self._subsets = self._sum_over_subsets(exact, supersets=False)
+
+    @staticmethod
+    def _sum_over_subsets(table, supersets):
+        masks = np.arange(tables.NUM_SCALES)
+        for b in range(12):
+            bit = 1 << b
+            lower = masks[(masks & bit) == 0]
+            if supersets:
+                table[lower] |= table[lower | bit]
+            else:
+                table[lower | bit] |= table[lower]
+        return table
+
+    def _query(self, table, number, scope):
+        # Row r: candidates matching the notes as seen from root r
+        rows = table[tables.rotations([number])[0]]
+        hits = np.unpackbits(rows, axis=1, count=len(self.shapes))[:, self._scopes[scope]]
+        roots, columns = np.nonzero(hits)
+        columns += self._scopes[scope].start
+        return roots, columns
+
+    def _placements(self, roots, columns, order, limit):
+        shapes = self.shapes[columns]
+        # Symmetric scales repeat the same notes at several roots; keep the first
+        placed = tables.rotations(shapes)[np.arange(len(shapes)), (-roots) % 12]
+        keys = columns * tables.NUM_SCALES + placed
+        _, first = np.unique(keys, return_index=True)
+
+        ranked = first[np.lexsort((roots[first], columns[first], order[first]))][:limit]
+        return [Placement(int(shapes[i]), int(roots[i])) for i in ranked]
+
+    def supersets(self, number, scope="catalog", limit=None):
+        """Candidates (shape, root) containing the absolute note mask, smallest scales first."""
+        roots, columns = self._query(self._supersets, number & 0xFFF, scope)
+        return self._placements(roots, columns, self._cardinality[columns], limit)
+
+    def subsets(self, number, scope="catalog", limit=None):
+        """Candidates (shape, root) whose notes all lie in the mask, largest scales first."""
+        roots, columns = self._query(self._subsets, number & 0xFFF, scope)
+        return self._placements(roots, columns, -self._cardinality[columns].astype(np.int16), limit)
@@ -0,0 +1,59 @@
+"""
+Vectorized versions of the functions in modules.math, computed for whole
+arrays of scale numbers at once. Every function accepts any iterable of
+numbers, or None for all 4096.
+"""
+import numpy as np
+
+NUM_SCALES = 4096
+
+_OFFSETS = np.arange(12)
+
+def as_numbers(numbers=None):
+    if numbers is None:
+        return np.arange(NUM_SCALES, dtype=np.int64)
+    return np.asarray(numbers, dtype=np.int64).reshape(-1) & 0xFFF
+
+def rotations(numbers=None):
+    """(N, 12) array whose column i is rotate(number, i)."""
+    n = as_numbers(numbers)[:, None]
+    return ((n >> _OFFSETS) | (n << (12 - _OFFSETS))) & 0xFFF
+
+def bits(numbers=None):
+    """(N, 12) array of 0/1, column i set when pitch i is active."""
+    return ((as_numbers(numbers)[:, None] >> _OFFSETS) & 1).astype(np.int8)
+
+def cardinalities(numbers=None):
+    return bits(numbers).sum(axis=1, dtype=np.int8)
+
+def necklaces(numbers=None):
+    """Smallest rotation of each number: all modes of a scale share it."""
+    return rotations(numbers).min(axis=1)
+
+def reflections(numbers=None):
+    """reflect() for each number: bit i moves to bit 12 - i, bit 0 stays."""
+    return bits(numbers)[:, (-_OFFSETS) % 12].astype(np.int64) @ (1 << _OFFSETS)
+
+def interval_counts(numbers=None):
+    """
+    (N, 6) array whose column i - 1 counts the active pitches that are also
+    active i semitones higher: the digits of interval_count().
+    """
+    n = as_numbers(numbers)
+    rot = rotations(n)[:, 1:7]
+    return bits(rot & n[:, None]).reshape(len(n), 6, 12).sum(axis=2, dtype=np.int8)
+
+def interval_codes(counts):
+    """Pack interval_counts() rows into the base-12 numbers interval_count() returns."""
+    return np.asarray(counts, dtype=np.int64) @ (12 ** np.arange(5, -1, -1))
+
+def periods(numbers=None):
+    """Smallest rotation (1-12) mapping each number onto itself; 12 / period transpositions are equal."""
+    n = as_numbers(numbers)
+    same = rotations(n)[:, 1:] == n[:, None]
+    return np.where(same.any(axis=1), same.argmax(axis=1) + 1, 12).astype(np.int8)
+
+def inversion_axes(numbers=None):
+    """Number of rotations of the reflected scale that equal the scale; 0 for chiral scales."""
+    n = as_numbers(numbers)
+    return (rotations(reflections(n)) == n[:, None]).sum(axis=1, dtype=np.int8)
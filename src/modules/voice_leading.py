@@ -0,0 +1,121 @@
+"""
+Minimal voice leading between pitch-class sets (absolute 12-bit masks).
+
+A voice leading relates every note of one set to at least one note of the
+other. Its size is the total distance the voices move round the pitch-class
+circle, and voices are kept from crossing: the relation follows both sets in
+circular order.
+
+Sets of equal size are matched one to one, so the voice leading is the best
+of the n rotations of the note-to-note assignment. Sets of different sizes
+are joined by letting voices split or merge, which makes the search a
+circular dynamic time warp of one set against each rotation of the other.
+The trailing column of each warp also covers the case where both ends share
+a note across the wrap, so m notes against n take n warps of m * (n + 1)
+cells. Results only depend on the pair up to transposition, and are
+memoized on demand per class of the source set, which folds the 4096 x 4096
+pairs into 352 x 4096.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+from .math import pitch_set, rotate
+
+class Motion(NamedTuple):
+    source: int
+    target: int
+    # Signed semitones, in -5..6: source + delta is target (mod 12)
+    delta: int
+
+# Between sets of different sizes, each voice costs its distance scaled by
+# this, plus one, so among equally small voice leadings the one with fewest
+# voices (splits and merges) wins
+VOICE_WEIGHT = 32
+
+def displacement(source, target):
+    """Shortest signed step from one pitch class to another, in -5..6."""
+    d = (target - source) % 12
+    return d - 12 if d > 6 else d
+
+def voice_leading(source, target):
+    """
+    Minimal voice leading from source to target (absolute masks), as Motions
+    in circular order starting from the lowest source note. Empty when
+    either set is.
+    """
+    source &= 0xFFF
+    target &= 0xFFF
+    if not source or not target:
+        return ()
+    # Solve transposed so the source is its smallest rotation
+    t = min(range(12), key=lambda i: rotate(source, i))
+    motions = _solve(rotate(source, t), rotate(target, t))
+    motions = [Motion((s + t) % 12, (d + t) % 12, delta) for s, d, delta in motions]
+    start = min(range(len(motions)), key=lambda i: (motions[i].source, motions[i].delta))
+    return tuple(motions[start:] + motions[:start])
+
+def distance(source, target):
+    """Total semitones moved by the minimal voice leading from source to target."""
+    return sum(abs(m.delta) for m in voice_leading(source, target))
+
+@lru_cache(maxsize=1 << 16)
+def _solve(source, target):
+    a = pitch_set(source)
+    b = pitch_set(target)
+    m, n = len(a), len(b)
+    if m == n:
+        return _best_rotation(a, b)
+    best_cost, best = None, None
+
+    for k in range(n):
+        # b rotated to start at b[k], then b[k] again to close the circle on it
+        c = b[k:] + b[:k] + [b[k]]
+        cell = [[VOICE_WEIGHT * abs(displacement(x, y)) + 1 for y in c] for x in a]
+
+        cost = [[0] * (n + 1) for _ in range(m)]
+        for i in range(m):
+            row, above, weights = cost[i], cost[i - 1], cell[i]
+            for j in range(n + 1):
+                if i == 0 and j == 0:
+                    prev = 0
+                elif i == 0:
+                    prev = row[j - 1]
+                elif j == 0:
+                    prev = above[0]
+                else:
+                    prev = min(above[j - 1], above[j], row[j - 1])
+                row[j] = prev + weights[j]
+
+        # Ending on b[k - 1] closes on a step to (a[0], b[k]); ending on
+        # b[k] itself shares that note between a[-1] and a[0]
+        for end in (n - 1, n):
+            total = cost[m - 1][end]
+            if m == 1 and end == n:
+                total -= cell[0][0]
+            if best_cost is None or total < best_cost:
+                best_cost, best = total, (c, cost, end)
+
+    c, cost, end = best
+    path = _trace(cost, m - 1, end)
+    if len(path) > 1 and c[path[0][1]] == c[path[-1][1]] and path[0][0] == path[-1][0]:
+        path.pop()
+    return tuple((a[i], c[j], displacement(a[i], c[j])) for i, j in path)
+
+def _best_rotation(a, b):
+    """One-to-one voice leading between equal-size sets: the best rotation of the assignment."""
+    n = len(a)
+    k = min(range(n), key=lambda k: sum(abs(displacement(a[i], b[(i + k) % n])) for i in range(n)))
+    return tuple((a[i], b[(i + k) % n], displacement(a[i], b[(i + k) % n])) for i in range(n))
+
+def _trace(cost, i, j):
+    """Cells of the cheapest warp path ending at (i, j), in order."""
+    path = [(i, j)]
+    while i or j:
+        if i == 0:
+            j -= 1
+        elif j == 0:
+            i -= 1
+        else:
+            i, j = min(((i - 1, j - 1), (i - 1, j), (i, j - 1)), key=lambda p: cost[p[0]][p[1]])
+        path.append((i, j))
+    path.reverse()
+    return path
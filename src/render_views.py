@@ -1,69 +1,403 @@
 #!/usr/bin/env python3
+"""
+Render SIREN views to PNG, SVG or PDF without a display.
+
+Single screenshot (as before):
+    python render_views.py [shape]
+
+Batch mode renders every combination of shapes, roots, views and sizes:
+    python render_views.py --shapes all --roots 0 --views fretboard,piano
+    python render_views.py --shapes "category:Diatonic Modes" --roots all --sizes 800x240
+
+Large batches can be sharded across processes, each with its own offscreen
+QApplication. Outputs that already exist are skipped, so runs can be resumed:
+    python render_views.py --shapes all --roots all --views piano --workers 8
+    python render_views.py --shapes all --views fretboard --workers 8 --raw
+
+Vector output replays each view's painting onto SVG/PDF devices instead of a
+pixmap. PDF batches write one multi-page document per view/size:
+    python render_views.py --shapes catalog --views piano --format pdf
+"""
 import sys
 import os
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+
+# Render headlessly unless a platform was chosen explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
 
-from models import ScaleModel, InstrumentModel
+from models import ScaleModel, InstrumentModel, ScaleCatalog
+from models.catalog import parse_int_set
 from modules.spelling import Spelling
-from views.fretboard import FretboardView
+from views.fretboard import FretboardView, FretlessView
 from views.piano import PianoView
 from views.tonnetz import TonnetzView
 from views.polygon import PolygonView
 from views.scale_selector import ScaleSelectorView
+from views.key_signature import KeySignatureView
 from views.main_window import MainWindow
+from views.export import export_svg, PdfExporter
+from views.renderers import RenderState, create_renderer, render_image
+
+FORMATS = ("png", "svg", "pdf")
+
+# name -> default size
+VIEW_SIZES = {
+    "main_window": QSize(1800, 400),
+    "fretboard": QSize(1000, 300),
+    "fretless": QSize(1000, 300),
+    "piano": QSize(1000, 300),
+    "tonnetz": QSize(800, 600),
+    "polygon": QSize(500, 500),
+    "scale_selector": QSize(800, 60),
+    "key_signature": QSize(160, 90),
+}
+
+class RenderSession:
+    """
+    One set of models and widget instances reused for every frame.
+    Only the model state changes between frames. Raster frames of the
+    standalone views are painted by their renderers, without a widget.
+    """
+
+    def __init__(self):
+        # MainWindow owns its models; the standalone views share them
+        self._main_window = None
+        self.scale_model = ScaleModel()
+        self.instrument_model = InstrumentModel()
+        self.spelling = Spelling(self.scale_model)
+        self._widgets = {}
+        self._renderers = {}
+
+    def widget(self, name):
+        if name not in self._widgets:
+            self._widgets[name] = self._create(name)
+        return self._widgets[name]
+
+    def _create(self, name):
+        if name == "main_window":
+            if self._main_window is None:
+                self._main_window = MainWindow()
+                # Offscreen, the deferred startup work that loads these never runs
+                self._main_window.colormap_selector.ensure_icons()
+            return self._main_window
+        if name == "fretboard":
+            return FretboardView(self.instrument_model, self.scale_model, self.spelling)
+        if name == "fretless":
+            return FretlessView(self.instrument_model, self.scale_model, self.spelling)
+        if name == "piano":
+            return PianoView(self.scale_model, self.spelling)
+        if name == "tonnetz":
+            return TonnetzView(self.scale_model, self.spelling)
+        if name == "polygon":
+            return PolygonView(self.scale_model, self.spelling)
+        if name == "scale_selector":
+            return ScaleSelectorView(self.scale_model, self.spelling)
+        if name == "key_signature":
+            return KeySignatureView(self.scale_model, self.spelling)
+        raise ValueError(f"Unknown view: {name}")
+
+    def set_state(self, shape, root):
+        self.scale_model.set_state(shape, root)
+        if self._main_window is not None:
+            self._main_window.scale_model.set_state(shape, root)
+            # Scale labels are normally refreshed on the next frame
+            self._main_window.repaint_scheduler.flush()
+
+        # Frames should show the final state, not the start of a transition
+        for widget in self._widgets.values():
+            for child in [widget] + widget.findChildren(ScaleSelectorView):
+                if hasattr(child, 'finish_animation'):
+                    child.finish_animation()
+
+    def sized_widget(self, name, size):
+        widget = self.widget(name)
+        if widget.size() != size:
+            widget.resize(size)
+        return widget
+
+    def grab(self, name, size):
+        return self.sized_widget(name, size).grab()
+
+    def image(self, name, size):
+        if name == "main_window":
+            return self.grab(name, size).toImage()
+
+        renderer = self._renderers.get(name)
+        if renderer is None:
+            if name in ("fretboard", "fretless"):
+                renderer = create_renderer(name, tuning=self.instrument_model.tuning,
+                                           num_frets=self.instrument_model.num_frets)
+            else:
+                renderer = create_renderer(name)
+            self._renderers[name] = renderer
+        state = RenderState.from_models(self.scale_model, self.spelling)
+        return render_image(renderer, state, size.width(), size.height())
+
+def parse_sizes(spec):
+    sizes = []
+    for part in spec.split(","):
+        w, h = part.lower().split("x")
+        sizes.append(QSize(int(w), int(h)))
+    return sizes
+
+def frame_filename(name, size, shape, root, fmt="png"):
+    w, h = size
+    return f"{name}_{w}x{h}_{shape:04d}_r{root:02d}.{fmt}"
+
+def raw_basename(name, size):
+    w, h = size
+    return f"{name}_{w}x{h}"
+
+def build_jobs(views, sizes, shapes, roots):
+    """
+    Ordered (view, (w, h), shape, root, frame) tuples, where frame is the index
+    of (shape, root) within its view/size group. Each view/size is resized only once.
+    """
+    jobs = []
+    for name in views:
+        for size in (sizes or [VIEW_SIZES[name]]):
+            wh = (size.width(), size.height())
+            frame = 0
+            for shape in shapes:
+                for root in roots:
+                    jobs.append((name, wh, shape, root, frame))
+                    frame += 1
+    return jobs
+
+def open_raw_outputs(output_dir, views, sizes, shapes, roots):
+    """
+    Create (or reopen, when resuming) one memory-mapped .npy of RGBA frames per
+    view/size, with a matching .done.npy flag per frame and an index of the
+    frame order. Returns the set of (view, (w, h), frame) already rendered.
+    """
+    num_frames = len(shapes) * len(roots)
+    done = set()
+    for name in views:
+        for size in (sizes or [VIEW_SIZES[name]]):
+            wh = (size.width(), size.height())
+            base = os.path.join(output_dir, raw_basename(name, wh))
+            frames_shape = (num_frames, wh[1], wh[0], 4)
+
+            frames = None
+            if all(os.path.exists(f"{base}{ext}") for ext in (".npy", ".done.npy", ".json")):
+                with open(f"{base}.json") as f:
+                    index = json.load(f)
+                frames = np.load(f"{base}.npy", mmap_mode="r")
+                flags = np.load(f"{base}.done.npy")
+                # Only resume into outputs laid out for exactly the same frames
+                if (frames.shape != frames_shape or flags.shape != (num_frames,)
+                        or index.get("shapes") != shapes or index.get("roots") != roots):
+                    frames = None
+                else:
+                    done.update((name, wh, int(i)) for i in np.flatnonzero(flags))
+
+            if frames is None:
+                np.lib.format.open_memmap(f"{base}.npy", mode="w+", dtype=np.uint8, shape=frames_shape).flush()
+                np.lib.format.open_memmap(f"{base}.done.npy", mode="w+", dtype=np.uint8, shape=(num_frames,)).flush()
+                with open(f"{base}.json", "w") as f:
+                    json.dump({"shapes": shapes, "roots": roots, "frame_shape": frames_shape[1:]}, f)
+    return done
+
+def pdf_filename(name, size):
+    return raw_basename(name, size) + ".pdf"
+
+def pending_jobs(jobs, output_dir, fmt="png"):
+    """Drop jobs whose output already exists, so interrupted runs can be resumed."""
+    if fmt == "pdf":
+        # Documents are only renamed into place once complete
+        return [job for job in jobs
+                if not os.path.exists(os.path.join(output_dir, pdf_filename(job[0], job[1])))]
+    return [job for job in jobs
+            if not os.path.exists(os.path.join(output_dir, frame_filename(*job[:4], fmt)))]
+
+def image_to_rgba(image):
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    w, h = image.width(), image.height()
+    buf = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.bytesPerLine() * h)
+    # Copy out before the QImage (which owns the buffer) goes away
+    return buf.reshape(h, image.bytesPerLine())[:, :w * 4].reshape(h, w, 4).copy()
+
+class PdfOutputs:
+    """Writes each view/size's pages to a .part file, renamed to .pdf once complete."""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self._key = None
+        self._pdf = None
+
+    def exporter(self, name, wh):
+        if (name, wh) != self._key:
+            self.close()
+            path = os.path.join(self.output_dir, pdf_filename(name, wh))
+            self._key = (name, wh)
+            self._pdf = PdfExporter(path + ".part", title=f"SIREN {name}")
+        return self._pdf
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            os.replace(self._pdf.path, self._pdf.path[:-len(".part")])
+        self._key = None
+        self._pdf = None
+
+def run_shard(jobs, output_dir, fmt="png", raw=False, worker_id=0):
+    """Render a list of jobs with this process's own QApplication and widget set."""
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    session = RenderSession()
+    raw_outputs = {}
+    pdf_outputs = PdfOutputs(output_dir)
+
+    start = time.perf_counter()
+    for i, (name, wh, shape, root, frame) in enumerate(jobs):
+        session.set_state(shape, root)
+        size = QSize(*wh)
+
+        if fmt == "svg":
+            path = os.path.join(output_dir, frame_filename(name, wh, shape, root, fmt))
+            # Written under .part and renamed, so --resume never skips a truncated frame
+            export_svg(session.sized_widget(name, size), path + ".part")
+            os.replace(path + ".part", path)
+        elif fmt == "pdf":
+            pdf_outputs.exporter(name, wh).add_page(session.sized_widget(name, size))
+        elif raw:
+            image = session.image(name, size)
+            key = (name, wh)
+            if key not in raw_outputs:
+                base = os.path.join(output_dir, raw_basename(name, wh))
+                raw_outputs[key] = (np.load(f"{base}.npy", mmap_mode="r+"),
+                                    np.load(f"{base}.done.npy", mmap_mode="r+"))
+            frames, flags = raw_outputs[key]
+            rgba = image_to_rgba(image)
+            frames[frame, :rgba.shape[0], :rgba.shape[1]] = rgba[:wh[1], :wh[0]]
+            flags[frame] = 1
+        else:
+            image = session.image(name, size)
+            path = os.path.join(output_dir, frame_filename(name, wh, shape, root))
+            image.save(path + ".part", "PNG")
+            os.replace(path + ".part", path)
+
+        if (i + 1) % 100 == 0:
+            elapsed = time.perf_counter() - start
+            print(f"  [worker {worker_id}] {i + 1}/{len(jobs)} frames ({(i + 1) / elapsed:.1f} fps)", flush=True)
+
+    pdf_outputs.close()
+    for frames, flags in raw_outputs.values():
+        frames.flush()
+        flags.flush()
+    return len(jobs), time.perf_counter() - start
+
+def shard_jobs(jobs, workers, fmt="png"):
+    """Round-robin shards keep every worker's jobs in view/size order."""
+    if fmt != "pdf":
+        return [jobs[i::workers] for i in range(workers)]
+
+    # Each document is written by a single process, so whole view/size groups are dealt out
+    groups = {}
+    for job in jobs:
+        groups.setdefault((job[0], job[1]), []).append(job)
+    shards = [[] for _ in range(workers)]
+    for i, group in enumerate(groups.values()):
+        shards[i % workers].extend(group)
+    return shards
+
+def render_jobs(jobs, output_dir, workers=1, fmt="png", raw=False):
+    start = time.perf_counter()
+    if workers <= 1:
+        run_shard(jobs, output_dir, fmt, raw)
+    else:
+        # Spawned (not forked) children each start a clean Qt instance
+        ctx = multiprocessing.get_context("spawn")
+        shards = [(shard, output_dir, fmt, raw, i) for i, shard in enumerate(shard_jobs(jobs, workers, fmt)) if shard]
+        with ctx.Pool(workers) as pool:
+            pool.starmap(run_shard, shards)
+
+    elapsed = time.perf_counter() - start
+    fps = len(jobs) / elapsed if elapsed > 0 else 0.0
+    print(f"Rendered {len(jobs)} frames in {elapsed:.2f}s ({fps:.1f} fps, {workers} worker(s))")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Render SIREN views to PNG, SVG or PDF files.")
+    parser.add_argument("shape", nargs="?", help="Single scale shape for the main window screenshot")
+    parser.add_argument("--shapes", help="Shapes: 'all', ranges '0-99', lists, 'catalog' or 'category:<name>'")
+    parser.add_argument("--roots", default="0", help="Roots: 'all', ranges or lists (default: 0)")
+    parser.add_argument("--views", default="main_window", help=f"Comma-separated views: {','.join(VIEW_SIZES)}")
+    parser.add_argument("--sizes", help="Comma-separated WxH sizes (default: per-view size)")
+    parser.add_argument("--out", default="screenshots", help="Output directory")
+    parser.add_argument("--workers", type=int, default=1, help="Number of render processes (default: 1)")
+    parser.add_argument("--format", default="png", choices=FORMATS,
+                        help="Output format; pdf writes one multi-page document per view/size (default: png)")
+    parser.add_argument("--raw", action="store_true",
+                        help="Write raw RGBA frames to one memory-mapped .npy per view/size instead of PNGs")
+    return parser.parse_args(argv)
 
 def main():
-    # A QApplication instance is necessary to create QWidgets and perform painting,
-    # even if we don't start the event loop with exec().
-    app = QApplication(sys.argv)
-
-    # Initialize Models
-    scale_model = ScaleModel()
-    instrument_model = InstrumentModel()
-    spelling = Spelling(scale_model)
-    main_window = MainWindow()
-
-    if len(sys.argv) > 1:
-        try:
-            scale_shape = int(sys.argv[1])
-            print(f"Setting scale shape to: {scale_shape}")
-            scale_model.set_shape(scale_shape)
-            main_window.scale_model.set_shape(scale_shape)
-        except ValueError:
-            print(f"Ignoring invalid argument: {sys.argv[1]}")
+    args = parse_args(sys.argv[1:])
 
     # Create output directory
-    output_dir = "screenshots"
+    output_dir = args.out
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    # Configuration for views to render: (filename_prefix, ViewClass, Size)
-    # Note: We instantiate views with the shared models.
-    views_config = [
-        ("main_window", main_window, QSize(1800, 400)),
-        # ("fretboard", FretboardView(instrument_model, scale_model, spelling), QSize(1000, 300)),
-        # ("piano", PianoView(scale_model, spelling), QSize(1000, 300)),
-        # ("tonnetz", TonnetzView(scale_model, spelling), QSize(800, 600)),
-        # ("polygon", PolygonView(scale_model, spelling), QSize(500, 500)),
-        # ("scale_selector", ScaleSelectorView(scale_model, spelling), QSize(800, 80))
-    ]
-
-    print(f"Rendering {len(views_config)} views to '{output_dir}/'...")
-
-    for name, widget, size in views_config:
-        # Set the size of the widget. This determines the size of the output image.
-        widget.resize(size)
-        
-        # grab() renders the widget into a QPixmap.
-        # This works even if the widget is not visible on screen.
-        pixmap = widget.grab()
-        
-        output_path = os.path.join(output_dir, f"{name}.png")
-        pixmap.save(output_path)
+    if args.shapes is None:
+        # A QApplication instance is necessary to create QWidgets and perform painting,
+        # even if we don't start the event loop with exec().
+        app = QApplication(sys.argv[:1])
+        session = RenderSession()
+
+        # Single screenshot of the main window, optionally for one shape
+        main_window = session.widget("main_window")
+        if args.shape is not None:
+            try:
+                scale_shape = int(args.shape)
+                print(f"Setting scale shape to: {scale_shape}")
+                main_window.scale_model.set_shape(scale_shape)
+                main_window.repaint_scheduler.flush()
+            except ValueError:
+                print(f"Ignoring invalid argument: {args.shape}")
+
+        main_window.resize(VIEW_SIZES["main_window"])
+        output_path = os.path.join(output_dir, f"main_window.{args.format}")
+        if args.format == "svg":
+            export_svg(main_window, output_path)
+        elif args.format == "pdf":
+            with PdfExporter(output_path) as pdf:
+                pdf.add_page(main_window)
+        else:
+            main_window.grab().save(output_path)
         print(f"  Saved {output_path}")
+        print("Done.")
+        return
+
+    catalog = ScaleCatalog.load()
+    shapes = parse_int_set(args.shapes, 4096, catalog)
+    roots = parse_int_set(args.roots, 12)
+    views = [v.strip() for v in args.views.split(",") if v.strip()]
+    for name in views:
+        if name not in VIEW_SIZES:
+            sys.exit(f"Unknown view: {name}")
+    sizes = parse_sizes(args.sizes) if args.sizes else None
+    if args.raw and args.format != "png":
+        sys.exit("--raw writes pixel arrays and cannot be combined with --format svg/pdf")
+
+    jobs = build_jobs(views, sizes, shapes, roots)
+    if args.raw:
+        done = open_raw_outputs(output_dir, views, sizes, shapes, roots)
+        todo = [job for job in jobs if (job[0], job[1], job[4]) not in done]
+    else:
+        todo = pending_jobs(jobs, output_dir, args.format)
 
-    print("Done.")
+    print(f"Rendering {len(todo)} frames ({len(shapes)} shapes x {len(roots)} roots x {len(views)} views, "
+          f"{len(jobs) - len(todo)} already done) to '{output_dir}/'...")
+    if todo:
+        render_jobs(todo, output_dir, max(1, args.workers), args.format, args.raw)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Serve SIREN diagrams as PNG images over HTTP, rendered headlessly.
+
+    python serve.py [--port 8765] [--workers 4]
+
+Each view has its own endpoint, configured by query parameters:
+    /fretboard?shape=2741&root=7&tuning=Guitar: D6&cmap=romaO&w=1000&h=300
+    /piano?shape=Harmonic Minor&root=A&keys=88
+    /polygon?shape=2741&root=Eb&spelling=flat&label=1
+
+Common parameters: shape (number or catalog name), root (0-11 or note name),
+spelling (sharp/flat), cmap, w, h. Fingerboards also take tuning (preset name
+or comma-separated pitch classes) and frets; the piano takes keys (24, 36, 48
+or 88). GET / lists the views and their default sizes.
+
+Responses are cached in memory and on disk, keyed by the normalized parameters,
+and carry an ETag derived from the same key: a request with a matching
+If-None-Match is answered 304 without rendering or reading anything.
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# Render headlessly unless a platform was chosen explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+
+from models import ScaleCatalog
+from modules.config import CACHE_DIR, config_path, load_config
+from views.common import CYCLIC_MAPS, NOTE_NAMES
+from views.piano import KEY_RANGES
+from views.renderers import RenderState, create_renderer, render_image, ensure_gui_app
+
+# Bump when drawing changes, so stale cached images are never served
+RENDER_VERSION = 1
+
+# view -> default (w, h)
+VIEW_SIZES = {
+    "fretboard": (1000, 300),
+    "fretless": (1000, 300),
+    "piano": (1000, 300),
+    "tonnetz": (800, 600),
+    "polygon": (500, 500),
+    "scale_selector": (800, 60),
+    "key_signature": (160, 90),
+}
+FINGERBOARDS = ("fretboard", "fretless")
+MAX_SIZE = 4096
+DEFAULT_TUNING = (4, 9, 2, 7, 11, 4)
+
+# Note names accepted for 'root', with ASCII accidentals
+_NOTE_ALIASES = {name.replace("♯", "#").lower(): i for i, name in enumerate(NOTE_NAMES)}
+_NOTE_ALIASES.update({n.lower(): i for i, n in enumerate(
+    ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"])})
+_NOTE_ALIASES.update({"cb": 11, "b#": 0, "e#": 5, "fb": 4})
+
+class BadRequest(ValueError):
+    pass
+
+def load_tunings():
+    """Tuning presets by name, as in the tuning selector."""
+    try:
+        data = load_config(config_path("tunings.yaml"))
+    except Exception as e:
+        print(f"Error loading tunings: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+class ImageParams:
+    """
+    Validated, normalized parameters for one image. Parameters a view does not
+    use are dropped, so equivalent requests share a cache key and ETag.
+    """
+
+    def __init__(self, view, shape, root, spelling, cmap, w, h, tuning=None, frets=None, keys=None, label=None):
+        self.view = view
+        self.shape = shape
+        self.root = root
+        self.spelling = spelling
+        self.cmap = cmap
+        self.w = w
+        self.h = h
+        self.tuning = tuning
+        self.frets = frets
+        self.keys = keys
+        self.label = label
+
+    def key(self):
+        parts = [f"v{RENDER_VERSION}", self.view, f"s{self.shape}", f"r{self.root}",
+                 self.spelling or "auto", self.cmap, f"{self.w}x{self.h}"]
+        if self.tuning is not None:
+            parts.append("t" + ".".join(map(str, self.tuning)) + f"f{self.frets}")
+        if self.keys is not None:
+            parts.append("k{}-{}".format(*self.keys))
+        if self.label:
+            parts.append("l" + self.label)
+        return "/".join(parts)
+
+    def etag(self):
+        return '"' + hashlib.sha1(self.key().encode("utf-8")).hexdigest() + '"'
+
+class ParamParser:
+    """Turns a request path and query string into ImageParams, or raises BadRequest."""
+
+    def __init__(self, catalog, tunings):
+        self.catalog = catalog
+        self.tunings = tunings
+
+    def _int(self, query, name, default, lo, hi):
+        raw = query.get(name, default)
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            raise BadRequest(f"'{name}' must be an integer, got {raw!r}")
+        if not lo <= value <= hi:
+            raise BadRequest(f"'{name}' must be between {lo} and {hi}")
+        return value
+
+    def _shape(self, raw):
+        # ASCII only: str.isdigit() also accepts e.g. '²', which int() rejects
+        if re.fullmatch(r"\d+", raw, re.ASCII):
+            shape = int(raw)
+            if shape > 0xFFF:
+                raise BadRequest("'shape' must be between 0 and 4095")
+            return shape
+        shape = self.catalog.shape_for(raw)
+        if shape is None:
+            raise BadRequest(f"Unknown scale: {raw!r}")
+        return shape
+
+    def _root(self, raw):
+        if re.fullmatch(r"-?\d+", raw, re.ASCII):
+            return int(raw) % 12
+        root = _NOTE_ALIASES.get(raw.strip().replace("♭", "b").replace("♯", "#").lower())
+        if root is None:
+            raise BadRequest(f"Unknown root note: {raw!r}")
+        return root
+
+    def _tuning(self, raw):
+        if raw is None:
+            return DEFAULT_TUNING
+        preset = self.tunings.get(raw)
+        if preset:
+            return tuple(int(n) % 12 for n in preset)
+        try:
+            tuning = tuple(self._root(n) for n in raw.split(","))
+        except BadRequest:
+            raise BadRequest(f"'tuning' must be a preset name or comma-separated notes, got {raw!r}")
+        if not 1 <= len(tuning) <= 12:
+            raise BadRequest("'tuning' must have between 1 and 12 strings")
+        return tuning
+
+    def _keys(self, raw):
+        if raw is None:
+            return KEY_RANGES["3 Octaves"]
+        for name, key_range in KEY_RANGES.items():
+            if raw in (name, str(key_range[1])):
+                return key_range
+        raise BadRequest(f"'keys' must be one of {', '.join(str(r[1]) for r in KEY_RANGES.values())}")
+
+    def parse(self, path, query_string):
+        view = path.strip("/")
+        if view not in VIEW_SIZES:
+            raise LookupError(view)
+
+        # Last value wins for repeated parameters
+        query = {k: v[-1] for k, v in parse_qs(query_string, keep_blank_values=True).items()}
+        unknown = set(query) - {"shape", "root", "spelling", "cmap", "w", "h", "tuning", "frets", "keys", "label"}
+        if unknown:
+            raise BadRequest(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+        shape = self._shape(query.get("shape", "2741"))
+        root = self._root(query.get("root", "0"))
+
+        spelling = query.get("spelling") or None
+        if spelling not in (None, "sharp", "flat"):
+            raise BadRequest("'spelling' must be 'sharp' or 'flat'")
+
+        cmap = query.get("cmap", CYCLIC_MAPS[0] if CYCLIC_MAPS else "")
+        if cmap not in CYCLIC_MAPS:
+            raise BadRequest(f"'cmap' must be one of {', '.join(CYCLIC_MAPS)}")
+
+        default_w, default_h = VIEW_SIZES[view]
+        w = self._int(query, "w", default_w, 16, MAX_SIZE)
+        h = self._int(query, "h", default_h, 16, MAX_SIZE)
+
+        params = ImageParams(view, shape, root, spelling, cmap, w, h)
+        if view in FINGERBOARDS:
+            params.tuning = self._tuning(query.get("tuning"))
+            params.frets = self._int(query, "frets", 24, 1, 36)
+        elif view == "piano":
+            params.keys = self._keys(query.get("keys"))
+        elif view == "polygon" and query.get("label") not in (None, "", "0"):
+            params.label = self.catalog.name_for(shape) or ""
+        return params
+
+class ImageCache:
+    """
+    Encoded PNGs keyed by ImageParams.key(): an in-memory LRU bounded by total
+    bytes in front of a directory of files named by the key's hash.
+
+    The directory is bounded too, by max_disk_bytes. Reading a file refreshes
+    its mtime, and once a write takes the directory over budget the oldest
+    files by mtime are deleted until it is back under DISK_LOW_WATER of it,
+    so the directory is only rescanned every so often.
+    """
+    DISK_LOW_WATER = 0.9
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_files())
+            self._trim_disk()
+
+    def _path(self, etag):
+        return os.path.join(self.directory, etag.strip('"') + ".png")
+
+    def get(self, params):
+        etag = params.etag()
+        with self._lock:
+            data = self._entries.get(etag)
+            if data is not None:
+                self._entries.move_to_end(etag)
+                return data, "memory"
+
+        if self.directory:
+            path = self._path(etag)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                # Recently used files are evicted last
+                os.utime(path)
+            except OSError:
+                return None, None
+            self._remember(etag, data)
+            return data, "disk"
+        return None, None
+
+    def put(self, params, data):
+        etag = params.etag()
+        self._remember(etag, data)
+        if self.directory:
+            # Atomic rename, so concurrent readers never see a partial file
+            path = self._path(etag)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"Warning: could not write image cache {path}: {e}")
+                return
+            with self._disk_lock:
+                self._disk_bytes += len(data)
+            self._trim_disk()
+
+    def _disk_files(self):
+        """(mtime, path, size) of every cached PNG in the directory."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, entry.path, st.st_size))
+        return files
+
+    def _trim_disk(self):
+        with self._disk_lock:
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            # Other processes may share the directory, so recount from disk
+            files = sorted(self._disk_files())
+            total = sum(size for _, _, size in files)
+            target = self.max_disk_bytes * self.DISK_LOW_WATER
+            for _, path, size in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+            self._disk_bytes = total
+
+    def _remember(self, etag, data):
+        with self._lock:
+            if etag in self._entries:
+                self._entries.move_to_end(etag)
+                return
+            self._entries[etag] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+
+class RenderPool:
+    """
+    A fixed number of render threads. Each thread keeps its own renderers,
+    since their layout caches are not shared safely between threads, and
+    identical requests arriving together are rendered once.
+    """
+
+    def __init__(self, workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+        self._local = threading.local()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _renderer(self, params):
+        renderers = getattr(self._local, "renderers", None)
+        if renderers is None:
+            renderers = self._local.renderers = {}
+        renderer = renderers.get(params.view)
+        if renderer is None:
+            renderer = renderers[params.view] = create_renderer(params.view)
+        if params.tuning is not None:
+            renderer.set_instrument(params.tuning, params.frets)
+        if params.keys is not None:
+            renderer.set_key_range(*params.keys)
+        return renderer
+
+    def _render(self, params):
+        state = RenderState(params.shape, params.root, enharmonic_mode=params.spelling,
+                            cmap_name=params.cmap, scale_name=params.label or "")
+        image = render_image(self._renderer(params), state, params.w, params.h)
+
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
+
+    def render(self, params):
+        """Render params to PNG bytes, blocking until a worker is free."""
+        etag = params.etag()
+        with self._lock:
+            future = self._pending.get(etag)
+            if future is None:
+                future = self._pending[etag] = self._executor.submit(self._render, params)
+                future.add_done_callback(lambda f: self._forget(etag))
+        return future.result()
+
+    def _forget(self, etag):
+        with self._lock:
+            self._pending.pop(etag, None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SIREN"
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+
+        if url.path in ("", "/"):
+            index = {view: {"w": w, "h": h} for view, (w, h) in VIEW_SIZES.items()}
+            self._send(HTTPStatus.OK, json.dumps(index, indent=2).encode("utf-8"), "application/json", head=head)
+            return
+
+        try:
+            params = self.server.parser.parse(url.path, url.query)
+        except LookupError:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown view: {url.path}", head)
+            return
+        except BadRequest as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), head)
+            return
+
+        etag = params.etag()
+        if etag in self._if_none_match():
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, etag=etag, head=True)
+            self._log_timing("304", start)
+            return
+
+        data, source = self.server.cache.get(params)
+        if data is None:
+            data = self.server.pool.render(params)
+            self.server.cache.put(params, data)
+            source = "render"
+
+        self._send(HTTPStatus.OK, data, "image/png", etag=etag, head=head)
+        self._log_timing(source, start)
+
+    def _if_none_match(self):
+        header = self.headers.get("If-None-Match", "")
+        return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+    def _send(self, status, body, content_type, etag=None, head=False):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            # Images for a given URL never change until RENDER_VERSION does
+            self.send_header("Cache-Control", "public, max-age=86400")
+        self.send_header("Content-Length", "0" if status == HTTPStatus.NOT_MODIFIED else str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message, head):
+        self._send(status, (message + "\n").encode("utf-8"), "text/plain; charset=utf-8", head=head)
+
+    def _log_timing(self, source, start):
+        if self.server.verbose:
+            print(f"{self.path} {source} {(time.perf_counter() - start) * 1000:.1f} ms", flush=True)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class ImageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=4, cache_dir=None, cache_bytes=64 * 1024 * 1024,
+                 disk_cache_bytes=256 * 1024 * 1024, verbose=False):
+        super().__init__(address, ImageRequestHandler)
+        self.parser = ParamParser(ScaleCatalog.load(), load_tunings())
+        self.cache = ImageCache(cache_bytes, cache_dir, disk_cache_bytes)
+        self.pool = RenderPool(workers)
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Serve SIREN diagrams as PNG images.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--workers", type=int, default=4, help="Number of render threads (default: 4)")
+    parser.add_argument("--cache-dir", default=os.path.join(CACHE_DIR, "images"),
+                        help="Directory for cached PNGs (default: ~/.cache/siren/images)")
+    parser.add_argument("--no-disk-cache", action="store_true", help="Only cache images in memory")
+    parser.add_argument("--cache-mb", type=int, default=64, help="In-memory cache size in MB (default: 64)")
+    parser.add_argument("--disk-cache-mb", type=int, default=256,
+                        help="On-disk cache size in MB; the least recently used files are deleted (default: 256)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request with its timing")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args(sys.argv[1:])
+
+    # Fonts and images need a QGuiApplication, created on the main thread
+    ensure_gui_app()
+
+    server = ImageServer((args.host, args.port), workers=max(1, args.workers),
+                         cache_dir=None if args.no_disk_cache else args.cache_dir,
+                         cache_bytes=args.cache_mb * 1024 * 1024,
+                         disk_cache_bytes=args.disk_cache_mb * 1024 * 1024, verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving SIREN images on http://{host}:{port}/ ({args.workers} render worker(s))", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,38 @@
 import sys
+import time
+_START = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication
-from views import MainWindow
+from PySide6.QtCore import QTimer
+from modules.startup import StartupTimer, import_time_report
 
 if __name__ == "__main__":
+    # Usage: python siren.py [--startup-report]
+    startup_report = "--startup-report" in sys.argv
+    timer = StartupTimer(_START)
+
     app = QApplication(sys.argv)
+    timer.mark("QApplication")
+
+    # Deferred so the interpreter can start the app before the views are imported
+    from views import MainWindow
+    timer.mark("import views")
+
     window = MainWindow()
+    timer.mark("MainWindow()")
+
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    app.processEvents()
+    timer.mark("first frame")
+
+    if startup_report:
+        window.finish_startup()
+        window.colormap_selector.ensure_icons()
+        timer.mark("deferred startup work")
+        print(timer.report())
+        print()
+        print(import_time_report("views"))
+        sys.exit(0)
+
+    QTimer.singleShot(0, window.finish_startup)
+    sys.exit(app.exec())
@@ -1,9 +1,18 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QColor, QPainter, QFont, QPen
-from PySide6.QtCore import Qt, QRectF
-from .common import CYCLIC_MAPS, INACTIVE_OPACITY, get_cmap, handle_scale_key_event
+from PySide6.QtGui import QPainter, QImage
+from PySide6.QtCore import Qt
+from modules.spelling import spell_scale
+from .common import CYCLIC_MAPS, get_cmap, handle_scale_key_event
+from .mixins import ScheduledRepaintMixin
+from .renderers import RenderState
+
+class BaseNoteView(QWidget, ScheduledRepaintMixin):
+    """
+    Widget shell around a renderer (see views/renderers.py): it owns the models,
+    animation and input handling, and paints by handing a RenderState to self.renderer.
+    """
+    renderer = None
 
-class BaseNoteView(QWidget):
     def __init__(self, scale_model, spelling):
         super().__init__()
         self.scale_model = scale_model
@@ -24,81 +33,48 @@ class BaseNoteView(QWidget):
         if self.current_cmap_name:
             self.cmap = get_cmap(self.current_cmap_name)
 
-    def get_color_for_note(self, note_val, offset_override=None):
-        if not self.cmap: return QColor("#333333")
-        
-        is_active = (self.scale_model.number >> note_val) & 1
-        if is_active:
-            # Use override if provided (for smooth color transitions during animation)
-            # otherwise use model state
-            offset = offset_override if offset_override is not None else self.scale_model.root_note
-            
-            relative_val = (note_val - offset) % 12
-            norm_val = relative_val / 12.0
-            r, g, b, a = self.cmap(norm_val) 
-            return QColor.fromRgbF(r, g, b, a)
-        else:
-            return QColor.fromRgbF(0.6, 0.6, 0.6, INACTIVE_OPACITY)
+    def render_state(self, **kwargs):
+        """Snapshot of the models (and any running animation) for the renderer."""
+        if hasattr(self, '_anim_offset'):
+            kwargs.setdefault('anim_offset', self._anim_offset)
+        if hasattr(self, 'morph_anim'):
+            kwargs.setdefault('morph', self.morph_state())
+        if hasattr(self, '_highlight_data'):
+            kwargs.setdefault('highlights', self.highlight_levels())
+        return RenderState.from_models(self.scale_model, self.spelling, self.current_cmap_name, **kwargs)
 
-    def draw_note_label(self, painter, center, radius, note_val, is_active, is_root, font_size=10, opacity=1.0, active_pen=None, offset_override=None, inactive_text_opacity=None, inactive_text_color=None):
-        bg_color = self.get_color_for_note(note_val, offset_override=offset_override)
-        
-        # Apply opacity to background
-        if opacity < 1.0:
-            bg_color.setAlphaF(bg_color.alphaF() * opacity)
+    def cache_key(self, shape, root_note):
+        """What a frame of this view depends on besides the scale, for IdlePrefetcher."""
+        return (self.width(), self.height(), self.devicePixelRatioF(), self.current_cmap_name,
+                self.spelling.enharmonic_mode, shape, root_note)
 
-        # Draw Background
-        painter.setBrush(bg_color)
-        
-        # Determine outline for standard active notes (non-root)
-        if is_active and not is_root and active_pen:
-            pen = QPen(active_pen)
-            if opacity < 1.0:
-                c = pen.color()
-                c.setAlphaF(c.alphaF() * opacity)
-                pen.setColor(c)
-            painter.setPen(pen)
-        else:
-            painter.setPen(Qt.NoPen)
-            
-        painter.drawEllipse(center, radius, radius)
+    def warm_caches(self, shape, root_note):
+        """
+        Paint the scale (shape, root_note) offscreen, so the renderer's caches
+        (label sprites, layouts) already hold what that frame needs.
+        Returns True once painted, or False if the view is not shown.
+        """
+        if not self.isVisible() or self.width() <= 0 or self.height() <= 0:
+            return False
+        dpr = self.devicePixelRatioF()
+        size = (int(self.width() * dpr), int(self.height() * dpr))
+        if getattr(self, '_scratch', None) is None or (self._scratch.width(), self._scratch.height()) != size:
+            self._scratch = QImage(size[0], size[1], QImage.Format_ARGB32_Premultiplied)
+            self._scratch.setDevicePixelRatio(dpr)
+        painter = QPainter(self._scratch)
+        # Spelling keeps its last mode when the new scale has no preferred one
+        mode = spell_scale(shape, root_note)[2] or self.spelling.enharmonic_mode
+        state = RenderState(shape, root_note, enharmonic_mode=mode, cmap_name=self.current_cmap_name)
+        self.renderer.paint(painter, state, self.width(), self.height())
+        painter.end()
+        return True
 
-        # Root Note Styling
-        if is_active and is_root:
-            # Outer White (Thick)
-            white_color = QColor("white")
-            if active_pen:
-                white_color = active_pen.color()
-            white_color.setAlphaF(white_color.alphaF() * opacity)
-            painter.setPen(QPen(white_color, 6))
-            painter.setBrush(Qt.NoBrush)
-            painter.drawEllipse(center, radius, radius)
-            
-            # Inner Colored (Thin, Inset)
-            inner_color = QColor("white")
-            if self.cmap:
-                r, g, b, a = self.cmap(0.0)
-                inner_color = QColor.fromRgbF(r, g, b, a)
-            inner_color.setAlphaF(inner_color.alphaF() * opacity)
-            
-            painter.setPen(QPen(inner_color, 3))
-            painter.drawEllipse(center, radius, radius)
-
-        # Draw Text
-        if not is_active and inactive_text_color:
-            text_color = QColor(inactive_text_color)
-        else:
-            text_color = QColor("black") if bg_color.lightness() > 128 else QColor("white")
-        text_opacity = opacity
-        if not is_active:
-            text_opacity *= (inactive_text_opacity if inactive_text_opacity is not None else INACTIVE_OPACITY)
-        
-        text_color.setAlphaF(text_color.alphaF() * text_opacity)
-        
-        painter.setPen(text_color)
-        painter.setFont(QFont("Arial", font_size, QFont.Bold))
-        rect = QRectF(center.x() - radius, center.y() - radius, radius*2, radius*2)
-        painter.drawText(rect, Qt.AlignCenter, self.spelling.note_names[note_val])
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # Renderers skip labels outside a partial update (see PlaybackHighlightMixin)
+        if event.rect() != self.rect():
+            painter.setClipRegion(event.region())
+        self.renderer.paint(painter, self.render_state(), self.width(), self.height())
 
     def keyPressEvent(self, event):
         def rotate_cb(direction):
@@ -1,16 +1,29 @@
+import os
 import sys
+import importlib.util
 from PySide6.QtGui import QColor
 from PySide6.QtCore import Qt
 
-try:
-    from cmcrameri import cm
-    CYCLIC_MAPS = sorted([name for name in cm.cmaps if name.endswith('O')])
-    if "romaO" in CYCLIC_MAPS:
-        CYCLIC_MAPS.insert(0, CYCLIC_MAPS.pop(CYCLIC_MAPS.index("romaO")))
-except ImportError:
+# Importing cmcrameri.cm pulls in matplotlib.pyplot, which dominates startup time.
+# The colormaps ship as plain RGB tables, so read those directly and only fall
+# back to the matplotlib objects if the package layout is not what we expect.
+_spec = importlib.util.find_spec("cmcrameri")
+if _spec is None:
     print("Error: 'cmcrameri' package not found. Install via: pip install cmcrameri")
     sys.exit(1)
 
+_CMAP_DIR = os.path.join(list(_spec.submodule_search_locations)[0], "cmaps")
+if os.path.isdir(_CMAP_DIR):
+    _cmap_names = [f[:-4] for f in os.listdir(_CMAP_DIR) if f.endswith(".txt")]
+else:
+    from cmcrameri import cm
+    _CMAP_DIR = None
+    _cmap_names = list(cm.cmaps)
+
+CYCLIC_MAPS = sorted([name for name in _cmap_names if name.endswith('O')])
+if "romaO" in CYCLIC_MAPS:
+    CYCLIC_MAPS.insert(0, CYCLIC_MAPS.pop(CYCLIC_MAPS.index("romaO")))
+
 NOTE_NAMES = ["C", "C♯", "D", "D♯", "E", "F", "F♯", "G", "G♯", "A", "A♯", "B"]
 FONT_SIZE = 11
 INACTIVE_OPACITY = 0.15
@@ -19,8 +32,36 @@ DOUBLE_MARKERS = [12, 24]
 ACTIVE_EDGE_COLOR = "#FFFFFF"
 ACTIVE_EDGE_WIDTH = 4
 
+class ListedCmap:
+    """Minimal stand-in for matplotlib's ListedColormap: maps [0, 1] to an RGBA tuple."""
+
+    def __init__(self, name, colors):
+        self.name = name
+        self.colors = colors
+        self.N = len(colors)
+
+    def __call__(self, x):
+        i = min(max(int(x * self.N), 0), self.N - 1)
+        return self.colors[i]
+
+_cmap_cache = {}
+
 def get_cmap(name):
-    return getattr(cm, name)
+    cmap = _cmap_cache.get(name)
+    if cmap is None:
+        if _CMAP_DIR is None:
+            from cmcrameri import cm
+            cmap = getattr(cm, name)
+        else:
+            colors = []
+            with open(os.path.join(_CMAP_DIR, f"{name}.txt")) as f:
+                for line in f:
+                    values = line.split()
+                    if len(values) >= 3:
+                        colors.append((float(values[0]), float(values[1]), float(values[2]), 1.0))
+            cmap = ListedCmap(name, colors)
+        _cmap_cache[name] = cmap
+    return cmap
 
 def handle_scale_key_event(event, scale_model, spelling, rotate_callback=None):
     """
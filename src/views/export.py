@@ -0,0 +1,81 @@
+from PySide6.QtCore import QPoint, QRect, QSizeF, QMarginsF
+from PySide6.QtGui import QPainter, QPaintEngine, QPdfWriter, QPageSize, QPageLayout
+
+VECTOR_ENGINES = (QPaintEngine.SVG, QPaintEngine.Pdf)
+
+def is_vector_painter(painter):
+    """True when painting to SVG/PDF, where cached pixmaps would be rasterized into the output."""
+    engine = painter.paintEngine()
+    return engine is not None and engine.type() in VECTOR_ENGINES
+
+def _prepare(widget, size):
+    if size is not None and widget.size() != size:
+        widget.resize(size)
+    return widget.size()
+
+def export_svg(widget, path, size=None, title="SIREN"):
+    """Replay the widget's paintEvent (and its children's) into an SVG file."""
+    # QtSvg is only needed here, so keep it out of startup
+    from PySide6.QtSvg import QSvgGenerator
+
+    size = _prepare(widget, size)
+    generator = QSvgGenerator()
+    generator.setFileName(path)
+    generator.setTitle(title)
+    generator.setSize(size)
+    generator.setViewBox(QRect(QPoint(0, 0), size))
+
+    painter = QPainter(generator)
+    widget.render(painter, QPoint())
+    painter.end()
+
+class PdfExporter:
+    """
+    Multi-page PDF with one widget render per page. Pages are written to the
+    file as they are finished, so memory stays flat however many are added.
+    One pixel maps to one point, and each page is sized to the widget on it.
+
+        with PdfExporter("atlas.pdf") as pdf:
+            for shape in shapes:
+                scale_model.set_shape(shape)
+                pdf.add_page(view)
+    """
+
+    def __init__(self, path, title="SIREN"):
+        self.path = path
+        self.title = title
+        self.page_count = 0
+        self._writer = None
+        self._painter = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _page_layout(self, size):
+        page_size = QPageSize(QSizeF(size.width(), size.height()), QPageSize.Point, "", QPageSize.ExactMatch)
+        return QPageLayout(page_size, QPageLayout.Portrait, QMarginsF(0, 0, 0, 0))
+
+    def add_page(self, widget, size=None):
+        size = _prepare(widget, size)
+        if self._writer is None:
+            self._writer = QPdfWriter(self.path)
+            self._writer.setTitle(self.title)
+            self._writer.setCreator("SIREN")
+            self._writer.setResolution(72)
+            self._writer.setPageLayout(self._page_layout(size))
+            self._painter = QPainter(self._writer)
+        else:
+            self._writer.setPageLayout(self._page_layout(size))
+            self._writer.newPage()
+
+        widget.render(self._painter, QPoint())
+        self.page_count += 1
+
+    def close(self):
+        if self._painter is not None:
+            self._painter.end()
+            self._painter = None
+        self._writer = None
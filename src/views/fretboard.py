@@ -1,103 +1,137 @@
+import math
 import numpy as np
 from PySide6.QtWidgets import QSizePolicy, QMenu
-from PySide6.QtGui import QPainter, QPen, QColor, QFont, QAction
-from PySide6.QtCore import Qt, QLineF, QPointF, QRectF
+from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt
 from .base_view import BaseNoteView
-from .common import FONT_SIZE, INACTIVE_OPACITY, SINGLE_MARKERS, DOUBLE_MARKERS
+from .mixins import DragPaintMixin, PlaybackHighlightMixin
+from .renderers import FretboardRenderer, FretlessRenderer
 
-class FingerboardView(BaseNoteView):
-    MARGIN_X = 60
-    MARGIN_TOP = 30
-    MARGIN_BOTTOM = 50
+class FingerboardView(BaseNoteView, DragPaintMixin, PlaybackHighlightMixin):
+    HIT_RADIUS = 15
+    renderer_class = None
 
     def __init__(self, instrument_model, scale_model, spelling):
         super().__init__(scale_model, spelling)
         self.instrument_model = instrument_model
-        self.instrument_model.updated.connect(self.update)
-        self.scale_model.updated.connect(self.update)
-        self.spelling.updated.connect(self.update)
+        self.renderer = self.renderer_class()
+        self.instrument_model.updated.connect(self.invalidate)
+        self.scale_model.updated.connect(self.invalidate)
+        self.spelling.updated.connect(self.invalidate)
         self.setStyleSheet("background-color: #121212;")
         self.setMinimumHeight(300)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.fingering = ()
+        # note -> label region, valid for one size and note grid
+        self._regions = {}
+        self._regions_key = None
+
+        self.init_drag_paint()
+        self.init_highlight_animation()
+
+    def _sync_instrument(self):
+        model = self.instrument_model
+        self.renderer.set_instrument(model.tuning, model.num_frets, model.capo, model.string_frets,
+                                     grid=model.get_note_grid())
+
+    def set_fingering(self, positions):
+        """Mark (string, fret) positions, e.g. a scale pattern or chord voicing; empty to clear."""
+        self.fingering = tuple(positions or ())
+        self.invalidate()
+
+    def render_state(self, **kwargs):
+        kwargs.setdefault('fingering', self.fingering)
+        return super().render_state(**kwargs)
+
+    def highlight_region(self, note_val):
+        model = self.instrument_model
+        self._sync_instrument()
+        grid = model.get_note_grid()
+        if self._regions_key is None or self._regions_key[0] != self.size() or self._regions_key[1] is not grid:
+            self._regions = {}
+            self._regions_key = (self.size(), grid)
+        region = self._regions.get(note_val)
+        if region is None:
+            region = self.renderer.positions_region(self.width(), self.height(), model.positions(note_val))
+            self._regions[note_val] = region
+        return region
+
+    def cache_key(self, shape, root_note):
+        model = self.instrument_model
+        return super().cache_key(shape, root_note) + (tuple(model.tuning), model.num_frets, model.capo, model.string_frets)
+
+    def warm_caches(self, shape, root_note):
+        self._sync_instrument()
+        return super().warm_caches(shape, root_note)
 
     def get_geometry(self):
-        w, h = self.width(), self.height()
-        n = np.arange(self.instrument_model.num_frets + 1)
-        scale_length = (w - 2 * self.MARGIN_X) / 0.75
-        fret_xs = (scale_length * (1 - 2**(-n/12))) + self.MARGIN_X
-        
-        if self.instrument_model.num_strings == 1:
-            string_ys = np.array([h / 2])
-        else:
-            string_ys = np.linspace(h - self.MARGIN_BOTTOM, self.MARGIN_TOP, self.instrument_model.num_strings)
-        return fret_xs, string_ys
+        self._sync_instrument()
+        return self.renderer.get_geometry(self.width(), self.height())
 
-    def get_note_center(self, f_idx, x, prev_x):
-        raise NotImplementedError
+    def get_note_xs(self):
+        """Return the cached x coordinate of the note label for each fret."""
+        self._sync_instrument()
+        return self.renderer.get_note_xs(self.width(), self.height())
 
-    def draw_markers(self, painter, fret_xs, marker_y):
-        pass
+    def hit_test(self, pos):
+        """Return the (string, fret) whose note label contains pos, or None."""
+        fret_xs, string_ys = self.get_geometry()
+        note_xs = self.get_note_xs()
+        x, y = pos.x(), pos.y()
 
-    def get_fret_line_pen(self):
-        return QPen(QColor("#AAAAAA"), 2)
+        # Strings are evenly spaced, so the nearest one follows directly from y
+        if len(string_ys) == 1:
+            s_idx = 0
+        else:
+            spacing = string_ys[0] - string_ys[1]
+            s_idx = int(round((string_ys[0] - y) / spacing))
+            if not 0 <= s_idx < len(string_ys):
+                return None
+
+        # Note centres increase along the neck; only the two neighbours of the
+        # insertion point can be the closest one.
+        i = int(np.searchsorted(note_xs, x))
+        best, best_dist = None, self.HIT_RADIUS
+        for f_idx in (i - 1, i):
+            if 0 <= f_idx < len(note_xs):
+                dist = math.hypot(x - note_xs[f_idx], y - string_ys[s_idx])
+                if dist < best_dist:
+                    best, best_dist = f_idx, dist
+
+        if best is None:
+            return None
+        return s_idx, best
+
+    def note_at(self, pos):
+        hit = self.hit_test(pos)
+        if hit is None:
+            return None
+        return self.instrument_model.note_at(*hit)
 
     def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        w, h = self.width(), self.height()
-        fret_xs, string_ys = self.get_geometry()
-
-        # Grid
-        painter.setPen(QPen(QColor("#555555"), 4))
-        for y in string_ys: painter.drawLine(QLineF(self.MARGIN_X, y, w - self.MARGIN_X, y))
-        
-        painter.setPen(self.get_fret_line_pen())
-        fret_bot_y = h - self.MARGIN_BOTTOM
-        for x in fret_xs: painter.drawLine(QLineF(x, self.MARGIN_TOP, x, fret_bot_y))
-        
-        # Nut
-        if len(fret_xs) > 0:
-            painter.setPen(QPen(QColor("#FFFFFF"), 5))
-            painter.drawLine(QLineF(fret_xs[0], self.MARGIN_TOP, fret_xs[0], fret_bot_y))
-
-        # Markers
-        marker_y = h - (self.MARGIN_BOTTOM / 2)
-        self.draw_markers(painter, fret_xs, marker_y)
-
-        # Notes
-        grid = self.instrument_model.get_note_grid()
-        radius = 11
-        
-        for s_idx, y in enumerate(string_ys):
-            for f_idx, x in enumerate(fret_xs):
-                note_val = grid[s_idx, f_idx]
-                
-                prev_x = fret_xs[f_idx - 1] if f_idx > 0 else 0
-                text_x = self.get_note_center(f_idx, x, prev_x)
-
-                is_active = (self.scale_model.number >> note_val) & 1
-                is_root = (note_val == self.scale_model.root_note)
-                pen_color = QColor("white") if is_root else QColor("#929292")
-                active_pen = QPen(pen_color, 2)
-                
-                self.draw_note_label(painter, QPointF(text_x, y), radius, note_val, is_active, is_root, 
-                                     font_size=FONT_SIZE, active_pen=active_pen)
+        self._sync_instrument()
+        super().paintEvent(event)
 
     def mousePressEvent(self, event):
-        fret_xs, string_ys = self.get_geometry()
-        click_pos = event.position()
-        grid = self.instrument_model.get_note_grid()
-        
-        for s_idx, y in enumerate(string_ys):
-            for f_idx, x in enumerate(fret_xs):
-                prev_x = fret_xs[f_idx - 1] if f_idx > 0 else 0
-                cx = self.get_note_center(f_idx, x, prev_x)
-                if np.sqrt((click_pos.x()-cx)**2 + (click_pos.y()-y)**2) < 15:
-                    if event.button() == Qt.LeftButton:
-                        self.scale_model.toggle_note_active(grid[s_idx, f_idx])
-                    elif event.button() == Qt.RightButton and f_idx == 0:
-                        self.show_tuning_menu(s_idx, event.globalPosition().toPoint())
-                    return
+        hit = self.hit_test(event.position())
+        if hit is None:
+            return
+
+        s_idx, f_idx = hit
+        if event.button() == Qt.LeftButton:
+            note = self.instrument_model.note_at(s_idx, f_idx)
+            if note is not None:
+                self.begin_drag_paint(note)
+        elif event.button() == Qt.RightButton and f_idx == 0:
+            self.show_tuning_menu(s_idx, event.globalPosition().toPoint())
+
+    def mouseMoveEvent(self, event):
+        if self.is_drag_painting():
+            self.continue_drag_paint(self.note_at(event.position()))
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.end_drag_paint()
 
     def show_tuning_menu(self, string_idx, global_pos):
         menu = QMenu(self)
@@ -109,29 +143,7 @@ class FingerboardView(BaseNoteView):
         menu.exec(global_pos)
 
 class FretboardView(FingerboardView):
-    def get_note_center(self, f_idx, x, prev_x):
-        if f_idx == 0: return x - 30
-        return (prev_x + x) / 2
-
-    def draw_markers(self, painter, fret_xs, marker_y):
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor("#FFFFFF"))
-        def get_cx(f): return (fret_xs[f-1]+fret_xs[f])/2 if f <= self.instrument_model.num_frets else None
-        
-        for f in SINGLE_MARKERS:
-            cx = get_cx(f)
-            if cx: painter.drawEllipse(QPointF(cx, marker_y), 3, 3)
-        for f in DOUBLE_MARKERS:
-            cx = get_cx(f)
-            if cx:
-                painter.drawEllipse(QPointF(cx-6, marker_y), 3, 3)
-                painter.drawEllipse(QPointF(cx+6, marker_y), 3, 3)
+    renderer_class = FretboardRenderer
 
 class FretlessView(FingerboardView):
-    def get_note_center(self, f_idx, x, prev_x):
-        return x
-
-    def get_fret_line_pen(self):
-        c = QColor("#AAAAAA")
-        c.setAlphaF(0.2)
-        return QPen(c, 1)
+    renderer_class = FretlessRenderer
@@ -1,15 +1,22 @@
 import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSizePolicy,
                                QPushButton, QLabel, QComboBox, QStackedWidget,
-                               QCheckBox, QLineEdit)
+                               QCheckBox, QLineEdit, QDockWidget, QTabWidget)
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtGui import QIntValidator
-from models import InstrumentModel, ScaleModel
+from models import InstrumentModel, ScaleModel, ScaleCatalog
 from modules.sound import SoundEngine
-from modules.spelling import Spelling
+from modules.spelling import Spelling, spell_scale
 from modules.math import interval_count, num2str
+from modules.similarity import SimilarityIndex
+from modules.subsets import SubsetIndex
 from controls import PresetSelector, OffsetController, ColormapDropdown
 from controls.scale_dropdown import ScaleSelectDropdown
+from controls.scale_picker import ScalePicker
+from controls.fingering import FingeringControl
+from controls.detect import DetectButton
+from controls.follow import FollowButton
+from controls.related_scales import SimilarScalesPanel, ContainingScalesPanel, ChordsPanel
 from .fretboard import FretboardView, FretlessView
 from .scale_selector import ScaleSelectorView
 from .piano import PianoView
@@ -17,8 +24,14 @@ from .polygon import PolygonView
 from .tonnetz import TonnetzView
 from .common import NOTE_NAMES, handle_scale_key_event
 from .key_signature import KeySignatureView
+from .scheduler import RepaintScheduler
+from .prefetch import IdlePrefetcher
+from .export import export_svg
 
 class MainWindow(QMainWindow):
+    # Neighboring scales each view paints ahead (see IdlePrefetcher)
+    PREFETCH_VIEW_STATES = 6
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SIREN")
@@ -30,22 +43,29 @@ class MainWindow(QMainWindow):
         self._connect_signals()
         
         # Initialize label
-        self.on_scale_updated()
+        self.update_scale_labels()
         self.setFocus()
 
     def _init_models(self):
         self.instrument_model = InstrumentModel()
         self.scale_model = ScaleModel()
+        self.scale_catalog = ScaleCatalog.load()
         self.spelling = Spelling(self.scale_model)
         self.sound_engine = SoundEngine()
+        self.repaint_scheduler = RepaintScheduler(self)
+        self.prefetcher = IdlePrefetcher(self.scale_model, self)
 
     def _init_ui(self):
         # Views
         self.fret_view = FretboardView(self.instrument_model, self.scale_model, self.spelling)
-        self.fretless_view = FretlessView(self.instrument_model, self.scale_model, self.spelling)
-        self.piano_view = PianoView(self.scale_model, self.spelling)
+        # The fretless and piano pages are only built the first time they are shown
+        self.fretless_view = None
+        self.piano_view = None
         self.scale_view = ScaleSelectorView(self.scale_model, self.spelling)
         self.key_signature_view = KeySignatureView(self.scale_model, self.spelling)
+
+        for view in [self.fret_view, self.scale_view, self.key_signature_view]:
+            view.set_scheduler(self.repaint_scheduler)
         
         self.lbl_scale_name = QLabel("")
         self.lbl_scale_name.setAlignment(Qt.AlignCenter)
@@ -70,9 +90,15 @@ class MainWindow(QMainWindow):
         self.preset_selector.setCurrentIndex(0)
         
         self.offset_controller = OffsetController(self.instrument_model)
+        self.fingering_control = FingeringControl(self.instrument_model, self.scale_model)
 
         # 3. Scale & Mode Controls
-        self.scale_dropdown = ScaleSelectDropdown(self.scale_model)
+        self.scale_dropdown = ScaleSelectDropdown(self.scale_model, self.scale_catalog)
+        self.btn_scale_search = QPushButton("Search")
+        self.btn_scale_search.setFixedWidth(60)
+        self.btn_related = QPushButton("Related Scales")
+        # Built the first time it is opened
+        self.related_dock = None
 
         self.btn_left = QPushButton("<")
         self.btn_right = QPushButton(">")
@@ -94,6 +120,8 @@ class MainWindow(QMainWindow):
         
         self.btn_play = QPushButton("Play")
         self.chk_loop = QCheckBox("Loop")
+        self.btn_detect = DetectButton(self.scale_catalog)
+        self.btn_follow = FollowButton(self.scale_model, self.scale_catalog)
 
         self.btn_oct_down = QPushButton("-")
         self.btn_oct_up = QPushButton("+")
@@ -142,12 +170,16 @@ class MainWindow(QMainWindow):
         row_inst.addWidget(self.preset_selector)
         row_inst.addWidget(self.offset_controller)
         sb_layout.addLayout(row_inst)
+        sb_layout.addWidget(self.fingering_control)
         
         sb_layout.addSpacing(10)
 
         # Section 3: Scale & Key
         add_section_label("SCALE & KEY")
-        sb_layout.addWidget(self.scale_dropdown)
+        row_scale = QHBoxLayout()
+        row_scale.addWidget(self.scale_dropdown)
+        row_scale.addWidget(self.btn_scale_search)
+        sb_layout.addLayout(row_scale)
         
         # Mode Row
         row_mode = QHBoxLayout()
@@ -165,6 +197,7 @@ class MainWindow(QMainWindow):
         row_trans.addWidget(self.btn_trans_left)
         row_trans.addWidget(self.btn_trans_right)
         sb_layout.addLayout(row_trans)
+        sb_layout.addWidget(self.btn_related)
         
         sb_layout.addSpacing(10)
 
@@ -184,6 +217,8 @@ class MainWindow(QMainWindow):
         row_play = QHBoxLayout()
         row_play.addWidget(self.btn_play)
         row_play.addWidget(self.chk_loop)
+        row_play.addWidget(self.btn_detect)
+        row_play.addWidget(self.btn_follow)
         sb_layout.addLayout(row_play)
         
         sb_layout.addStretch()
@@ -191,8 +226,8 @@ class MainWindow(QMainWindow):
         # Right Content Area
         self.central_stack = QStackedWidget()
         self.central_stack.addWidget(self.fret_view)
-        self.central_stack.addWidget(self.piano_view)
-        self.central_stack.addWidget(self.fretless_view)
+        self.central_stack.addWidget(QWidget())  # Piano placeholder
+        self.central_stack.addWidget(QWidget())  # Fretless placeholder
         
         right_widget = QWidget()
         right_layout = QVBoxLayout(right_widget)
@@ -246,12 +281,17 @@ class MainWindow(QMainWindow):
         self.scale_model.updated.connect(self.on_scale_updated)
         self.spelling.updated.connect(self.on_scale_updated)
         self.sound_engine.note_played.connect(self.scale_view.highlight_note)
+        self.sound_engine.note_played.connect(self.fret_view.highlight_note)
         
         self.btn_toggle_view.clicked.connect(self.toggle_instrument_view)
         self.colormap_selector.currentIndexChanged.connect(self.on_colormap_changed)
         self.btn_polygon.clicked.connect(self.open_polygon_view)
         self.btn_tonnetz.clicked.connect(self.open_tonnetz_view)
+        self.btn_scale_search.clicked.connect(self.open_scale_picker)
+        self.btn_related.clicked.connect(self.toggle_related_scales)
+        self.btn_detect.detected.connect(self.scale_model.set_state)
         self.preset_selector.currentTextChanged.connect(self.change_tuning)
+        self.fingering_control.changed.connect(self.show_fingering)
         self.btn_right.clicked.connect(lambda: self.rotate_modes(1))
         self.btn_left.clicked.connect(lambda: self.rotate_modes(-1))
         self.btn_trans_left.clicked.connect(lambda: self.scale_model.transpose(-1))
@@ -264,18 +304,50 @@ class MainWindow(QMainWindow):
         self.btn_oct_up.clicked.connect(lambda: self.sound_engine.change_octave(1))
         self.txt_bpm.textChanged.connect(self.sound_engine.set_bpm)
 
+        # Warm what the next keystroke needs while idle. Painting is the
+        # costly part, so views only warm the nearest few neighbors.
+        self.prefetcher.add_warmer(spell_scale)
+        for view in [self.fret_view, self.scale_view]:
+            self.prefetcher.add_warmer(view.warm_caches, self.PREFETCH_VIEW_STATES, view.cache_key)
+        self.prefetcher.add_warmer(self.fingering_control.prefetch, self.PREFETCH_VIEW_STATES,
+                                   self.fingering_control.prefetch_key)
+
     def toggle_instrument_view(self):
         current = self.central_stack.currentIndex()
         if current == 0: # Fretboard -> Fretless
-            self.central_stack.setCurrentIndex(2)
+            self.show_page(2)
             self.btn_toggle_view.setText("Piano")
         elif current == 2: # Fretless -> Piano
-            self.central_stack.setCurrentIndex(1)
+            self.show_page(1)
             self.btn_toggle_view.setText("Fretboard")
         else: # Piano -> Fretboard
-            self.central_stack.setCurrentIndex(0)
+            self.show_page(0)
             self.btn_toggle_view.setText("Fretless")
 
+    def show_page(self, index):
+        if index == 1 and self.piano_view is None:
+            self.piano_view = PianoView(self.scale_model, self.spelling)
+            self._replace_page(1, self.piano_view)
+        elif index == 2 and self.fretless_view is None:
+            self.fretless_view = FretlessView(self.instrument_model, self.scale_model, self.spelling)
+            self.fretless_view.set_fingering(self.fingering_control.positions)
+            self._replace_page(2, self.fretless_view)
+        self.central_stack.setCurrentIndex(index)
+
+    def _replace_page(self, index, view):
+        view.set_scheduler(self.repaint_scheduler)
+        self.sound_engine.note_played.connect(view.highlight_note)
+        self.prefetcher.add_warmer(view.warm_caches, self.PREFETCH_VIEW_STATES, view.cache_key)
+        view.set_colormap(self.colormap_selector.itemData(self.colormap_selector.currentIndex()))
+        placeholder = self.central_stack.widget(index)
+        self.central_stack.insertWidget(index, view)
+        self.central_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+    def finish_startup(self):
+        """Work deferred until the first frame is on screen."""
+        self.colormap_selector.load_icons_deferred()
+
     def toggle_playback(self):
         if self.sound_engine.is_playing:
             self.sound_engine.stop()
@@ -291,17 +363,13 @@ class MainWindow(QMainWindow):
 
     def on_scale_updated(self):
         self.sound_engine.update_scale(self.scale_model.root_note, self.scale_model.shape)
-        
-        # Update scale name label
+        # Labels only need to catch up once per frame, however many updates arrive
+        self.repaint_scheduler.call_later(self.update_scale_labels)
+
+    def update_scale_labels(self):
         root_name = self.spelling.note_names[self.scale_model.root_note]
         current_shape = self.scale_model.shape
-        scale_name = None
-        
-        for i in range(self.scale_dropdown.count()):
-            val = self.scale_dropdown.itemData(i)
-            if val is not None and int(val) == current_shape:
-                scale_name = self.scale_dropdown.itemText(i).strip()
-                break
+        scale_name = self.scale_catalog.name_for(current_shape)
         
         vec_int = interval_count(current_shape)
         vec_str = num2str(vec_int, 12).zfill(6)
@@ -327,6 +395,7 @@ class MainWindow(QMainWindow):
     def open_polygon_view(self):
         if not hasattr(self, 'polygon_window') or not self.polygon_window.isVisible():
             self.polygon_window = PolygonView(self.scale_model, self.spelling)
+            self.polygon_window.set_scheduler(self.repaint_scheduler)
             self.polygon_window.set_colormap(self.colormap_selector.itemData(self.colormap_selector.currentIndex()))
             self.polygon_window.set_scale_name(self.lbl_scale_name.text())
             self.sound_engine.note_played.connect(self.polygon_window.highlight_note)
@@ -338,6 +407,7 @@ class MainWindow(QMainWindow):
     def open_tonnetz_view(self):
         if not hasattr(self, 'tonnetz_window') or not self.tonnetz_window.isVisible():
             self.tonnetz_window = TonnetzView(self.scale_model, self.spelling)
+            self.tonnetz_window.set_scheduler(self.repaint_scheduler)
             self.tonnetz_window.set_colormap(self.colormap_selector.itemData(self.colormap_selector.currentIndex()))
             self.sound_engine.note_played.connect(self.tonnetz_window.highlight_note)
             self.tonnetz_window.show()
@@ -345,6 +415,40 @@ class MainWindow(QMainWindow):
             self.tonnetz_window.raise_()
             self.tonnetz_window.activateWindow()
 
+    def open_scale_picker(self):
+        # Built on first use; the list model only materializes rows as they scroll into view
+        if not hasattr(self, 'scale_picker'):
+            self.scale_picker = ScalePicker(self.scale_model, self.scale_catalog, self)
+        pos = self.btn_scale_search.mapToGlobal(self.btn_scale_search.rect().bottomLeft())
+        self.scale_picker.popup(pos)
+
+    def toggle_related_scales(self):
+        if self.related_dock is None:
+            self.similarity_index = SimilarityIndex(self.scale_catalog)
+            self.subset_index = SubsetIndex(self.scale_catalog)
+            self.related_tabs = QTabWidget()
+            self.add_related_panel(SimilarScalesPanel(self.scale_model, self.scale_catalog, self.similarity_index), "Similar")
+            self.add_related_panel(ContainingScalesPanel(self.scale_model, self.scale_catalog, self.subset_index), "Contains")
+            chords_panel = ChordsPanel(self.scale_model, self.spelling, self.scale_catalog, self.sound_engine)
+            chords_panel.chord_selected.connect(self.fingering_control.show_chord)
+            self.add_related_panel(chords_panel, "Chords")
+
+            self.related_dock = QDockWidget("Related Scales", self)
+            self.related_dock.setObjectName("related_scales")
+            self.related_dock.setWidget(self.related_tabs)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.related_dock)
+        else:
+            self.related_dock.setVisible(not self.related_dock.isVisible())
+
+    def add_related_panel(self, panel, title):
+        panel.set_scheduler(self.repaint_scheduler)
+        self.related_tabs.addTab(panel, title)
+
+    def show_fingering(self, positions):
+        self.fret_view.set_fingering(positions)
+        if self.fretless_view:
+            self.fretless_view.set_fingering(positions)
+
     def on_colormap_changed(self, index):
         name = self.colormap_selector.itemData(index)
         self.update_colormaps(name)
@@ -352,8 +456,10 @@ class MainWindow(QMainWindow):
     def update_colormaps(self, name):
         self.fret_view.set_colormap(name)
         self.scale_view.set_colormap(name)
-        self.fretless_view.set_colormap(name)
-        self.piano_view.set_colormap(name)
+        if self.fretless_view:
+            self.fretless_view.set_colormap(name)
+        if self.piano_view:
+            self.piano_view.set_colormap(name)
         if hasattr(self, 'polygon_window') and self.polygon_window:
             self.polygon_window.set_colormap(name)
         if hasattr(self, 'tonnetz_window') and self.tonnetz_window:
@@ -389,16 +495,19 @@ class MainWindow(QMainWindow):
             return
             
         if event.key() == Qt.Key_F12:
-            self.capture_screenshots()
+            # Shift+F12 exports vector SVGs instead of PNGs
+            self.capture_screenshots("svg" if event.modifiers() & Qt.ShiftModifier else "png")
             return
 
         if not handle_scale_key_event(event, self.scale_model, self.spelling, self.rotate_modes):
             super().keyPressEvent(event)
 
-    def capture_screenshots(self):
+    def capture_screenshots(self, fmt="png"):
         if not os.path.exists("screenshots"):
             os.makedirs("screenshots")
-            
+        # Deferred icons may not have loaded yet (and never do offscreen)
+        self.colormap_selector.ensure_icons()
+
         views = {
             "main_window": self,
             "fretboard": self.fret_view,
@@ -410,12 +519,16 @@ class MainWindow(QMainWindow):
         
         for name, widget in views.items():
             if widget and widget.isVisible():
-                pixmap = widget.grab()
-                pixmap.save(f"screenshots/{name}.png")
+                if fmt == "svg":
+                    export_svg(widget, f"screenshots/{name}.svg")
+                else:
+                    pixmap = widget.grab()
+                    pixmap.save(f"screenshots/{name}.png")
         print("Screenshots saved to ./screenshots/")
 
     def closeEvent(self, event):
         self.sound_engine.stop()
+        self.btn_follow.stop()
         if hasattr(self, 'polygon_window') and self.polygon_window:
             self.polygon_window.close()
         if hasattr(self, 'tonnetz_window') and self.tonnetz_window:
@@ -1,5 +1,22 @@
 from PySide6.QtCore import QPropertyAnimation, QEasingCurve, Property, QTimer
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QRegion
+from modules.voice_leading import voice_leading
+
+class ScheduledRepaintMixin:
+    """
+    Mixin to route model-driven repaints through a RepaintScheduler.
+    Without a scheduler, invalidate() falls back to a plain update().
+    """
+    scheduler = None
+
+    def set_scheduler(self, scheduler):
+        self.scheduler = scheduler
+
+    def invalidate(self):
+        if self.scheduler is not None:
+            self.scheduler.invalidate(self)
+        else:
+            self.update()
 
 class RotationAnimationMixin:
     """
@@ -16,6 +33,14 @@ class RotationAnimationMixin:
     def is_animating(self):
         return self.anim.state() == QPropertyAnimation.State.Running
 
+    def finish_animation(self):
+        # Jump straight to the model state, e.g. before an offscreen grab
+        self.anim.stop()
+        self._anim_offset = float(self.scale_model.root_note)
+        if hasattr(self, 'morph_anim'):
+            self.finish_morph()
+        self.update()
+
     def get_anim_offset(self):
         return self._anim_offset
 
@@ -40,11 +65,71 @@ class RotationAnimationMixin:
         self.anim.setStartValue(self._anim_offset)
         self.anim.setEndValue(target)
         self.anim.start()
+        self.invalidate()
+
+class MorphAnimationMixin:
+    """
+    Mixin to morph between scales along their minimal voice leading (see
+    modules/voice_leading.py) when the notes change, e.g. on picking another
+    scale or toggling a note. Transpositions and mode rotations are left to
+    RotationAnimationMixin. Expects the class to inherit from QObject/QWidget
+    and have a 'scale_model' attribute.
+    """
+    def init_morph_animation(self):
+        self._morph_shape = self.scale_model.shape
+        self._morph_number = self.scale_model.number
+        self._morph_motions = ()
+        self._morph_progress = 1.0
+        self.morph_anim = QPropertyAnimation(self, b"morphProgress")
+        self.morph_anim.setDuration(300)
+        self.morph_anim.setEasingCurve(QEasingCurve.OutCubic)
+        self.morph_anim.setStartValue(0.0)
+        self.morph_anim.setEndValue(1.0)
+        self.scale_model.updated.connect(self.on_morph_update)
+
+    def is_morphing(self):
+        return self.morph_anim.state() != QPropertyAnimation.State.Stopped
+
+    def finish_morph(self):
+        self.morph_anim.stop()
+        self._morph_progress = 1.0
         self.update()
 
+    def get_morph_progress(self):
+        return self._morph_progress
+
+    def set_morph_progress(self, val):
+        self._morph_progress = val
+        self.update()
+
+    morphProgress = Property(float, get_morph_progress, set_morph_progress)
+
+    def on_morph_update(self):
+        shape, number = self.scale_model.shape, self.scale_model.number
+        source = self._morph_number
+        changed = shape != self._morph_shape and number != source
+        self._morph_shape, self._morph_number = shape, number
+        if not changed:
+            return
+        # A morph still running restarts from the scale it was heading to
+        self._morph_motions = voice_leading(source, number)
+        self.morph_anim.stop()
+        if self._morph_motions:
+            self.morph_anim.start()
+        else:
+            self._morph_progress = 1.0
+
+    def morph_state(self):
+        """(motions, progress) of the morph in flight for RenderState, or None."""
+        if not self.is_morphing():
+            return None
+        return self._morph_motions, self._morph_progress
+
 class PlaybackHighlightMixin:
     """
     Mixin to provide visual highlighting when a note is played.
+    Views whose notes are small, scattered labels can override highlight_region
+    so each animation frame repaints only those labels.
     """
     def init_highlight_animation(self):
         self._highlight_data = {}
@@ -78,19 +163,81 @@ class PlaybackHighlightMixin:
                     data['val'] = 0
                     keys_to_remove.append(note)
         
+        changed = list(self._highlight_data)
         for k in keys_to_remove:
             del self._highlight_data[k]
             
         if not self._highlight_data:
             self._highlight_timer.stop()
-            
-        self.update()
 
-    def get_interpolated_color(self, note_val, base_color, target_color):
-        val = self._highlight_data.get(note_val, {}).get('val', 0.0)
-        if val <= 0: return base_color
-        
-        r = base_color.red() * (1 - val) + target_color.red() * val
-        g = base_color.green() * (1 - val) + target_color.green() * val
-        b = base_color.blue() * (1 - val) + target_color.blue() * val
-        return QColor(int(r), int(g), int(b))
\ No newline at end of file
+        region = QRegion()
+        for note in changed:
+            note_region = self.highlight_region(note)
+            if note_region is None:
+                self.update()
+                return
+            region += note_region
+        self.update(region)
+
+    def highlight_region(self, note_val):
+        """Widget region showing note_val, or None to repaint the whole view."""
+        return None
+
+    def highlight_levels(self):
+        """Current highlight strength (0-1) of each highlighted note, for RenderState."""
+        return {note: data['val'] for note, data in self._highlight_data.items()}
+
+class DragPaintMixin:
+    """
+    Mixin to toggle many notes in a single mouse gesture.
+    Expects the class to have a 'scale_model' attribute and to call
+    begin/continue/end_drag_paint from its mouse handlers.
+    Toggles are gathered into a pending bitmask and committed at most once per frame.
+    """
+    def init_drag_paint(self):
+        self._drag_active = False
+        self._drag_target = False
+        self._drag_visited = 0
+        self._drag_pending = 0
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setInterval(16)
+        self._drag_timer.timeout.connect(self.commit_drag_paint)
+
+    def is_drag_painting(self):
+        return self._drag_active
+
+    def begin_drag_paint(self, note_val):
+        self._drag_active = True
+        self._drag_visited = 0
+        self._drag_pending = 0
+        # The first note decides whether the gesture paints notes on or off
+        self._drag_target = not ((self.scale_model.number >> note_val) & 1)
+        self.continue_drag_paint(note_val)
+        self.commit_drag_paint()
+        self._drag_timer.start()
+
+    def continue_drag_paint(self, note_val):
+        if not self._drag_active or note_val is None:
+            return
+
+        bit = 1 << note_val
+        if self._drag_visited & bit:
+            return
+        self._drag_visited |= bit
+
+        is_active = bool((self.scale_model.number ^ self._drag_pending) & bit)
+        if is_active != self._drag_target:
+            self._drag_pending ^= bit
+
+    def commit_drag_paint(self):
+        if self._drag_pending:
+            pending = self._drag_pending
+            self._drag_pending = 0
+            self.scale_model.toggle_notes(pending)
+
+    def end_drag_paint(self):
+        if not self._drag_active:
+            return
+        self._drag_active = False
+        self._drag_timer.stop()
+        self.commit_drag_paint()
@@ -1,106 +1,74 @@
-from PySide6.QtWidgets import QSizePolicy
-from PySide6.QtGui import QPainter, QPen, QColor, QFont
-from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtWidgets import QSizePolicy, QMenu
+from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt
 from .base_view import BaseNoteView
-from .common import FONT_SIZE, INACTIVE_OPACITY
+from .mixins import DragPaintMixin, PlaybackHighlightMixin
+from .renderers import PianoRenderer
 
-class PianoView(BaseNoteView):
-    def __init__(self, scale_model, spelling, octaves=3):
+# (first key, number of keys), counted in semitones from the C of the lowest octave
+KEY_RANGES = {
+    "2 Octaves": (0, 24),
+    "3 Octaves": (0, 36),
+    "4 Octaves": (0, 48),
+    "88 Keys": (9, 88),  # A0 - C8
+}
+
+class PianoView(BaseNoteView, DragPaintMixin, PlaybackHighlightMixin):
+    def __init__(self, scale_model, spelling, octaves=3, first_key=0, num_keys=None):
         super().__init__(scale_model, spelling)
-        self.octaves = octaves
-        self.scale_model.updated.connect(self.update)
-        self.spelling.updated.connect(self.update)
+        self.renderer = PianoRenderer(first_key, num_keys if num_keys else octaves * 12)
+        self.scale_model.updated.connect(self.invalidate)
+        self.spelling.updated.connect(self.invalidate)
         self.setStyleSheet("background-color: #121212;")
         self.setMinimumHeight(300)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        # Key definitions
-        self.white_indices = [0, 2, 4, 5, 7, 9, 11]
-        self.black_indices = [1, 3, 6, 8, 10]
+        self.init_drag_paint()
+        self.init_highlight_animation()
+
+    @property
+    def first_key(self): return self.renderer.first_key
+    @property
+    def num_keys(self): return self.renderer.num_keys
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        w, h = self.width(), self.height()
-        
-        # Geometry
-        white_keys_per_octave = 7
-        total_white_keys = self.octaves * white_keys_per_octave
-        key_w = w / total_white_keys
-        black_key_w = key_w * 0.6
-        black_key_h = h * 0.6
-        
-        self.white_keys = []
-        self.black_keys = []
-        
-        # Calculate key rectangles
-        for oct_idx in range(self.octaves):
-            octave_offset_x = oct_idx * white_keys_per_octave * key_w
-            
-            for i in range(12):
-                note_val = i
-                
-                if i in self.white_indices:
-                    w_idx = self.white_indices.index(i)
-                    x = octave_offset_x + (w_idx * key_w)
-                    rect = QRectF(x, 0, key_w, h - 20)
-                    self.white_keys.append((rect, note_val))
-                else:
-                    # Black keys are centered on the boundary of white keys
-                    # C#(1) -> between 0 and 1
-                    # D#(3) -> between 1 and 2
-                    # F#(6) -> between 3 and 4
-                    # G#(8) -> between 4 and 5
-                    # A#(10) -> between 5 and 6
-                    
-                    # Map note index to the white key index to its left
-                    if i == 1: w_ref = 0
-                    elif i == 3: w_ref = 1
-                    elif i == 6: w_ref = 3
-                    elif i == 8: w_ref = 4
-                    elif i == 10: w_ref = 5
-                    
-                    x = octave_offset_x + (w_ref * key_w) + key_w - (black_key_w / 2)
-                    rect = QRectF(x, 0, black_key_w, black_key_h)
-                    self.black_keys.append((rect, note_val))
+    def set_key_range(self, first_key, num_keys):
+        self.renderer.set_key_range(first_key, num_keys)
+        self.update()
 
-        # Draw Keys (White then Black)
-        painter.setPen(QPen(QColor("black"), 1))
-        
-        for rect, _ in self.white_keys:
-            painter.setBrush(QColor("white"))
-            painter.drawRect(rect)
-            
-        for rect, _ in self.black_keys:
-            painter.setBrush(QColor("black"))
-            painter.drawRect(rect)
-            
-        # Draw Labels (White then Black to ensure visibility)
-        for rect, note_val in self.white_keys:
-            self._draw_label(painter, rect, note_val)
-            
-        for rect, note_val in self.black_keys:
-            self._draw_label(painter, rect, note_val)
+    def get_layout(self):
+        return self.renderer.get_layout(self.width(), self.height())
 
-    def _draw_label(self, painter, key_rect, note_val):
-        radius = 11
-        cx = key_rect.center().x()
-        cy = key_rect.bottom() - radius - 8
+    def highlight_region(self, note_val):
+        return self.renderer.note_region(self.width(), self.height(), note_val)
 
-        is_active = (self.scale_model.number >> note_val) & 1
-        is_root = (note_val == self.scale_model.root_note)
-        pen_color = QColor("white") if is_root else QColor("#929292")
-        active_pen = QPen(pen_color, 2)
+    def note_at(self, pos):
+        layout = self.get_layout()
+        k = layout.key_at(pos.x(), pos.y())
+        return None if k is None else int(layout.pcs[k])
 
-        self.draw_note_label(painter, QPointF(cx, cy), radius, note_val, is_active, is_root, 
-                             font_size=FONT_SIZE, active_pen=active_pen)
+    def show_range_menu(self, global_pos):
+        menu = QMenu(self)
+        menu.setStyleSheet("QMenu { background-color: #333; color: white; }")
+        for name, (first_key, num_keys) in KEY_RANGES.items():
+            action = QAction(name, self)
+            action.setCheckable(True)
+            action.setChecked((first_key, num_keys) == (self.first_key, self.num_keys))
+            action.triggered.connect(lambda c, r=(first_key, num_keys): self.set_key_range(*r))
+            menu.addAction(action)
+        menu.exec(global_pos)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            pos = event.position()
-            # Check black keys first (z-order top)
-            for rect, note_val in self.black_keys + self.white_keys:
-                if rect.contains(pos):
-                    self.scale_model.toggle_note_active(note_val)
-                    return
\ No newline at end of file
+            note_val = self.note_at(event.position())
+            if note_val is not None:
+                self.begin_drag_paint(note_val)
+        elif event.button() == Qt.RightButton:
+            self.show_range_menu(event.globalPosition().toPoint())
+
+    def mouseMoveEvent(self, event):
+        if self.is_drag_painting():
+            self.continue_drag_paint(self.note_at(event.position()))
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.end_drag_paint()
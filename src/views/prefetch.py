@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QTimer
+from models.scale import neighbor_states
+
+class IdlePrefetcher(QObject):
+    """
+    Warms caches for the scales one keystroke away (see neighbor_states)
+    while the event loop is idle, so the next rotation, transposition or
+    toggle paints from warm caches.
+
+    Each warmer is called as warm(shape, root) for the neighbors of the
+    current scale, nearest moves first and at most 'limit' of them. Work
+    runs in slices of SLICE_BUDGET seconds from a zero-interval timer, so
+    input is never held up by more than one warmer call. A warmer's 'key'
+    callable names what its result depends on; keys already warmed (up to
+    MAX_WARMED of them) are skipped. A warmer returning False did nothing
+    (e.g. its view is hidden) and is tried again next time.
+    """
+    # Let the frame for the change itself go out first
+    START_DELAY = 20
+    SLICE_BUDGET = 0.004
+    MAX_WARMED = 2048
+
+    def __init__(self, scale_model, parent=None):
+        super().__init__(parent)
+        self.scale_model = scale_model
+        self._warmers = []
+        self._queue = []
+        self._warmed = OrderedDict()
+
+        self._start_timer = QTimer(self)
+        self._start_timer.setSingleShot(True)
+        self._start_timer.setInterval(self.START_DELAY)
+        self._start_timer.timeout.connect(self._rebuild)
+
+        self._slice_timer = QTimer(self)
+        self._slice_timer.setInterval(0)
+        self._slice_timer.timeout.connect(self._run_slice)
+
+        self.scale_model.updated.connect(self.schedule)
+
+    def add_warmer(self, warm, limit=None, key=None):
+        self._warmers.append((warm, limit, key))
+        self.schedule()
+
+    def schedule(self):
+        """Drop pending work and start over from the current scale once idle."""
+        self._queue = []
+        self._slice_timer.stop()
+        self._start_timer.start()
+
+    def _rebuild(self):
+        states = neighbor_states(self.scale_model.shape, self.scale_model.root_note)
+        # Breadth first: every warmer gets the nearest neighbors before any gets the rest
+        self._queue = [(warm, key, state)
+                       for i, state in enumerate(states)
+                       for warm, limit, key in self._warmers
+                       if limit is None or i < limit]
+        self._queue.reverse()
+        if self._queue:
+            self._slice_timer.start()
+
+    def _run_slice(self):
+        deadline = time.perf_counter() + self.SLICE_BUDGET
+        while self._queue and time.perf_counter() < deadline:
+            warm, key, state = self._queue.pop()
+            done_key = (warm, key(*state) if key else state)
+            if done_key in self._warmed:
+                self._warmed.move_to_end(done_key)
+                continue
+            try:
+                if warm(*state) is False:
+                    continue
+            except Exception as e:
+                print(f"Error prefetching {state}: {e}")
+            self._warmed[done_key] = None
+            if len(self._warmed) > self.MAX_WARMED:
+                self._warmed.popitem(last=False)
+        if not self._queue:
+            self._slice_timer.stop()
@@ -0,0 +1,1094 @@
+"""
+Drawing code for each view, independent of QWidget.
+
+A renderer paints one frame of its view onto any QPainter from a RenderState,
+so the same code serves the widgets' paintEvents and offscreen rendering into
+a QImage (see render_image), which needs no widget tree or QApplication.
+"""
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+from PySide6.QtGui import (QGuiApplication, QImage, QPainter, QPen, QColor, QFont, QRegion,
+                           QPolygonF, QPainterPath, QConicalGradient, QLinearGradient, QBrush, QTransform)
+from PySide6.QtCore import Qt, QLineF, QPointF, QRectF, QRect
+from modules.math import rotate, pitch_set
+from modules.spelling import note_names as spelled_note_names
+from modules.chords import chord_roots
+from models.instrument import note_grid
+from .common import (CYCLIC_MAPS, FONT_SIZE, INACTIVE_OPACITY, SINGLE_MARKERS, DOUBLE_MARKERS,
+                     ACTIVE_EDGE_COLOR, ACTIVE_EDGE_WIDTH, get_cmap)
+from .export import is_vector_painter
+
+BACKGROUND_COLOR = "#121212"
+HIGHLIGHT_COLOR = "#409C40"
+# Levels of playback highlight on views drawn from label sprites
+HIGHLIGHT_STEPS = 8
+
+class RenderState:
+    """
+    Plain description of one frame: the scale, how its notes are spelled and
+    colored, and any in-flight animation. Spelling defaults to the preferred
+    one for the scale; anim_offset defaults to the root (no animation).
+    """
+
+    def __init__(self, shape, root_note, note_names=None, enharmonic_mode=None,
+                 cmap_name=None, anim_offset=None, highlights=None,
+                 static_polygon=False, scale_name="", fingering=None, morph=None):
+        self.shape = shape & 0xFFF
+        self.root_note = root_note % 12
+        self.number = rotate(self.shape, -self.root_note)
+        self.enharmonic_mode = enharmonic_mode
+        self.note_names = note_names if note_names is not None else \
+            spelled_note_names(self.shape, self.root_note, enharmonic_mode)
+        self.cmap_name = cmap_name if cmap_name is not None else (CYCLIC_MAPS[0] if CYCLIC_MAPS else None)
+        self.anim_offset = float(self.root_note) if anim_offset is None else anim_offset
+        # note -> highlight strength in [0, 1]
+        self.highlights = highlights or {}
+        self.static_polygon = static_polygon
+        self.scale_name = scale_name
+        # (string, fret) positions of a fingering pattern to mark on fingerboards
+        self.fingering = fingering or ()
+        # (voice-leading motions, progress 0-1) of a scale morph in flight
+        self.morph = morph
+
+    @classmethod
+    def from_models(cls, scale_model, spelling, cmap_name=None, **kwargs):
+        return cls(scale_model.shape, scale_model.root_note, note_names=spelling.note_names,
+                   enharmonic_mode=spelling.enharmonic_mode, cmap_name=cmap_name, **kwargs)
+
+    @property
+    def cmap(self):
+        return get_cmap(self.cmap_name) if self.cmap_name else None
+
+class NoteRenderer:
+    """Base renderer with the note label styling shared by all views."""
+    use_sprites = True
+
+    def paint(self, painter, state, w, h):
+        raise NotImplementedError
+
+    def color_for_note(self, state, note_val, offset_override=None):
+        cmap = state.cmap
+        if not cmap: return QColor("#333333")
+
+        is_active = (state.number >> note_val) & 1
+        if is_active:
+            # Use override if provided (for smooth color transitions during animation)
+            # otherwise use model state
+            offset = offset_override if offset_override is not None else state.root_note
+
+            relative_val = (note_val - offset) % 12
+            norm_val = relative_val / 12.0
+            r, g, b, a = cmap(norm_val)
+            return QColor.fromRgbF(r, g, b, a)
+        else:
+            return QColor.fromRgbF(0.6, 0.6, 0.6, INACTIVE_OPACITY)
+
+    def highlight_color(self, state, note_val, base_color, target_color, steps=None):
+        val = state.highlights.get(note_val, 0.0)
+        if val <= 0: return base_color
+        if steps:
+            # Few distinct colors, so sprite-cached labels stay cached through the fade
+            val = math.ceil(val * steps) / steps
+
+        r = base_color.red() * (1 - val) + target_color.red() * val
+        g = base_color.green() * (1 - val) + target_color.green() * val
+        b = base_color.blue() * (1 - val) + target_color.blue() * val
+        return QColor(int(r), int(g), int(b))
+
+    def draw_note_label(self, painter, state, center, radius, note_val, is_active, is_root, font_size=10, opacity=1.0, active_pen=None, offset_override=None, inactive_text_opacity=None, inactive_text_color=None):
+        bg_color = self.color_for_note(state, note_val, offset_override=offset_override)
+
+        # Apply opacity to background
+        if opacity < 1.0:
+            bg_color.setAlphaF(bg_color.alphaF() * opacity)
+
+        # Determine outline for standard active notes (non-root)
+        outline_pen = None
+        if is_active and not is_root and active_pen:
+            outline_pen = QPen(active_pen)
+            if opacity < 1.0:
+                c = outline_pen.color()
+                c.setAlphaF(c.alphaF() * opacity)
+                outline_pen.setColor(c)
+
+        # Root Note Styling
+        root_colors = None
+        if is_active and is_root:
+            # Outer White (Thick)
+            white_color = QColor("white")
+            if active_pen:
+                white_color = active_pen.color()
+            white_color.setAlphaF(white_color.alphaF() * opacity)
+
+            # Inner Colored (Thin, Inset)
+            inner_color = QColor("white")
+            cmap = state.cmap
+            if cmap:
+                r, g, b, a = cmap(0.0)
+                inner_color = QColor.fromRgbF(r, g, b, a)
+            inner_color.setAlphaF(inner_color.alphaF() * opacity)
+            root_colors = (white_color, inner_color)
+
+        # Text Color
+        if not is_active and inactive_text_color:
+            text_color = QColor(inactive_text_color)
+        else:
+            text_color = QColor("black") if bg_color.lightness() > 128 else QColor("white")
+        text_opacity = opacity
+        if not is_active:
+            text_opacity *= (inactive_text_opacity if inactive_text_opacity is not None else INACTIVE_OPACITY)
+
+        text_color.setAlphaF(text_color.alphaF() * text_opacity)
+
+        label = (radius, bg_color, outline_pen, root_colors, text_color, font_size, state.note_names[note_val])
+        if self.use_sprites and _can_blit(painter):
+            _label_sprites.draw(painter, center, label)
+        else:
+            _paint_label(painter, center, *label)
+
+def _paint_label(painter, center, radius, bg_color, outline_pen, root_colors, text_color, font_size, text):
+    # Draw Background
+    painter.setBrush(bg_color)
+    painter.setPen(outline_pen if outline_pen is not None else Qt.NoPen)
+    painter.drawEllipse(center, radius, radius)
+
+    if root_colors is not None:
+        white_color, inner_color = root_colors
+        painter.setPen(QPen(white_color, 6))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(center, radius, radius)
+
+        painter.setPen(QPen(inner_color, 3))
+        painter.drawEllipse(center, radius, radius)
+
+    # Draw Text
+    painter.setPen(text_color)
+    painter.setFont(QFont("Arial", font_size, QFont.Bold))
+    rect = QRectF(center.x() - radius, center.y() - radius, radius*2, radius*2)
+    painter.drawText(rect, Qt.AlignCenter, text)
+
+def _can_blit(painter):
+    # Sprites are pixel-aligned, so only use them on raster targets without scaling
+    return not is_vector_painter(painter) and painter.worldTransform().type() in (QTransform.TxNone, QTransform.TxTranslate)
+
+class LabelSpriteCache:
+    """
+    Note labels rendered once into small images and then blitted.
+    A frame only has a handful of distinct labels (one per note and style),
+    and the antialiased circles and text dominate the cost of drawing them.
+    Sprites are keyed on a quarter-pixel offset, so blits match direct drawing.
+    Memory is capped at MAX_BYTES, evicting the least recently drawn sprites
+    first, so labels warmed ahead of time (see views/prefetch.py) never push
+    out the ones on screen. The cache is shared by every thread that renders
+    (see serve.py's RenderPool), so the LRU is only touched under a lock;
+    sprites are rendered outside it.
+    """
+    MAX_BYTES = 24 * 1024 * 1024
+    SUBPIXEL = 4
+    PAD = 5
+
+    def __init__(self):
+        self._sprites = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def _key(self, label, dpr, fx, fy):
+        radius, bg_color, outline_pen, root_colors, text_color, font_size, text = label
+        outline = None if outline_pen is None else (outline_pen.color().rgba(), outline_pen.widthF())
+        roots = None if root_colors is None else (root_colors[0].rgba(), root_colors[1].rgba())
+        return (radius, bg_color.rgba(), outline, roots, text_color.rgba(), font_size, text, dpr, fx, fy)
+
+    def draw(self, painter, center, label):
+        dpr = painter.device().devicePixelRatioF()
+        # Split the device position into whole pixels and a quantized fraction
+        dx, dy = center.x() * dpr, center.y() * dpr
+        ix, iy = math.floor(dx), math.floor(dy)
+        fx = round((dx - ix) * self.SUBPIXEL)
+        fy = round((dy - iy) * self.SUBPIXEL)
+
+        key = self._key(label, dpr, fx, fy)
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+        if sprite is None:
+            sprite = self._render(label, dpr, fx / self.SUBPIXEL, fy / self.SUBPIXEL)
+            with self._lock:
+                # Another thread may have rendered the same sprite meanwhile
+                if key not in self._sprites:
+                    self._sprites[key] = sprite
+                    self._bytes += sprite.sizeInBytes()
+                    while self._bytes > self.MAX_BYTES:
+                        self._bytes -= self._sprites.popitem(last=False)[1].sizeInBytes()
+
+        half = sprite.width() // 2
+        painter.drawImage(QPointF((ix - half) / dpr, (iy - half) / dpr), sprite)
+
+    def _render(self, label, dpr, fx, fy):
+        radius = label[0]
+        half = math.ceil(radius * dpr) + self.PAD
+        sprite = QImage(2 * half + 1, 2 * half + 1, QImage.Format_ARGB32_Premultiplied)
+        sprite.setDevicePixelRatio(dpr)
+        sprite.fill(Qt.transparent)
+
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.Antialiasing)
+        _paint_label(painter, QPointF((half + fx) / dpr, (half + fy) / dpr), *label)
+        painter.end()
+        return sprite
+
+_label_sprites = LabelSpriteCache()
+
+class FingerboardRenderer(NoteRenderer):
+    MARGIN_X = 60
+    MARGIN_TOP = 30
+    MARGIN_BOTTOM = 50
+    LABEL_RADIUS = 11
+    # Half-width of the square around a label covering its outline and fingering halo
+    LABEL_EXTENT = LABEL_RADIUS + 8
+
+    def __init__(self, tuning=None, num_frets=24, capo=0, string_frets=None):
+        self._geometry_key = None
+        self._geometry = None
+        self._note_xs = None
+        self.set_instrument(tuning if tuning else [4, 9, 2, 7, 11, 4], num_frets, capo, string_frets)
+
+    def set_instrument(self, tuning, num_frets, capo=0, string_frets=None, grid=None):
+        """Pass grid to share an InstrumentModel's cached note grid instead of building one."""
+        tuning = tuple(tuning)
+        string_frets = tuple(string_frets) if string_frets else None
+        instrument = (tuning, num_frets, capo, string_frets)
+        if instrument != getattr(self, '_instrument', None):
+            self._instrument = instrument
+            self.num_frets = num_frets
+            self.num_strings = len(tuning)
+            self.capo = capo
+            self.note_grid = grid if grid is not None else note_grid(tuning, num_frets, capo, string_frets)
+
+    def get_geometry(self, w, h):
+        # Geometry only depends on the size and the string/fret counts,
+        # so it is rebuilt on resize or when the instrument changes shape.
+        key = (w, h, self.num_frets, self.num_strings)
+        if key != self._geometry_key:
+            n = np.arange(self.num_frets + 1)
+            scale_length = (w - 2 * self.MARGIN_X) / 0.75
+            fret_xs = (scale_length * (1 - 2**(-n/12))) + self.MARGIN_X
+
+            if self.num_strings == 1:
+                string_ys = np.array([h / 2])
+            else:
+                string_ys = np.linspace(h - self.MARGIN_BOTTOM, self.MARGIN_TOP, self.num_strings)
+
+            self._note_xs = np.array([
+                self.get_note_center(f_idx, x, fret_xs[f_idx - 1] if f_idx > 0 else 0)
+                for f_idx, x in enumerate(fret_xs)
+            ])
+            self._geometry = (fret_xs, string_ys)
+            self._geometry_key = key
+        return self._geometry
+
+    def get_note_xs(self, w, h):
+        """Return the cached x coordinate of the note label for each fret."""
+        self.get_geometry(w, h)
+        return self._note_xs
+
+    def get_note_center(self, f_idx, x, prev_x):
+        raise NotImplementedError
+
+    def positions_region(self, w, h, positions):
+        """Region covering the labels at the given (string, fret) positions."""
+        fret_xs, string_ys = self.get_geometry(w, h)
+        e = self.LABEL_EXTENT
+        region = QRegion()
+        for s_idx, f_idx in positions:
+            x, y = self._note_xs[f_idx], string_ys[s_idx]
+            region += QRect(int(x - e), int(y - e), 2 * e + 1, 2 * e + 1)
+        return region
+
+    def _visible_labels(self, painter, note_xs, string_ys):
+        """(strings, frets) mask of labels inside the painter's clip, or None when unclipped."""
+        if not painter.hasClipping():
+            return None
+        rects = np.array([(r.left(), r.top(), r.right(), r.bottom()) for r in painter.clipRegion()], dtype=float)
+        if not len(rects):
+            return np.zeros((len(string_ys), len(note_xs)), dtype=bool)
+        e = self.LABEL_EXTENT
+        in_x = (note_xs[None, :] + e >= rects[:, 0:1]) & (note_xs[None, :] - e <= rects[:, 2:3])
+        in_y = (string_ys[None, :] + e >= rects[:, 1:2]) & (string_ys[None, :] - e <= rects[:, 3:4])
+        return (in_y[:, :, None] & in_x[:, None, :]).any(axis=0)
+
+    def draw_markers(self, painter, fret_xs, marker_y):
+        pass
+
+    def get_fret_line_pen(self):
+        return QPen(QColor("#AAAAAA"), 2)
+
+    def paint(self, painter, state, w, h):
+        painter.setRenderHint(QPainter.Antialiasing)
+        fret_xs, string_ys = self.get_geometry(w, h)
+        note_xs = self._note_xs
+
+        # Grid
+        painter.setPen(QPen(QColor("#555555"), 4))
+        for y in string_ys: painter.drawLine(QLineF(self.MARGIN_X, y, w - self.MARGIN_X, y))
+
+        painter.setPen(self.get_fret_line_pen())
+        fret_bot_y = h - self.MARGIN_BOTTOM
+        for x in fret_xs: painter.drawLine(QLineF(x, self.MARGIN_TOP, x, fret_bot_y))
+
+        # Nut
+        if len(fret_xs) > 0:
+            painter.setPen(QPen(QColor("#FFFFFF"), 5))
+            painter.drawLine(QLineF(fret_xs[0], self.MARGIN_TOP, fret_xs[0], fret_bot_y))
+
+        # Markers
+        marker_y = h - (self.MARGIN_BOTTOM / 2)
+        self.draw_markers(painter, fret_xs, marker_y)
+
+        if 0 < self.capo < len(fret_xs):
+            # The capo acts as a new nut just below the first playable fret
+            capo_x = fret_xs[self.capo - 1]
+            painter.setPen(QPen(QColor("#888888"), 12, Qt.SolidLine, Qt.RoundCap))
+            painter.drawLine(QLineF(capo_x, self.MARGIN_TOP - 8, capo_x, fret_bot_y + 8))
+
+        # Notes
+        grid = self.note_grid
+        radius = self.LABEL_RADIUS
+        visible = self._visible_labels(painter, note_xs, string_ys)
+
+        if state.fingering:
+            self.draw_fingering(painter, state.fingering, note_xs, string_ys, radius)
+
+        for s_idx, y in enumerate(string_ys):
+            for f_idx, text_x in enumerate(note_xs):
+                note_val = int(grid[s_idx, f_idx])
+                if note_val < 0 or (visible is not None and not visible[s_idx, f_idx]):
+                    continue
+
+                is_active = (state.number >> note_val) & 1
+                is_root = (note_val == state.root_note)
+                base_pen = QColor("white") if is_root else QColor("#929292")
+                pen_color = self.highlight_color(state, note_val, base_pen, QColor(HIGHLIGHT_COLOR), HIGHLIGHT_STEPS)
+                active_pen = QPen(pen_color, 3 if pen_color != base_pen else 2)
+
+                self.draw_note_label(painter, state, QPointF(text_x, y), radius, note_val, is_active, is_root,
+                                     font_size=FONT_SIZE, active_pen=active_pen)
+
+    def draw_fingering(self, painter, positions, note_xs, string_ys, radius):
+        halo = QColor(HIGHLIGHT_COLOR)
+        halo.setAlphaF(0.6)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(halo)
+        for s_idx, f_idx in positions:
+            if s_idx < len(string_ys) and f_idx < len(note_xs):
+                painter.drawEllipse(QPointF(note_xs[f_idx], string_ys[s_idx]), radius + 5, radius + 5)
+
+class FretboardRenderer(FingerboardRenderer):
+    def get_note_center(self, f_idx, x, prev_x):
+        if f_idx == 0: return x - 30
+        return (prev_x + x) / 2
+
+    def draw_markers(self, painter, fret_xs, marker_y):
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#FFFFFF"))
+        def get_cx(f): return (fret_xs[f-1]+fret_xs[f])/2 if f <= self.num_frets else None
+
+        for f in SINGLE_MARKERS:
+            cx = get_cx(f)
+            if cx: painter.drawEllipse(QPointF(cx, marker_y), 3, 3)
+        for f in DOUBLE_MARKERS:
+            cx = get_cx(f)
+            if cx:
+                painter.drawEllipse(QPointF(cx-6, marker_y), 3, 3)
+                painter.drawEllipse(QPointF(cx+6, marker_y), 3, 3)
+
+class FretlessRenderer(FingerboardRenderer):
+    def get_note_center(self, f_idx, x, prev_x):
+        return x
+
+    def get_fret_line_pen(self):
+        c = QColor("#AAAAAA")
+        c.setAlphaF(0.2)
+        return QPen(c, 1)
+
+# Index of the white key at (or to the left of) each pitch class within an octave.
+# Black keys are centered on the right edge of that white key.
+WHITE_ORDINALS = np.array([0, 0, 1, 1, 2, 3, 3, 4, 4, 5, 5, 6])
+IS_BLACK = np.array([False, True, False, True, False, False, True, False, True, False, True, False])
+
+class KeyboardLayout:
+    """Key rectangles for one (width, height, key range), with O(1) lookups."""
+
+    def __init__(self, w, h, first_key, num_keys):
+        keys = np.arange(first_key, first_key + num_keys)
+        pcs = keys % 12
+        ordinals = (keys // 12) * 7 + WHITE_ORDINALS[pcs]
+        is_black = IS_BLACK[pcs]
+
+        # A range starting on a black key begins at its right-hand white key
+        origin = ordinals[0] + (1 if is_black[0] else 0)
+        num_white = int(np.count_nonzero(~is_black))
+
+        self.width = w
+        self.height = h
+        self.key_w = w / max(num_white, 1)
+        self.black_key_w = self.key_w * 0.6
+        self.black_key_h = h * 0.6
+        self.white_key_h = h - 20
+
+        self.pcs = pcs
+        self.rects = []
+        self.white_keys = []
+        self.black_keys = []
+        # Key index for each white slot, and for each black key boundary (-1 = none)
+        self.white_at_slot = np.full(num_white, -1)
+        self.black_at_boundary = np.full(num_white + 1, -1)
+        self.pc_keys = [[] for _ in range(12)]
+
+        for k in range(num_keys):
+            slot = int(ordinals[k] - origin)
+            if is_black[k]:
+                boundary = slot + 1
+                x = boundary * self.key_w - self.black_key_w / 2
+                rect = QRectF(x, 0, self.black_key_w, self.black_key_h)
+                self.black_at_boundary[boundary] = k
+                self.black_keys.append(k)
+            else:
+                rect = QRectF(slot * self.key_w, 0, self.key_w, self.white_key_h)
+                self.white_at_slot[slot] = k
+                self.white_keys.append(k)
+            self.rects.append(rect)
+            self.pc_keys[int(pcs[k])].append(k)
+
+    def key_at(self, x, y):
+        """Return the index of the key under (x, y), or None."""
+        if x < 0 or x >= self.width or y < 0 or y >= self.white_key_h:
+            return None
+
+        # Black keys sit on top, so check the nearest boundary first
+        if y < self.black_key_h:
+            boundary = int(round(x / self.key_w))
+            if abs(x - boundary * self.key_w) < self.black_key_w / 2 and 0 <= boundary < len(self.black_at_boundary):
+                k = self.black_at_boundary[boundary]
+                if k >= 0:
+                    return int(k)
+
+        slot = min(int(x / self.key_w), len(self.white_at_slot) - 1)
+        k = self.white_at_slot[slot]
+        return int(k) if k >= 0 else None
+
+class PianoRenderer(NoteRenderer):
+    LABEL_RADIUS = 11
+
+    def __init__(self, first_key=0, num_keys=36):
+        self.first_key = first_key
+        self.num_keys = num_keys
+        self._layout = None
+        self._layout_key = None
+        self._background = None
+        self._background_dpr = None
+
+    def set_key_range(self, first_key, num_keys):
+        self.first_key = first_key
+        self.num_keys = num_keys
+
+    def get_layout(self, w, h):
+        key = (w, h, self.first_key, self.num_keys)
+        if key != self._layout_key:
+            self._layout = KeyboardLayout(*key)
+            self._layout_key = key
+            self._background = None
+        return self._layout
+
+    def _get_background(self, layout, dpr):
+        # The keys themselves never change with the scale, so render them once per layout
+        if self._background is None or self._background_dpr != dpr:
+            # A QImage rather than a QPixmap, so renderers also work off the GUI thread
+            image = QImage(int(layout.width * dpr), int(layout.height * dpr), QImage.Format_ARGB32_Premultiplied)
+            image.setDevicePixelRatio(dpr)
+            image.fill(Qt.transparent)
+
+            painter = QPainter(image)
+            self._draw_keys(painter, layout)
+            painter.end()
+            self._background = image
+            self._background_dpr = dpr
+        return self._background
+
+    def _draw_keys(self, painter, layout):
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor("black"), 1))
+
+        painter.setBrush(QColor("white"))
+        for k in layout.white_keys:
+            painter.drawRect(layout.rects[k])
+
+        painter.setBrush(QColor("black"))
+        for k in layout.black_keys:
+            painter.drawRect(layout.rects[k])
+
+    def paint(self, painter, state, w, h):
+        layout = self.get_layout(w, h)
+
+        if is_vector_painter(painter):
+            # Keep SVG/PDF exports fully vector
+            self._draw_keys(painter, layout)
+        else:
+            painter.drawImage(0, 0, self._get_background(layout, painter.device().devicePixelRatioF()))
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Draw Labels (White then Black to ensure visibility)
+        clip = painter.clipRegion() if painter.hasClipping() else None
+        for k in layout.white_keys + layout.black_keys:
+            if clip is None or clip.intersects(self.label_rect(layout.rects[k])):
+                self._draw_label(painter, state, layout.rects[k], int(layout.pcs[k]))
+
+    def label_center(self, key_rect):
+        return QPointF(key_rect.center().x(), key_rect.bottom() - self.LABEL_RADIUS - 8)
+
+    def label_rect(self, key_rect):
+        """Integer rect around a key's label, including its outline."""
+        c = self.label_center(key_rect)
+        e = self.LABEL_RADIUS + 3
+        return QRect(int(c.x() - e), int(c.y() - e), 2 * e + 1, 2 * e + 1)
+
+    def note_region(self, w, h, note_val):
+        """Region covering the labels of every key of a pitch class."""
+        layout = self.get_layout(w, h)
+        region = QRegion()
+        for k in layout.pc_keys[note_val % 12]:
+            region += self.label_rect(layout.rects[k])
+        return region
+
+    def _draw_label(self, painter, state, key_rect, note_val):
+        radius = self.LABEL_RADIUS
+
+        is_active = (state.number >> note_val) & 1
+        is_root = (note_val == state.root_note)
+        base_pen = QColor("white") if is_root else QColor("#929292")
+        pen_color = self.highlight_color(state, note_val, base_pen, QColor(HIGHLIGHT_COLOR), HIGHLIGHT_STEPS)
+        active_pen = QPen(pen_color, 3 if pen_color != base_pen else 2)
+
+        self.draw_note_label(painter, state, self.label_center(key_rect), radius, note_val, is_active, is_root,
+                             font_size=FONT_SIZE, active_pen=active_pen)
+
+class ScaleSelectorRenderer(NoteRenderer):
+    MARGIN = 5
+
+    def paint(self, painter, state, w, h):
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        num_cells = 12
+        margin = self.MARGIN
+        available_w = w - (2 * margin)
+        cell_w = available_w / num_cells
+
+        painter.setFont(QFont("Arial", 10, QFont.Bold))
+
+        # We want to render cells based on the animated offset.
+        # If offset increases (e.g. 0 -> 1), the "start" index moves up.
+        # This effectively shifts notes to the Left.
+        # If offset decreases (e.g. 0 -> 11), notes shift Right.
+
+        # To handle smooth wrapping, we render from k = -1 to 13
+        # and calculate position relative to the floating offset.
+
+        anim_offset = state.anim_offset
+        start_k = int(np.floor(anim_offset)) - 1
+        end_k = int(np.ceil(anim_offset + 12)) + 1
+        radius = min(cell_w, h) / 2 - 4
+
+        for k in range(start_k, end_k):
+            # Calculate Screen X
+            # Position 0 is at (0 - offset) * width
+            pos_index = k - anim_offset
+
+            # Skip if clearly offscreen
+            if pos_index < -1 or pos_index > 12:
+                continue
+
+            cx = margin + (pos_index * cell_w) + (cell_w / 2)
+            cy = h / 2
+
+            # Determine Note
+            note_val = k % 12
+
+            is_active = (state.number >> note_val) & 1
+            is_root = (note_val == state.root_note)
+
+            active_pen = None
+            # While morphing, the outlines travel separately (below)
+            if is_active and (is_root or not state.morph):
+                base_pen = QColor("white") if is_root else QColor("#929292")
+                pen_color = self.highlight_color(state, note_val, base_pen, QColor(HIGHLIGHT_COLOR))
+                active_pen = QPen(pen_color, 4)
+
+            self.draw_note_label(painter, state, QPointF(cx, cy), radius, note_val, is_active, is_root,
+                                 font_size=10, active_pen=active_pen, offset_override=anim_offset)
+
+        if state.morph:
+            self._draw_morph_outlines(painter, state, margin, cell_w, radius, h / 2)
+
+    def _draw_morph_outlines(self, painter, state, margin, cell_w, radius, cy):
+        """Outline each voice partway along its motion, wrapping round the ends of the ribbon."""
+        motions, progress = state.morph
+        painter.setPen(QPen(QColor("#929292"), 4))
+        painter.setBrush(Qt.NoBrush)
+        for m in motions:
+            pos_index = (m.source + progress * m.delta - state.anim_offset) % 12
+            for x in (pos_index - 12, pos_index, pos_index + 12):
+                if -1 <= x <= 12:
+                    painter.drawEllipse(QPointF(margin + (x + 0.5) * cell_w, cy), radius, radius)
+
+class PolygonRenderer(NoteRenderer):
+    def _annulus_color(self, state, s):
+        """Color at fraction s of the way counter-clockwise round the annulus from the top."""
+        t = (1.0 - s) % 1.0
+
+        angle_deg = t * 360.0
+
+        note_pos = state.anim_offset + (angle_deg / 30.0)
+        idx_low = int(math.floor(note_pos)) % 12
+        idx_high = (idx_low + 1) % 12
+        ratio = note_pos - math.floor(note_pos)
+
+        active_low = 1.0 if (state.number >> idx_low) & 1 else 0.0
+        active_high = 1.0 if (state.number >> idx_high) & 1 else 0.0
+        opacity = ((1.0 - ratio) * active_low + ratio * active_high) ** 2.0
+
+        rgba = state.cmap(t)
+        return QColor.fromRgbF(rgba[0], rgba[1], rgba[2], (rgba[3] if len(rgba) > 3 else 1.0) * opacity)
+
+    def _draw_annulus_wedges(self, painter, state, cx, cy, r_in, r_out, steps=180):
+        outer = QRectF(cx - r_out, cy - r_out, 2 * r_out, 2 * r_out)
+        inner = QRectF(cx - r_in, cy - r_in, 2 * r_in, 2 * r_in)
+        sweep = 360.0 / steps
+        for i in range(steps):
+            start = 90 + i * sweep
+            wedge = QPainterPath()
+            wedge.arcMoveTo(outer, start)
+            wedge.arcTo(outer, start, sweep)
+            wedge.arcTo(inner, start + sweep, -sweep)
+            wedge.closeSubpath()
+            painter.fillPath(wedge, self._annulus_color(state, (i + 0.5) / steps))
+
+    def paint(self, painter, state, w, h):
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        cx, cy = w / 2, h / 2
+        radius = min(w, h) / 2 - 40
+
+        painter.setFont(QFont("Arial", 10, QFont.Bold))
+
+        # Draw Annulus
+        if state.cmap:
+            annulus_width = 40
+            half_width = annulus_width / 2
+            r_in = radius - half_width
+            r_out = radius + half_width
+
+            path = QPainterPath()
+            path.addEllipse(QPointF(cx, cy), r_out, r_out)
+            path.addEllipse(QPointF(cx, cy), r_in, r_in)
+            path.setFillRule(Qt.OddEvenFill)
+
+            painter.setPen(Qt.NoPen)
+            if is_vector_painter(painter):
+                # SVG has no conical gradients, so export the annulus as thin wedges
+                self._draw_annulus_wedges(painter, state, cx, cy, r_in, r_out)
+            else:
+                gradient = QConicalGradient(QPointF(cx, cy), 90)
+
+                steps = 360
+
+                for i in range(steps + 1):
+                    s = i / steps
+                    gradient.setColorAt(s, self._annulus_color(state, s))
+
+                painter.setBrush(gradient)
+                painter.drawPath(path)
+
+        # Calculate positions
+        offset = state.anim_offset
+        note_positions = {}
+
+        for i in range(12):
+            # -90 degrees is top.
+            # We want note 'offset' at top.
+            # So angle for note i is -90 + (i - offset) * 30
+            angle_deg = -90 + (i - offset) * 30
+            angle_rad = math.radians(angle_deg)
+
+            nx = cx + radius * math.cos(angle_rad)
+            ny = cy + radius * math.sin(angle_rad)
+            p = QPointF(nx, ny)
+            note_positions[i] = p
+
+        # Calculate polygon points
+        # Use target offset for static polygon (Transpose), anim offset otherwise (Rotate)
+        poly_offset = state.root_note if state.static_polygon else offset
+        active_points = []
+
+        # While morphing, the vertices move along the voice leading
+        if state.morph:
+            motions, progress = state.morph
+            vertices = [m.source + progress * m.delta for m in motions]
+        else:
+            vertices = pitch_set(state.number)
+
+        for i in vertices:
+            angle_deg = -90 + (i - poly_offset) * 30
+            angle_rad = math.radians(angle_deg)
+            px = cx + radius * math.cos(angle_rad)
+            py = cy + radius * math.sin(angle_rad)
+            active_points.append(QPointF(px, py))
+
+        # Draw polygon connecting active notes
+        if len(active_points) > 1:
+            painter.setPen(QPen(QColor(ACTIVE_EDGE_COLOR), ACTIVE_EDGE_WIDTH))
+            painter.setBrush(QColor(255, 255, 255, 30))
+            painter.drawPolygon(QPolygonF(active_points))
+
+        # Draw notes
+        note_radius = 15
+        for i in range(12):
+            pos = note_positions[i]
+            is_active = (state.number >> i) & 1
+            is_root = (i == state.root_note)
+
+            active_pen = None
+            if is_active:
+                base_pen = QColor("white")
+                pen_color = self.highlight_color(state, i, base_pen, QColor(HIGHLIGHT_COLOR))
+                active_pen = QPen(pen_color, 2)
+
+            self.draw_note_label(painter, state, pos, note_radius, i, is_active, is_root,
+                                 font_size=10, active_pen=active_pen, offset_override=offset)
+
+        # Draw Scale Name in Center
+        if state.scale_name:
+            painter.setPen(QColor("#CCCCCC"))
+            painter.setFont(QFont("Arial", 16, QFont.Bold))
+            painter.drawText(QRectF(0, 0, w, h), Qt.AlignCenter, state.scale_name)
+
+class TonnetzRenderer(NoteRenderer):
+    # Fixed 7x7 Grid (Core)
+    CORE_COLS = 7
+    CORE_ROWS = 7
+
+    def __init__(self):
+        self.node_radius = 20
+        self.spacing = 70
+        # (c, r) -> (x, y, note) from the last paint, for hit testing
+        self.grid_points = {}
+
+    def paint(self, painter, state, w, h):
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        core_cols = self.CORE_COLS
+        core_rows = self.CORE_ROWS
+
+        # Calculate bounds in unit space (spacing = 1)
+        # x = c - 0.5 * r
+        # y = r * sqrt(3) / 2
+
+        # X range: [-4.5, 7.5] -> Width = 12
+        # Y range: [-0.5*sqrt(3), 3.5*sqrt(3)] -> Height = 4*sqrt(3)
+
+        unit_w = 12.0
+        unit_h = 4.0 * math.sqrt(3)
+
+        # Padding
+        padding = 40
+        avail_w = w - 2 * padding
+        avail_h = h - 2 * padding
+
+        if avail_w <= 0 or avail_h <= 0:
+            return
+
+        scale_x = avail_w / unit_w
+        scale_y = avail_h / unit_h
+
+        self.spacing = min(scale_x, scale_y)
+        self.node_radius = min(20, self.spacing * 0.35)
+
+        cx = w / 2
+        cy = h / 2
+
+        # Center of the grid in unit space
+        unit_cx = 1.5
+        unit_cy = 1.5 * math.sqrt(3)
+
+        def to_screen(c, r):
+            ux = c - 0.5 * r
+            uy = r * math.sqrt(3) / 2
+            x = cx + (ux - unit_cx) * self.spacing
+            y = cy - (uy - unit_cy) * self.spacing
+            return x, y
+
+        grid_points = {}
+        for r in range(-1, core_rows + 1):
+            for c in range(-1, core_cols + 1):
+                x, y = to_screen(c, r)
+                # Value calculation: +7 per column (c), +9 per row (r)
+                val = (state.root_note + c * 7 + r * 9 + 4) % 12
+
+                grid_points[(c, r)] = (x, y, val)
+
+        cmap = state.cmap
+
+        def draw_triads(mask, offsets, color_idx):
+            if not (mask and cmap): return
+
+            r, g, b, a = cmap(color_idx / 12.0)
+            base_color = QColor.fromRgbF(r, g, b, a)
+            triad_color = QColor(base_color)
+            triad_color.setAlphaF(triad_color.alphaF() * 0.6)
+
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(triad_color)
+
+            for (c, r), (x, y, val) in grid_points.items():
+                if not ((mask >> val) & 1):
+                    continue
+
+                points = []
+                valid = True
+                for dc, dr in offsets:
+                    nk = (c + dc, r + dr)
+                    if nk not in grid_points:
+                        valid = False
+                        break
+                    nx, ny, _ = grid_points[nk]
+                    points.append(QPointF(nx, ny))
+
+                if valid:
+                    painter.drawPolygon(QPolygonF(points))
+
+        mask = state.number
+
+        # Major Triads (Color 5): Node (Root), Up-Right (M3, +4), Right (5th, +7)
+        major_mask = chord_roots(mask, "major")
+        draw_triads(major_mask, [(0,0), (1,1), (1,0)], 5)
+
+        # Minor Triads (Color 10): Node (m3), Up (Root, -3), Up-Right (5th, +4)
+        minor_mask = rotate(chord_roots(mask, "minor"), -3)
+        # Neighbors: (0,0), (0,1), (1,1)
+        draw_triads(minor_mask, [(0,0), (0,1), (1,1)], 10)
+
+        # Draw Edges
+        # We draw "forward" edges to avoid duplicates and cover the requested neighbors:
+        # (-1,0), (1,0), (0,1), (1,1), (-1,1), (0,-1)
+        # Forward edges to draw from (c,r): (1,0), (0,1), (1,1), (-1,1)
+        default_pen = QPen(QColor("#333333"), 2)
+        active_pen = QPen(QColor(ACTIVE_EDGE_COLOR), ACTIVE_EDGE_WIDTH)
+
+        for (c, r), (x, y, val) in grid_points.items():
+            neighbors = [
+                (c + 1, r),     # (1, 0)
+                (c, r + 1),     # (0, 1)
+                (c + 1, r + 1), # (1, 1)
+            ]
+
+            is_active_source = (mask >> val) & 1
+
+            for nc, nr in neighbors:
+                if (nc, nr) in grid_points:
+                    nx, ny, nval = grid_points[(nc, nr)]
+                    is_active_target = (mask >> nval) & 1
+
+                    pen = QPen(active_pen if (is_active_source and is_active_target) else default_pen)
+
+                    painter.setPen(pen)
+
+                    # Calculate vector for clipping
+                    dx = nx - x
+                    dy = ny - y
+                    dist = math.hypot(dx, dy)
+
+                    if dist > 0:
+                        ux = dx / dist
+                        uy = dy / dist
+
+                        # Clip lines to edge of label radius
+                        p1 = QPointF(x + ux * self.node_radius, y + uy * self.node_radius)
+                        p2 = QPointF(nx - ux * self.node_radius, ny - uy * self.node_radius)
+                        painter.drawLine(p1, p2)
+
+        # Draw Nodes
+        font_size = max(8, int(self.node_radius * 0.8))
+        painter.setFont(QFont("Arial", font_size, QFont.Bold))
+
+        for (c, r), (x, y, val) in grid_points.items():
+            is_active = (mask >> val) & 1
+            is_root = (val == state.root_note)
+
+            node_pen = None
+            if is_active:
+                base_pen = QColor("white")
+                pen_color = self.highlight_color(state, val, base_pen, QColor(HIGHLIGHT_COLOR))
+                node_pen = QPen(pen_color, 3)
+
+            self.draw_note_label(painter, state, QPointF(x, y), self.node_radius, val, is_active, is_root,
+                                 font_size=font_size, opacity=1.0, active_pen=node_pen, inactive_text_opacity=0.7, inactive_text_color="white")
+
+        self.grid_points = grid_points
+
+        bg_r, bg_g, bg_b = 18, 18, 18
+        bg_color = QColor(bg_r, bg_g, bg_b, 255)
+        bg_transparent = QColor(bg_r, bg_g, bg_b, 0)
+
+        def draw_fade(p1, p2):
+            # 1) Direction p2 -> p1
+            diff = p1 - p2
+            length = math.hypot(diff.x(), diff.y())
+            if length == 0: return
+            uw = diff / length
+            uh = QPointF(uw.y(), -uw.x())
+            m = (p1 + p2) / 2
+            rect_w = max(w, h)
+            rect_h = 2*self.spacing
+
+            v1 = m + uw * (rect_w / 2)
+            v2 = m - uw * (rect_w / 2)
+            v3 = v2 + uh * rect_h
+            v4 = v1 + uh * rect_h
+
+            poly = QPolygonF([v1, v2, v3, v4])
+
+            grad = QLinearGradient(m, m + uh * rect_h)
+            grad.setColorAt(0, bg_transparent)
+            grad.setColorAt(0.4, bg_color)
+
+            painter.setBrush(QBrush(grad))
+            painter.setPen(Qt.NoPen)
+            painter.drawPolygon(poly)
+
+
+        pt = lambda c, r: QPointF(*to_screen(c, r))
+
+        p_ll = pt(0, 0)
+        p_lr = pt(core_cols - 1, 0)
+        p_ur = pt(core_cols - 1, core_rows - 1)
+        p_ul = pt(0, core_rows - 1)
+
+        edges = [
+            (p_ll, p_lr),
+            (p_lr, p_ur),
+            (p_ur, p_ul),
+            (p_ul, p_ll)
+        ]
+
+        for p1, p2 in edges:
+            draw_fade(p1, p2)
+
+class KeySignatureRenderer(NoteRenderer):
+    def paint(self, painter, state, w, h):
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Draw Staff Lines
+        line_spacing = 9
+        # 5 lines, 4 spaces. Height = 4 * 9 = 36.
+        start_y = (h - 36) / 2
+
+        painter.setPen(QPen(QColor("#555555"), 1))
+        for i in range(5):
+            y = start_y + i * line_spacing
+            painter.drawLine(QLineF(0, y, w, y))
+
+        # Draw Clef
+        painter.setPen(QColor("#999999"))
+        painter.setFont(QFont("Times New Roman", 36))
+        painter.drawText(QRectF(0, 0, 40, h), Qt.AlignCenter, "𝄞")
+
+        # Collect accidentals from active notes
+        accs = []
+        names = state.note_names
+
+        for i in pitch_set(state.number):
+            n = names[i]
+            if len(n) > 1:
+                letter = n[0]
+                symbol = n[1]
+                if symbol in ['♯', '♭', '𝄪', '♮']:
+                    accs.append((letter, symbol))
+
+        # Sort based on accidental mode
+        if state.enharmonic_mode == 'flat':
+            # Circle of Fifths order for flats: B E A D G C F
+            order = "BEADGCF"
+            accs.sort(key=lambda x: order.index(x[0]) if x[0] in order else 99)
+        else:
+            # Circle of Fifths order for sharps: F C G D A E B
+            order = "FCGDAEB"
+            accs.sort(key=lambda x: order.index(x[0]) if x[0] in order else 99)
+
+        # Draw Accidentals
+        painter.setPen(QColor("#CCCCCC"))
+        painter.setFont(QFont("Arial", 22))
+
+        # Y-offsets from top line (F5) in half-steps (4.5px)
+        # Positive is down
+        sharp_map = {'F': 0, 'C': 3, 'G': -1, 'D': 2, 'A': 5, 'E': 1, 'B': 4}
+        flat_map  = {'B': 4, 'E': 1, 'A': 5, 'D': 2, 'G': 6, 'C': 3, 'F': 7}
+
+        start_x = 50
+        spacing_x = 15
+
+        for i, (letter, symbol) in enumerate(accs):
+            # Determine Y position
+            if symbol == '♭':
+                y_off = flat_map.get(letter, 0)
+            elif symbol == '♯':
+                y_off = sharp_map.get(letter, 0)
+            else:
+                # Fallback for natural/double-sharp: use sharp map usually
+                y_off = sharp_map.get(letter, 0)
+
+            y = start_y + (y_off * 4.5)
+            x = start_x + (i * spacing_x)
+
+            rect = QRectF(x, y - 15, 20, 30)
+            painter.drawText(rect, Qt.AlignCenter, symbol)
+
+RENDERERS = {
+    "fretboard": FretboardRenderer,
+    "fretless": FretlessRenderer,
+    "piano": PianoRenderer,
+    "tonnetz": TonnetzRenderer,
+    "polygon": PolygonRenderer,
+    "scale_selector": ScaleSelectorRenderer,
+    "key_signature": KeySignatureRenderer,
+}
+
+def create_renderer(name, **kwargs):
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown view: {name}")
+    return RENDERERS[name](**kwargs)
+
+def ensure_gui_app():
+    """Text rendering needs a QGuiApplication; create a bare one if nothing else has."""
+    app = QGuiApplication.instance()
+    if app is None:
+        app = QGuiApplication(["siren"])
+    return app
+
+def render_image(renderer, state, w, h, image=None, background=BACKGROUND_COLOR):
+    """
+    Paint one frame into a QImage of w x h pixels. Pass the previous frame's
+    image to reuse its buffer when rendering many frames of the same size.
+    """
+    ensure_gui_app()
+    if image is None or image.width() != w or image.height() != h:
+        image = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(background))
+
+    painter = QPainter(image)
+    renderer.paint(painter, state, w, h)
+    painter.end()
+    return image
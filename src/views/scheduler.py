@@ -0,0 +1,46 @@
+from PySide6.QtCore import QObject, QTimer
+
+class RepaintScheduler(QObject):
+    """
+    Coalesces invalidations into at most one flush per frame.
+    Widgets marked dirty are repainted on the next flush only if visible;
+    hidden widgets (e.g. inactive pages of a QStackedWidget) are dropped,
+    since Qt paints them afresh when they are shown again.
+    """
+    FRAME_INTERVAL = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Dicts used as ordered sets
+        self._dirty_widgets = {}
+        self._callbacks = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    def invalidate(self, widget):
+        self._dirty_widgets[widget] = None
+        self._schedule()
+
+    def call_later(self, callback):
+        """Run callback once on the next flush, however often it is requested."""
+        self._callbacks[callback] = None
+        self._schedule()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+
+        callbacks, self._callbacks = self._callbacks, {}
+        for callback in callbacks:
+            callback()
+
+        widgets, self._dirty_widgets = self._dirty_widgets, {}
+        for widget in widgets:
+            if widget.isVisible():
+                widget.update()
@@ -0,0 +1,14 @@
+import os
+import sys
+import pytest
+
+# The app imports its packages relative to src/, as when run from there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Created up front: once ensure_gui_app() has made a bare QGuiApplication,
+# widgets can no longer be built in the same process
+@pytest.fixture(scope="session", autouse=True)
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
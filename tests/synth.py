@@ -0,0 +1,49 @@
+"""Synthetic WAV files for the audio analysis tests."""
+import struct
+import numpy as np
+
+SAMPLE_RATE = 22050
+C_MAJOR = 2741
+
+def tone(midi, seconds, sample_rate=SAMPLE_RATE):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    f = 440 * 2 ** ((midi - 69) / 12)
+    x = sum(0.6 ** h * np.sin(2 * np.pi * f * (h + 1) * t) for h in range(4))
+    return x * np.minimum(1, t * 50) * np.exp(-t * 2)
+
+def melody(root=0, degrees=(0, 2, 4, 5, 7, 9, 11, 12), seconds=4.0, sample_rate=SAMPLE_RATE):
+    """The scale played upward over and over, ending each run on the octave, in [-0.5, 0.5]."""
+    notes = [tone(48 + root + degrees[i % len(degrees)], 0.25, sample_rate) for i in range(int(seconds * 4))]
+    x = np.concatenate(notes)
+    return 0.5 * x / np.abs(x).max()
+
+def _fmt_chunk(audio_format, channels, sample_rate, bits, extensible=False):
+    block_align = channels * bits // 8
+    body = struct.pack("<HHIIHH", 0xFFFE if extensible else audio_format, channels, sample_rate,
+                       sample_rate * block_align, block_align, bits)
+    if extensible:
+        # cbSize, valid bits, channel mask, then the sub-format GUID
+        guid = struct.pack("<H", audio_format) + b"\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+        body += struct.pack("<HHI", 22, bits, 0) + guid
+    return b"fmt " + struct.pack("<I", len(body)) + body
+
+def write_wav(path, x, bits=16, channels=1, floating=False, extensible=False, sample_rate=SAMPLE_RATE):
+    """Write mono signal x as a RIFF/WAVE file, duplicated across channels."""
+    data = np.repeat(np.asarray(x, dtype=np.float64)[:, None], channels, axis=1).reshape(-1)
+    if floating:
+        raw = data.astype("<f4" if bits == 32 else "<f8").tobytes()
+    elif bits == 8:
+        raw = np.clip(data * 128 + 128, 0, 255).astype(np.uint8).tobytes()
+    elif bits == 24:
+        v = (data * (2 ** 23 - 1)).astype("<i4")
+        raw = v.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        raw = (data * (2 ** (bits - 1) - 1)).astype("<i2" if bits == 16 else "<i4").tobytes()
+
+    fmt = _fmt_chunk(3 if floating else 1, channels, sample_rate, bits, extensible)
+    # A chunk the readers must skip, before the data
+    junk = b"LIST" + struct.pack("<I", 4) + b"INFO"
+    body = b"WAVE" + fmt + junk + b"data" + struct.pack("<I", len(raw)) + raw
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", len(body)) + body)
+    return path
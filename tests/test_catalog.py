@@ -0,0 +1,62 @@
+import pytest
+from models.catalog import ScaleCatalog, parse_int_set
+from modules.math import necklace, rotate
+
+@pytest.fixture(scope="module")
+def catalog():
+    return ScaleCatalog.load()
+
+def test_bundled_names(catalog):
+    assert len(catalog) >= 14
+    assert catalog.name_for(2741) == "Ionian (Major)"
+    assert catalog.lookup(2741) == ("Diatonic Modes", "Ionian (Major)")
+    assert catalog.shape_for("Dorian") == 1709
+    assert catalog.name_for(0) is None
+    assert catalog.lookup(4095) is None
+    for category, name, shape in catalog:
+        assert catalog.shape_for(name) == shape
+        assert catalog.lookup(shape) == (category, name)
+
+def test_names_are_case_insensitive(catalog):
+    assert catalog.shape_for("dorian") == 1709
+    assert catalog.shape_for("IONIAN (MAJOR)") == 2741
+    assert catalog.shape_for("harmonic minor") == catalog.shape_for("Harmonic Minor")
+    assert catalog.shape_for("no such scale") is None
+
+def test_exact_name_wins_over_case():
+    catalog = ScaleCatalog({"Blues": 1257, "BLUES": 1193})
+    assert catalog.shape_for("BLUES") == 1193
+    assert catalog.shape_for("blues") == 1257
+
+def test_every_rotation_finds_the_same_modes(catalog):
+    for _, _, shape in catalog:
+        modes = catalog.modes_of(shape)
+        assert (catalog.lookup(shape) + (shape,)) in modes
+        assert all(necklace(mode) == necklace(shape) for _, _, mode in modes)
+        for r in range(12):
+            assert catalog.modes_of(rotate(shape, r)) == modes
+    assert len(catalog.modes_of(2741)) == 7
+    assert catalog.modes_of(0) == []
+
+def test_flat_format_and_missing_file(tmp_path):
+    catalog = ScaleCatalog({"Major": 2741, "Minor": "1453"})
+    assert catalog.categories == [(None, [("Major", 2741), ("Minor", 1453)])]
+    assert catalog.lookup(1453) == (None, "Minor")
+    assert len(ScaleCatalog.load(str(tmp_path / "missing.yaml"))) == 0
+
+def test_parse_int_set(catalog):
+    assert parse_int_set("3, 1-2,3,,9-7", 12) == [3, 1, 2]
+    assert parse_int_set("all", 4) == [0, 1, 2, 3]
+    # Out of range values are dropped
+    assert parse_int_set("10-14", 12) == [10, 11]
+    assert parse_int_set("catalog", 4096, catalog) == list(dict.fromkeys(s for _, _, s in catalog))
+    assert parse_int_set("category:Diatonic Modes,2741", 4096, catalog) == [2741, 1709, 1451, 2773, 1717, 1453, 1387]
+
+@pytest.mark.parametrize("spec", ["x", "1-", "-", "1-x", "1.5", "catalog", "category:Diatonic Modes"])
+def test_parse_int_set_rejects_malformed(spec):
+    with pytest.raises(ValueError):
+        parse_int_set(spec, 4096)
+
+def test_parse_int_set_unknown_category(catalog):
+    with pytest.raises(ValueError, match="Unknown category"):
+        parse_int_set("category:nope", 4096, catalog)
@@ -0,0 +1,81 @@
+import os
+import pytest
+from modules import config
+
+@pytest.fixture
+def parses(tmp_path, monkeypatch):
+    """Points the cache at tmp_path and records every YAML parse."""
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    calls = []
+    parse_yaml = config.parse_yaml
+
+    def counting(raw):
+        calls.append(raw)
+        return parse_yaml(raw)
+
+    monkeypatch.setattr(config, "parse_yaml", counting)
+    return calls
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_second_load_reads_the_cache(tmp_path, parses):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n")
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert os.path.exists(config.cache_path(str(source)))
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert len(parses) == 1
+
+def test_old_source_skips_hashing(tmp_path, parses, monkeypatch):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n", mtime_ns=10**18)
+    config.load_config(str(source))
+    # Well before the cache was written, so the stamp alone is trusted
+    write(source, "Major: 2741\n", mtime_ns=10**18 - 10 * config.RACY_NS)
+    config.load_config(str(source))
+    monkeypatch.setattr(config.hashlib, "sha256", None)
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert len(parses) == 1
+
+def test_edit_within_the_same_mtime_is_reparsed(tmp_path, parses):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n")
+    stamp = os.stat(source).st_mtime_ns
+    assert config.load_config(str(source)) == {"Major": 2741}
+    # Same size and mtime, as when saved twice within one timestamp tick
+    write(source, "Minor: 1453\n", mtime_ns=stamp)
+    assert config.load_config(str(source)) == {"Minor": 1453}
+    assert len(parses) == 2
+
+def test_touched_source_is_not_reparsed(tmp_path, parses):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n")
+    config.load_config(str(source))
+    stamp = os.stat(source).st_mtime_ns
+    os.utime(source, ns=(stamp + 10**9, stamp + 10**9))
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert len(parses) == 1
+
+@pytest.mark.parametrize("garbage", [b"", b"not a pickle", b"\x80\x05K\x01."])
+def test_corrupt_cache_falls_back_to_yaml(tmp_path, parses, garbage):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n")
+    config.load_config(str(source))
+    with open(config.cache_path(str(source)), "wb") as f:
+        f.write(garbage)
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert len(parses) == 2
+    # and the cache is repaired
+    assert config.load_config(str(source)) == {"Major": 2741}
+    assert len(parses) == 2
+
+def test_without_cache(tmp_path, parses):
+    source = tmp_path / "scales.yaml"
+    write(source, "Major: 2741\n")
+    assert config.load_config(str(source), use_cache=False) == {"Major": 2741}
+    assert not os.path.exists(config.cache_path(str(source)))
+    with pytest.raises(FileNotFoundError):
+        config.load_config(str(tmp_path / "missing.yaml"))
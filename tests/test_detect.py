@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from modules.detect import (ChromaStream, WavReader, detect_file, detect_files, match_chroma,
+                            score_chroma, template_row, templates)
+from synth import C_MAJOR, SAMPLE_RATE, melody, write_wav
+
+FORMATS = {
+    "pcm8": dict(bits=8),
+    "pcm16_stereo": dict(bits=16, channels=2),
+    "pcm24": dict(bits=24),
+    "pcm32": dict(bits=32),
+    "float32": dict(bits=32, floating=True),
+    "float64": dict(bits=64, floating=True),
+    "extensible_pcm16": dict(bits=16, extensible=True),
+    "extensible_float32_stereo": dict(bits=32, floating=True, extensible=True, channels=2),
+}
+
+@pytest.fixture(scope="module")
+def signal():
+    return melody()
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_reader_decodes_every_format(tmp_path, signal, fmt):
+    path = write_wav(str(tmp_path / "c.wav"), signal, **FORMATS[fmt])
+    with WavReader(path) as reader:
+        assert reader.sample_rate == SAMPLE_RATE
+        assert reader.num_frames == len(signal)
+        # Odd block size, so blocks straddle the end of the file
+        decoded = np.concatenate(list(reader.blocks(1001)))
+    tolerance = 1 / 64 if FORMATS[fmt]["bits"] == 8 else 1e-4
+    np.testing.assert_allclose(decoded, signal, atol=tolerance)
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_detects_c_major(tmp_path, signal, fmt):
+    path = write_wav(str(tmp_path / "c.wav"), signal, **FORMATS[fmt])
+    result = detect_file(path)
+    assert result.matches[0][:2] == (C_MAJOR, 0)
+    assert result.duration == pytest.approx(len(signal) / SAMPLE_RATE)
+
+def test_detects_transposed_scale(tmp_path):
+    path = write_wav(str(tmp_path / "f.wav"), melody(root=5))
+    assert detect_file(path).matches[0][:2] == (C_MAJOR, 5)
+
+def test_chroma_stream_is_independent_of_block_size(signal):
+    whole = ChromaStream(SAMPLE_RATE).feed(signal)
+
+    stream = ChromaStream(SAMPLE_RATE)
+    rows, start = [], 0
+    for size in [1, 4095, 7, 8192, 1001, 3, 20000] * 20:
+        rows.append(stream.feed(signal[start:start + size]))
+        start += size
+    rows.append(stream.feed(signal[start:]))
+    rows = np.concatenate(rows)
+    # Same frames and rows; only float32 rounding differs with the FFT batch size
+    assert rows.shape == whole.shape and len(whole) > 0
+    np.testing.assert_allclose(rows, whole, rtol=1e-5, atol=1e-6)
+
+def test_silence_gives_zero_rows():
+    rows = ChromaStream(SAMPLE_RATE).feed(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert len(rows) and not rows.any()
+
+def test_template_scoring():
+    row_shapes, row_roots, matrix = templates()
+    row = template_row(C_MAJOR, 3)
+    assert (row_shapes[row], row_roots[row]) == (C_MAJOR, 3)
+    # A profile shaped exactly like a template correlates perfectly with it
+    assert score_chroma(matrix[row])[row] == pytest.approx(1.0)
+    assert match_chroma(matrix[row])[0][:2] == (C_MAJOR, 3)
+    assert score_chroma(np.ones(12)) is None
+    assert match_chroma(np.ones(12)) == ()
+    # The root must be in the shape
+    assert template_row(C_MAJOR & ~1, 0) is None
+
+def test_match_chroma_limits_to_shapes():
+    _, _, matrix = templates()
+    chroma = matrix[template_row(C_MAJOR, 0)]
+    matches = match_chroma(chroma, top=3, shapes=[1387, 1451])
+    assert {m.shape for m in matches} <= {1387, 1451}
+
+def test_detect_files_keeps_order_and_reports_errors(tmp_path, signal):
+    c = write_wav(str(tmp_path / "c.wav"), signal)
+    f = write_wav(str(tmp_path / "f.wav"), melody(root=5))
+    bad = tmp_path / "notes.wav"
+    bad.write_text("not audio")
+    short = tmp_path / "short.wav"
+    short.write_bytes(b"RIFF")
+
+    results = list(detect_files([f, str(bad), c, str(short)], top=1, workers=2))
+    assert results[0].path == f and results[0].matches[0][:2] == (C_MAJOR, 5)
+    assert results[1][0] == str(bad) and isinstance(results[1][1], ValueError)
+    assert results[2].path == c and results[2].matches[0][:2] == (C_MAJOR, 0)
+    assert results[3][0] == str(short) and isinstance(results[3][1], Exception)
@@ -0,0 +1,106 @@
+import itertools
+import random
+import pytest
+from modules.fingering import (BOX_WIDTH, COMPACT_COUNTS, MAX_POSITION_SPAN, MAX_STRING_STRETCH,
+                               MAX_VOICINGS, chord_voicings, scale_fingerings, string_offsets)
+from modules.math import cardinality
+
+STANDARD = (4, 9, 2, 7, 11, 4)
+EIGHT_STRING = (6, 11, 4, 9, 2, 7, 11, 4)
+C_MAJOR = 2741
+C_MAJOR_TRIAD = 0b000010010001
+
+def pitch(tuning, s, f):
+    return string_offsets(tuning)[s] + f
+
+def per_string(fingering):
+    return {s: [f for t, f in fingering.positions if t == s] for s, _ in fingering.positions}
+
+def check_positions(tuning, number, num_frets, fingering):
+    assert fingering.positions
+    for s, f in fingering.positions:
+        assert 0 <= f <= num_frets
+        assert (number >> ((tuning[s] + f) % 12)) & 1
+    # Ascending pitch, every scale note in between taken exactly once
+    pitches = [pitch(tuning, s, f) for s, f in fingering.positions]
+    expected = [p for p in range(pitches[0], pitches[-1] + 1) if (number >> ((tuning[0] + p) % 12)) & 1]
+    assert pitches == expected
+    frets = [f for _, f in fingering.positions]
+    assert (fingering.low_fret, fingering.high_fret) == (min(frets), max(frets))
+
+@pytest.mark.parametrize("kind", ["3nps", "box", "compact"])
+def test_scale_positions_are_playable(kind):
+    fingerings = scale_fingerings(STANDARD, C_MAJOR, 22, kind)
+    assert len(fingerings) >= 7
+    assert list(fingerings) == sorted(fingerings, key=lambda f: (f.low_fret, f.high_fret))
+    for fingering in fingerings:
+        assert fingering.kind == kind
+        check_positions(STANDARD, C_MAJOR, 22, fingering)
+        strings = per_string(fingering)
+        assert sorted(strings) == list(range(len(STANDARD)))
+        for frets in strings.values():
+            assert frets[-1] - frets[0] <= MAX_STRING_STRETCH
+        span = fingering.high_fret - fingering.low_fret
+        if kind == "3nps":
+            assert all(len(frets) == 3 for frets in strings.values())
+            assert span <= MAX_POSITION_SPAN[kind]
+        elif kind == "compact":
+            assert all(len(frets) in COMPACT_COUNTS for frets in strings.values())
+            assert span <= MAX_POSITION_SPAN[kind]
+        else:
+            assert span < BOX_WIDTH
+
+def test_positions_cover_the_neck():
+    # One position per scale note on the lowest string, up to the last fret
+    fingerings = scale_fingerings(STANDARD, C_MAJOR, 22, "3nps")
+    lowest = sorted({f for f in range(23) if (C_MAJOR >> ((STANDARD[0] + f) % 12)) & 1})
+    starts = [f.positions[0] for f in fingerings]
+    assert all(s == 0 for s, _ in starts)
+    assert set(f for _, f in starts) <= set(lowest)
+    assert fingerings[0].low_fret == 0
+    assert fingerings[-1].high_fret <= 22
+
+def test_empty_inputs():
+    assert scale_fingerings(STANDARD, 0, 22, "3nps") == ()
+    assert scale_fingerings((), C_MAJOR, 22, "compact") == ()
+
+def check_voicing(tuning, root, mask, num_frets, max_span, voicing):
+    sounding = voicing.positions
+    strings = [s for s, _ in sounding]
+    # One contiguous run of at least three strings, root in the bass
+    assert len(strings) >= 3
+    assert strings == list(range(strings[0], strings[-1] + 1))
+    assert (tuning[strings[0]] + sounding[0][1]) % 12 == root
+    pcs = {(tuning[s] + f) % 12 for s, f in sounding}
+    assert all((mask >> pc) & 1 for pc in pcs)
+    tones = {pc for pc in range(12) if (mask >> pc) & 1}
+    if cardinality(mask) > len(tuning):
+        tones.discard((root + 7) % 12)
+    assert tones <= pcs
+    fretted = [f for _, f in sounding if f > 0]
+    assert all(f <= num_frets for f in fretted)
+    if fretted:
+        assert max(fretted) - min(fretted) <= max_span
+        assert (voicing.low_fret, voicing.high_fret) == (min(fretted), max(fretted))
+
+def test_open_c_chord():
+    voicings = chord_voicings(STANDARD, 0, C_MAJOR_TRIAD, 22)
+    assert voicings[0].frets == (-1, 3, 2, 0, 1, 0)
+    for voicing in voicings:
+        check_voicing(STANDARD, 0, C_MAJOR_TRIAD, 22, 3, voicing)
+
+@pytest.mark.parametrize("tuning,num_frets", [(STANDARD, 22), (EIGHT_STRING, 24)])
+def test_voicings_sound_every_chord_tone(tuning, num_frets):
+    rng = random.Random(len(tuning))
+    for size in (3, 4, 5, 7):
+        for _ in range(6):
+            root = rng.randrange(12)
+            mask = (1 << root) | sum(1 << pc for pc in rng.sample([p for p in range(12) if p != root], size - 1))
+            voicings = chord_voicings(tuning, root, mask, num_frets)
+            assert len(voicings) <= MAX_VOICINGS
+            assert len(set(voicings)) == len(voicings)
+            for voicing in voicings:
+                check_voicing(tuning, root, mask, num_frets, 3, voicing)
+            # None is another with strings muted
+            for a, b in itertools.permutations(voicings, 2):
+                assert not all(p < 0 or p == f for p, f in zip(a.frets, b.frets))
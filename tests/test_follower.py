@@ -0,0 +1,88 @@
+import time
+import numpy as np
+import pytest
+from models.catalog import ScaleCatalog
+from models.scale import ScaleModel
+from modules import follower
+from modules.detect import templates, template_row
+from modules.follower import RingBuffer, ScaleFollower, WavFileInput
+from synth import C_MAJOR, melody, write_wav
+
+def test_ring_buffer_wraps_around():
+    ring = RingBuffer(8)
+    ring.write(np.arange(5), 1.0)
+    samples, captured_at = ring.read()
+    assert samples.tolist() == [0, 1, 2, 3, 4] and captured_at == 1.0
+    # Starts at index 5 of 8, so this write wraps
+    ring.write(np.arange(5, 11), 2.0)
+    samples, captured_at = ring.read()
+    assert samples.tolist() == [5, 6, 7, 8, 9, 10] and captured_at == 2.0
+    assert ring.dropped == 0
+    assert len(ring.read()[0]) == 0
+
+def test_ring_buffer_counts_overrun_samples():
+    ring = RingBuffer(8)
+    ring.write(np.arange(5), 1.0)
+    ring.write(np.arange(5, 11), 2.0)
+    # The reader fell 3 samples more than a buffer behind
+    samples, _ = ring.read()
+    assert samples.tolist() == [3, 4, 5, 6, 7, 8, 9, 10]
+    assert ring.dropped == 3
+
+def test_ring_buffer_counts_oversized_blocks():
+    ring = RingBuffer(8)
+    ring.write(np.arange(3), 1.0)
+    ring.read()
+    ring.write(np.arange(100, 120), 2.0)
+    samples, _ = ring.read()
+    assert samples.tolist() == list(range(112, 120))
+    assert ring.dropped == 12
+    # The write position stays consistent for the next block
+    ring.write([7, 8], 3.0)
+    assert ring.read()[0].tolist() == [7, 8]
+
+def test_best_holds_the_current_scale_within_the_margin():
+    scale_follower = ScaleFollower(ScaleModel())
+    _, _, matrix = templates()
+    ionian, dorian = matrix[template_row(C_MAJOR, 0)], matrix[template_row(1709, 2)]
+    # Slightly closer to D dorian, but not by SWITCH_MARGIN
+    chroma = ionian + 1.05 * dorian
+    assert scale_follower._best(chroma, None) == (1709, 2)
+    assert scale_follower._best(chroma, (C_MAJOR, 0)) == (C_MAJOR, 0)
+    # Clearly D dorian
+    assert scale_follower._best(dorian, (C_MAJOR, 0)) == (1709, 2)
+    assert scale_follower._best(np.ones(12), (C_MAJOR, 0)) is None
+
+def test_follows_a_recording(qapp, tmp_path):
+    path = write_wav(str(tmp_path / "c.wav"), melody(root=0))
+    model = ScaleModel()
+    model.set_state(1, 6)
+    scale_follower = ScaleFollower(model, [shape for _, _, shape in ScaleCatalog.load()])
+    scale_follower.start(WavFileInput(path, realtime=False, loop=True))
+    try:
+        deadline = time.perf_counter() + 20
+        while (model.shape, model.root_note) != (C_MAJOR, 0) and time.perf_counter() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+    finally:
+        scale_follower.stop()
+    assert (model.shape, model.root_note) == (C_MAJOR, 0)
+    assert scale_follower.latency is not None and scale_follower.latency >= 0
+    assert follower.MIN_HOP <= scale_follower.hop <= follower.MAX_HOP
+    assert not scale_follower.is_running
+
+def test_hop_backs_off_when_over_budget(qapp, tmp_path, monkeypatch):
+    # No DSP fits this budget, so the hop should double up to its limit
+    monkeypatch.setattr(follower, "CPU_BUDGET", 1e-9)
+    path = write_wav(str(tmp_path / "c.wav"), melody(root=0))
+    scale_follower = ScaleFollower(ScaleModel())
+    scale_follower.start(WavFileInput(path, realtime=False, loop=True))
+    try:
+        deadline = time.perf_counter() + 20
+        while scale_follower.hop < follower.MAX_HOP and time.perf_counter() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+    finally:
+        scale_follower.stop()
+    assert scale_follower.hop == follower.MAX_HOP
+    assert scale_follower.dsp_load > follower.CPU_BUDGET
@@ -0,0 +1,28 @@
+from models.scale import ScaleModel, neighbor_states
+from modules.spelling import Spelling
+from views.polygon import PolygonView
+
+def test_warm_caches_reports_whether_it_painted(qapp):
+    model = ScaleModel()
+    view = PolygonView(model, Spelling(model))
+    view.resize(300, 300)
+    assert view.warm_caches(1387, 2) is False
+    view.show()
+    qapp.processEvents()
+    assert view.warm_caches(1387, 2) is True
+    view.close()
+
+def test_neighbor_states_are_one_keystroke_away():
+    states = neighbor_states(2741, 0)
+    assert (2741, 0) not in states
+    assert len(states) == len(set(states))
+    # Both mode rotations, then transpositions by 1 and 7 either way
+    expected = []
+    for move in (lambda m: m.rotate_modes(1), lambda m: m.rotate_modes(-1),
+                 lambda m: m.transpose(1), lambda m: m.transpose(-1),
+                 lambda m: m.transpose(7), lambda m: m.transpose(-7)):
+        model = ScaleModel()
+        move(model)
+        expected.append((model.shape, model.root_note))
+    assert states[:6] == expected
+    assert (0, 0) in states
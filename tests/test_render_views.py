@@ -0,0 +1,17 @@
+import os
+import pytest
+import render_views
+
+JOBS = [("polygon", (200, 200), shape, 0, i) for i, shape in enumerate((1, 2741))]
+
+@pytest.mark.parametrize("fmt", ["png", "svg"])
+def test_frames_are_renamed_into_place(tmp_path, fmt):
+    render_views.run_shard(JOBS, str(tmp_path), fmt=fmt)
+    names = sorted(os.listdir(tmp_path))
+    assert names == sorted(render_views.frame_filename(*job[:4], fmt) for job in JOBS)
+    assert render_views.pending_jobs(JOBS, str(tmp_path), fmt) == []
+
+def test_partial_frames_stay_pending(tmp_path):
+    path = tmp_path / render_views.frame_filename(*JOBS[0][:4], "png")
+    (tmp_path / (path.name + ".part")).write_bytes(b"\x89PNG")
+    assert render_views.pending_jobs(JOBS, str(tmp_path), "png") == JOBS
@@ -0,0 +1,101 @@
+import threading
+import numpy as np
+import pytest
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter
+from models import InstrumentModel, ScaleModel
+from modules.spelling import Spelling
+from views.fretboard import FretboardView, FretlessView
+from views.piano import KEY_RANGES
+from views.renderers import KeyboardLayout, LabelSpriteCache, ensure_gui_app
+
+TUNINGS = {
+    6: [4, 9, 2, 7, 11, 4],
+    7: [11, 4, 9, 2, 7, 11, 4],
+    8: [6, 11, 4, 9, 2, 7, 11, 4],
+}
+
+def label(i):
+    return (10 + i % 5, QColor(i % 256, 80, 120), None, None, QColor("white"), 10, str(i % 12))
+
+def test_sprite_cache_is_consistent_across_threads():
+    ensure_gui_app()
+    cache = LabelSpriteCache()
+    # Small enough that threads keep evicting each other's sprites
+    cache.MAX_BYTES = 64 * 1024
+    errors = []
+
+    def work(seed):
+        image = QImage(200, 200, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        try:
+            for n in range(400):
+                i = (seed * 7 + n) % 60
+                cache.draw(painter, QPointF(50 + (n % 4) * 0.25, 50), label(i))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            painter.end()
+
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert cache._bytes == sum(sprite.sizeInBytes() for sprite in cache._sprites.values())
+    assert cache._bytes <= cache.MAX_BYTES
+
+def grid(x0, x1, dx, y0, y1, dy):
+    xs, ys = np.meshgrid(np.arange(x0, x1, dx), np.arange(y0, y1, dy))
+    return xs.ravel(), ys.ravel()
+
+def scan_hits(view, xs, ys):
+    """Reference fingerboard hit test: the nearest label within HIT_RADIUS over every string and fret."""
+    _, string_ys = view.get_geometry()
+    centres = [(s_idx, f_idx, sy, nx) for s_idx, sy in enumerate(string_ys)
+               for f_idx, nx in enumerate(view.get_note_xs())]
+    dist = np.array([np.hypot(xs - nx, ys - sy) for _, _, sy, nx in centres])
+    nearest = dist.argmin(axis=0)
+    return [centres[i][:2] if dist[i, p] < view.HIT_RADIUS else None for p, i in enumerate(nearest)]
+
+@pytest.mark.parametrize("view_class", [FretboardView, FretlessView])
+@pytest.mark.parametrize("num_strings", sorted(TUNINGS))
+def test_fretboard_hit_test_matches_scan(view_class, num_strings):
+    model = ScaleModel()
+    view = view_class(InstrumentModel(list(TUNINGS[num_strings]), frets=24), model, Spelling(model))
+    for w, h in [(1200, 300), (700, 420)]:
+        view.resize(w, h)
+        # Off the pixel grid, so no point is equidistant from two labels
+        xs, ys = grid(-20.3, w + 20, 3.71, -10.7, h + 10, 2.93)
+        expected = scan_hits(view, xs, ys)
+        assert any(expected)
+        for x, y, hit in zip(xs, ys, expected):
+            assert view.hit_test(QPointF(x, y)) == hit, (w, h, x, y)
+
+def scan_keys(layout, xs, ys):
+    """Reference piano hit test: black keys first, then white, by rectangle."""
+    keys = np.full(len(xs), -1)
+    for k in reversed(layout.black_keys + layout.white_keys):
+        r = layout.rects[k]
+        inside = (xs >= r.left()) & (xs <= r.right()) & (ys >= r.top()) & (ys <= r.bottom())
+        keys[inside] = k
+    # Rectangles contain their edges, key_at is half-open there
+    edges = [e for r in layout.rects for e in (r.left(), r.right())]
+    on_edge = np.isclose(xs[:, None], edges, atol=1e-6).any(axis=1) | np.isclose(ys, layout.black_key_h)
+    return [None if k < 0 else int(k) for k in keys], on_edge
+
+@pytest.mark.parametrize("key_range", ["4 Octaves", "88 Keys", (0, 61), (1, 61)])
+def test_key_at_matches_scan(key_range):
+    first_key, num_keys = KEY_RANGES.get(key_range, key_range)
+    for w, h in [(1200, 200), (833, 317)]:
+        layout = KeyboardLayout(w, h, first_key, num_keys)
+        # Clicks land inside the widget; keys at either end may overhang it
+        xs, ys = grid(0, w, 0.83, 0, h, 4.1)
+        expected, on_edge = scan_keys(layout, xs, ys)
+        assert set(expected) == set(range(num_keys)) | {None}
+        for x, y, key, edge in zip(xs, ys, expected, on_edge):
+            if not edge:
+                assert layout.key_at(x, y) == key, (w, h, x, y)
@@ -0,0 +1,76 @@
+import pytest
+from models.scale import ScaleModel
+from modules.spelling import Spelling
+
+@pytest.fixture
+def counted(monkeypatch):
+    """A ScaleModel and Spelling with counters on the spelling solve and both 'updated' signals."""
+    counts = {"solves": 0, "updated": 0, "spelling_updated": 0}
+    solve = Spelling._update_spellings
+
+    def counting_solve(self):
+        counts["solves"] += 1
+        solve(self)
+
+    monkeypatch.setattr(Spelling, "_update_spellings", counting_solve)
+    model = ScaleModel()
+    spelling = Spelling(model)
+    model.updated.connect(lambda: counts.__setitem__("updated", counts["updated"] + 1))
+    spelling.updated.connect(lambda: counts.__setitem__("spelling_updated", counts["spelling_updated"] + 1))
+    counts["solves"] = 0
+    return model, spelling, counts
+
+MUTATIONS = [
+    ("set_shape", lambda m: m.set_shape(1387)),
+    ("toggle_note_active", lambda m: m.toggle_note_active(3)),
+    ("toggle_notes", lambda m: m.toggle_notes(0b1010)),
+    ("transpose", lambda m: m.transpose(7)),
+    ("set_root_note", lambda m: m.set_root_note(5)),
+    ("rotate_modes", lambda m: m.rotate_modes(1)),
+    ("set_state", lambda m: m.set_state(1387, 2)),
+]
+
+@pytest.mark.parametrize("name,mutate", MUTATIONS, ids=[name for name, _ in MUTATIONS])
+def test_single_mutation_solves_and_updates_once(counted, name, mutate):
+    model, _, counts = counted
+    mutate(model)
+    assert counts["solves"] == 1
+    assert counts["updated"] == 1
+
+def test_batch_solves_and_updates_once(counted):
+    model, _, counts = counted
+    with model.batch():
+        model.set_shape(1387)
+        model.transpose(2)
+        model.toggle_note_active(4)
+        with model.batch():
+            model.rotate_modes(1)
+        assert counts["solves"] == 0
+        assert counts["updated"] == 0
+    assert counts["solves"] == 1
+    assert counts["updated"] == 1
+
+def test_empty_batch_does_not_notify(counted):
+    model, _, counts = counted
+    with model.batch():
+        pass
+    assert counts == {"solves": 0, "updated": 0, "spelling_updated": 0}
+
+def test_model_changes_do_not_emit_spelling_updates(counted):
+    model, spelling, counts = counted
+    names = list(spelling.note_names)
+    # Modes of C major keep its spelling
+    model.rotate_modes(1)
+    model.rotate_modes(1)
+    model.rotate_modes(-1)
+    assert spelling.note_names == names
+    model.transpose(7)
+    assert counts["spelling_updated"] == 0
+    assert counts["updated"] == 4
+
+def test_enharmonic_toggle_emits_spelling_update_only(counted):
+    model, spelling, counts = counted
+    model.set_state(2741, 1)
+    counts.update(solves=0, updated=0)
+    spelling.toggle_enharmonic_spelling()
+    assert counts == {"solves": 0, "updated": 0, "spelling_updated": 1}
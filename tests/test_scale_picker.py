@@ -0,0 +1,84 @@
+import pytest
+from PySide6.QtCore import Qt
+# The views package loads controls, as the entry points import it
+import views  # noqa: F401
+from controls.scale_picker import ScaleListModel
+from models import ScaleCatalog
+from modules.math import cardinality, interval_count, rotate
+
+MAJOR_IVEC = "254362"
+
+@pytest.fixture(scope="module")
+def catalog():
+    return ScaleCatalog.load()
+
+@pytest.fixture
+def model(qapp, catalog):
+    return ScaleListModel(catalog, include_all=True)
+
+def all_rows(model):
+    """Every row's shape, fetching batches the way a scrolling view would."""
+    while model.canFetchMore():
+        loaded = model.rowCount()
+        model.fetchMore()
+        assert model.rowCount() > loaded
+    return [model.shape_at(model.index(i)) for i in range(model.rowCount())]
+
+def brute(catalog, keep):
+    shapes = [shape for _, _, shape in catalog] + list(range(4096))
+    return [shape for shape in shapes if keep(shape)]
+
+def test_fetch_more_pages_through_every_row(model, catalog):
+    assert model.rowCount() == ScaleListModel.BATCH_SIZE
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    shapes = all_rows(model)
+    assert shapes == brute(catalog, lambda shape: True)
+    assert len(inserted) == -(-len(shapes) // ScaleListModel.BATCH_SIZE) - 1
+    assert inserted[0][0] == ScaleListModel.BATCH_SIZE
+    assert inserted[-1][1] == len(shapes) - 1
+    assert model.data(model.index(len(shapes))) is None
+
+def test_filters_narrow_to_matching_rows(model, catalog):
+    model.set_filter("n")
+    model.set_filter("n:")
+    model.set_filter("n:7")
+    sevens = brute(catalog, lambda shape: cardinality(shape) == 7)
+    assert all_rows(model) == sevens
+
+    # Typed one character at a time, as from the search box
+    query = "n:7 "
+    for c in "iv:" + MAJOR_IVEC:
+        query += c
+        model.set_filter(query)
+    majors = brute(catalog, lambda shape: cardinality(shape) == 7 and interval_count(shape) == int(MAJOR_IVEC, 12))
+    assert all_rows(model) == majors
+    # Nothing else shares the diatonic interval vector
+    assert set(majors) == {rotate(2741, i) for i in range(12)}
+    assert MAJOR_IVEC in model.data(model.index(0), Qt.DisplayRole)
+
+    # Back to the cardinality alone
+    model.set_filter("n:7")
+    assert all_rows(model) == sevens
+    model.set_filter("")
+    assert all_rows(model) == brute(catalog, lambda shape: True)
+
+def test_fuzzy_search_within_a_filter(model, catalog):
+    for query in ("n:7 d", "n:7 do", "n:7 dor"):
+        model.set_filter(query)
+    rows = all_rows(model)
+    # A contiguous match in a name ranks before fuzzy ones
+    assert rows[0] == catalog.shape_for("Dorian")
+    assert all(cardinality(shape) == 7 for shape in rows)
+    names = [model.data(model.index(i)) for i in range(model.rowCount())]
+    assert all("d" in n.lower() and "o" in n.lower() and "r" in n.lower() for n in names)
+
+    model.set_filter("2741")
+    assert 2741 in all_rows(model)
+
+def test_include_all_keeps_the_filter(qapp, catalog):
+    model = ScaleListModel(catalog)
+    assert all_rows(model) == [shape for _, _, shape in catalog]
+    model.set_filter("n:7")
+    model.set_include_all(True)
+    assert all_rows(model) == brute(catalog, lambda shape: cardinality(shape) == 7)
@@ -0,0 +1,86 @@
+import os
+import threading
+import http.client
+import pytest
+import serve
+from models import ScaleCatalog
+
+@pytest.fixture(scope="module")
+def parser():
+    return serve.ParamParser(ScaleCatalog.load(), serve.load_tunings())
+
+@pytest.fixture(scope="module")
+def server():
+    serve.ensure_gui_app()
+    server = serve.ImageServer(("127.0.0.1", 0), workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, url):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    try:
+        conn.request("GET", url)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize("query,shape,root", [
+    ("shape=2741&root=0", 2741, 0),
+    ("shape=4095&root=-5", 4095, 7),
+    ("shape=0&root=14", 0, 2),
+    ("root=Bb", 2741, 10),
+    ("shape=dorian&root=2", 1709, 2),
+])
+def test_parses_numbers_and_names(parser, query, shape, root):
+    params = parser.parse("/polygon", query)
+    assert (params.shape, params.root) == (shape, root)
+
+@pytest.mark.parametrize("query", [
+    "shape=²", "shape=٣", "shape=-5", "shape=4096", "shape=no-such-scale",
+    "root=--5", "root=²", "root=5-", "root=H",
+])
+def test_rejects_bad_shape_and_root(parser, query):
+    with pytest.raises(serve.BadRequest):
+        parser.parse("/polygon", query)
+
+@pytest.mark.parametrize("query", ["shape=%C2%B2", "root=--5"])
+def test_bad_values_get_400(server, query):
+    status, body = get(server, "/polygon?" + query)
+    assert status == 400
+    assert body
+    # The handler thread survived: the server still answers
+    assert get(server, "/")[0] == 200
+
+class FakeParams:
+    def __init__(self, name):
+        self.name = name
+
+    def etag(self):
+        return f'"{self.name}"'
+
+def test_disk_cache_evicts_oldest_files(tmp_path):
+    cache = serve.ImageCache(max_bytes=0, directory=str(tmp_path), max_disk_bytes=1000)
+    for i in range(3):
+        cache.put(FakeParams(f"img{i}"), b"x" * 300)
+        # Distinct, increasing mtimes however coarse the filesystem clock
+        os.utime(tmp_path / f"img{i}.png", (i, i))
+    assert sorted(os.listdir(tmp_path)) == ["img0.png", "img1.png", "img2.png"]
+
+    # Reading img0 makes it the most recently used
+    assert cache.get(FakeParams("img0")) == (b"x" * 300, "disk")
+    # Over budget: the oldest files go until the directory is under 90% of it
+    cache.put(FakeParams("img3"), b"x" * 300)
+    assert sorted(os.listdir(tmp_path)) == ["img0.png", "img2.png", "img3.png"]
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 1000
+
+def test_disk_cache_trims_existing_directory(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"old{i}.png"
+        path.write_bytes(b"x" * 300)
+        os.utime(path, (i, i))
+    serve.ImageCache(directory=str(tmp_path), max_disk_bytes=1000)
+    assert sorted(os.listdir(tmp_path)) == ["old2.png", "old3.png", "old4.png"]
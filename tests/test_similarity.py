@@ -0,0 +1,75 @@
+import pytest
+from models.catalog import ScaleCatalog
+from modules.math import cardinality, necklace, rotate
+from modules.similarity import SimilarityIndex
+
+QUERIES = [2741, rotate(1709, -2), 0b000010010001, 0b101010101010, 1, 0, 4095]
+
+@pytest.fixture(scope="module")
+def catalog():
+    return ScaleCatalog.load()
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return SimilarityIndex(catalog)
+
+def interval_vector(number):
+    return [cardinality(number & rotate(number, i)) for i in range(1, 7)]
+
+def brute_distances(number, shape):
+    hamming = min(cardinality(rotate(shape, r) ^ number) for r in range(12))
+    interval = sum(abs(a - b) for a, b in zip(interval_vector(number), interval_vector(shape)))
+    return hamming, interval
+
+def brute_keys(number, shapes, metric, exclude_same):
+    keys = []
+    for shape in shapes:
+        if exclude_same and necklace(shape) == necklace(number):
+            continue
+        hamming, interval = brute_distances(number, shape)
+        keys.append((hamming, interval) if metric == "hamming" else (interval, hamming))
+    return sorted(keys)
+
+def check_matches(number, matches, expected, metric):
+    assert len(matches) == len(expected)
+    for match in matches:
+        assert (match.hamming, match.interval_distance) == brute_distances(number, match.shape)
+        # The root given is one where the overlap is best
+        assert cardinality(rotate(match.shape, -match.root) ^ number) == match.hamming
+    keys = [(m.hamming, m.interval_distance) if metric == "hamming" else (m.interval_distance, m.hamming)
+            for m in matches]
+    assert keys == expected
+
+@pytest.mark.parametrize("metric", SimilarityIndex.METRICS)
+@pytest.mark.parametrize("number", QUERIES)
+def test_nearest_over_every_shape(index, number, metric):
+    # "all" holds one shape per necklace class, so rank every class of the 4096 shapes
+    classes = {necklace(shape) for shape in range(4096)}
+    for k in (1, 10, 40):
+        matches = index.nearest(number, k=k, metric=metric, scope="all")
+        check_matches(number, matches, brute_keys(number, classes, metric, True)[:k], metric)
+        assert len({necklace(m.shape) for m in matches}) == len(matches)
+
+@pytest.mark.parametrize("metric", SimilarityIndex.METRICS)
+def test_nearest_in_catalog(index, catalog, metric):
+    shapes = list(dict.fromkeys(shape for _, _, shape in catalog))
+    for number in QUERIES:
+        matches = index.nearest(number, k=15, metric=metric)
+        check_matches(number, matches, brute_keys(number, shapes, metric, True)[:15], metric)
+        assert all(m.shape in shapes for m in matches)
+
+def test_same_notes_are_kept_on_request(index):
+    matches = index.nearest(2741, k=5, scope="all", exclude_same=False)
+    assert matches[0] == (necklace(2741), matches[0].root, 0, 0)
+    assert rotate(matches[0].shape, -matches[0].root) == 2741
+
+def test_roots_prefer_the_given_one(index):
+    # The whole-tone scale overlaps itself at every even root
+    whole_tone = 0b010101010101
+    for root in (0, 2, 4):
+        match = index.nearest(whole_tone, k=1, scope="all", root=root, exclude_same=False)[0]
+        assert match.root == root
+
+def test_k_larger_than_candidates(index):
+    matches = index.nearest(2741, k=1000, scope="all")
+    assert len(matches) == len({necklace(s) for s in range(4096)}) - 1
@@ -0,0 +1,63 @@
+import pytest
+from models.catalog import ScaleCatalog
+from modules.math import cardinality, necklace, rotate
+from modules.subsets import Placement, SubsetIndex
+
+QUERIES = [0, 4095, 2741, 0b000010010001, 0b000000000101, 0b010101010101, 1 << 11]
+
+@pytest.fixture(scope="module")
+def catalog():
+    return ScaleCatalog.load()
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return SubsetIndex(catalog)
+
+def candidates(catalog, scope):
+    if scope == "catalog":
+        return list(dict.fromkeys(shape for _, _, shape in catalog))
+    return sorted({necklace(shape) for shape in range(1, 4096)})
+
+def brute_placements(shapes, number, supersets):
+    found = set()
+    for shape in shapes:
+        seen = set()
+        for root in range(12):
+            # The notes of shape played from root
+            placed = rotate(shape, -root)
+            if placed in seen:
+                continue
+            seen.add(placed)
+            a, b = (number, placed) if supersets else (placed, number)
+            if (a & b) == a:
+                found.add(Placement(shape, root))
+    return found
+
+@pytest.mark.parametrize("scope", SubsetIndex.SCOPES)
+@pytest.mark.parametrize("number", QUERIES)
+def test_supersets_match_brute_force(index, catalog, scope, number):
+    placements = index.supersets(number, scope)
+    assert len(set(placements)) == len(placements)
+    assert set(placements) == brute_placements(candidates(catalog, scope), number, True)
+    sizes = [cardinality(p.shape) for p in placements]
+    assert sizes == sorted(sizes)
+
+@pytest.mark.parametrize("scope", SubsetIndex.SCOPES)
+@pytest.mark.parametrize("number", QUERIES)
+def test_subsets_match_brute_force(index, catalog, scope, number):
+    placements = index.subsets(number, scope)
+    assert len(set(placements)) == len(placements)
+    assert set(placements) == brute_placements(candidates(catalog, scope), number, False)
+    sizes = [cardinality(p.shape) for p in placements]
+    assert sizes == sorted(sizes, reverse=True)
+
+def test_edges(index):
+    # Nothing but the chromatic scale holds every note, and it holds every scale
+    assert index.supersets(4095, "all") == [Placement(4095, 0)]
+    assert index.subsets(0, "all") == []
+    assert len(index.subsets(4095, "all")) == len(brute_placements(candidates(None, "all"), 0, True))
+    assert len(index.supersets(0, "all")) == len(index.subsets(4095, "all"))
+
+def test_limit_is_a_prefix(index):
+    placements = index.supersets(0b000010010001, "all")
+    assert index.supersets(0b000010010001, "all", limit=7) == placements[:7]
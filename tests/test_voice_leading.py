@@ -0,0 +1,55 @@
+import itertools
+import random
+import pytest
+from modules.math import pitch_set
+from modules.voice_leading import VOICE_WEIGHT, displacement, distance, voice_leading
+
+def random_mask(rng, size):
+    return sum(1 << i for i in rng.sample(range(12), size))
+
+def check_motions(source, target, motions):
+    assert {m.source for m in motions} == set(pitch_set(source))
+    assert {m.target for m in motions} == set(pitch_set(target))
+    for m in motions:
+        assert (m.source + m.delta) % 12 == m.target
+        assert -5 <= m.delta <= 6
+
+def test_equal_sizes_match_one_to_one():
+    # Phrygian -> Lydian #2: a split would be cheaper, but equal sizes never split
+    motions = voice_leading(1451, 2777)
+    check_motions(1451, 2777, motions)
+    assert len(motions) == 7
+    assert sum(abs(m.delta) for m in motions) == 6
+
+@pytest.mark.parametrize("size", range(1, 7))
+def test_equal_sizes_are_the_minimal_bijection(size):
+    rng = random.Random(size)
+    for _ in range(40):
+        source, target = random_mask(rng, size), random_mask(rng, size)
+        motions = voice_leading(source, target)
+        check_motions(source, target, motions)
+        assert len(motions) == size
+        a, b = pitch_set(source), pitch_set(target)
+        best = min(sum(abs(displacement(x, y)) for x, y in zip(a, p)) for p in itertools.permutations(b))
+        assert distance(source, target) == best
+
+def test_different_sizes_are_the_minimal_relation():
+    rng = random.Random(0)
+    for _ in range(150):
+        m, n = rng.sample(range(1, 5), 2)
+        source, target = random_mask(rng, m), random_mask(rng, n)
+        motions = voice_leading(source, target)
+        check_motions(source, target, motions)
+        # Exhaustive search over every relation covering both sets
+        pairs = [(x, y) for x in pitch_set(source) for y in pitch_set(target)]
+        best = None
+        for mask in range(1, 1 << len(pairs)):
+            edges = [p for i, p in enumerate(pairs) if mask >> i & 1]
+            if {x for x, _ in edges} == set(pitch_set(source)) and {y for _, y in edges} == set(pitch_set(target)):
+                cost = sum(VOICE_WEIGHT * abs(displacement(x, y)) + 1 for x, y in edges)
+                best = cost if best is None else min(best, cost)
+        assert sum(VOICE_WEIGHT * abs(m.delta) + 1 for m in motions) == best
+
+def test_empty_sets_have_no_voice_leading():
+    assert voice_leading(0, 2741) == ()
+    assert voice_leading(2741, 0) == ()